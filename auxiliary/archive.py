@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+import json
+import os
+
+import numpy as np
+
+from auxiliary.formats import frame_id, read_label, read_scan
+
+
+# 압축 sequence 아카이브 (폴더) 구성
+## points.npy : [전체 point 수, 4] float32 (x, y, z, intensity)
+## labels.npy : [전체 point 수] uint32 (label 없으면 생략)
+## offsets.npy: [프레임 수 + 1] int64, 프레임 i = [offsets[i], offsets[i + 1])
+## frames.json: frame id 목록 및 형식 정보
+ARCHIVE_VERSION = 1
+ARCHIVE_EXT = '.pack'
+
+
+# sequence를 하나의 아카이브로 변환
+## 전체 크기를 파일 크기로 미리 계산한 뒤 memmap에 프레임 단위로 기록 (메모리 사용량 일정)
+def pack_sequence(scan_names, label_names, out_path, predictions=False, frame_ids=None):
+
+    # 1. 프레임별 point 개수 계산 (압축/양자화 형식은 한 번 읽어서 확인)
+    stride = 5 if predictions else 4
+    counts = [os.path.getsize(name) // (4 * stride) if name.endswith('.bin')
+              else read_scan(name, stride).shape[0]
+              for name in scan_names]
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+    total = int(offsets[-1])
+    has_labels = predictions or bool(label_names)
+
+    # 2. 출력 파일 생성
+    os.makedirs(out_path, exist_ok=True)
+    points = np.lib.format.open_memmap(os.path.join(out_path, "points.npy"),
+                                       mode='w+', dtype=np.float32, shape=(total, 4))
+    labels = None
+    if has_labels:
+        labels = np.lib.format.open_memmap(os.path.join(out_path, "labels.npy"),
+                                           mode='w+', dtype=np.uint32, shape=(total,))
+
+    # 3. 프레임 단위로 복사
+    for i, name in enumerate(scan_names):
+        start, end = offsets[i], offsets[i + 1]
+        scan = read_scan(name, stride)
+        if scan.shape[0] != end - start:
+            raise ValueError(f"{name}: scan 크기가 바뀜")
+        points[start:end] = scan[:, 0:4]
+        if predictions:
+            labels[start:end] = scan[:, 4].astype(np.uint32)
+        elif labels is not None:
+            label = read_label(label_names[i])
+            if label.shape[0] != end - start:
+                raise ValueError(f"{label_names[i]}: Scan과 Label의 개수가 다름")
+            labels[start:end] = label
+    points.flush()
+    if labels is not None:
+        labels.flush()
+
+    # 4. offset 테이블 및 프레임 정보 저장
+    np.save(os.path.join(out_path, "offsets.npy"), offsets)
+    if frame_ids is None:
+        frame_ids = [frame_id(name) for name in scan_names]
+    info = {
+        "version": ARCHIVE_VERSION,
+        "predictions": predictions,
+        "labels": has_labels,
+        "frames": list(frame_ids),
+    }
+    with open(os.path.join(out_path, "frames.json"), 'w') as f:
+        json.dump(info, f)
+
+
+# 아카이브 읽기 (np.memmap, 프레임 단위 zero-copy view)
+## 프레임 이름 목록처럼 사용 가능 (len, [i] -> frame id)
+class PackedSequence:
+
+    def __init__(self, path):
+        self.path = path
+
+        # 1. 프레임 정보
+        with open(os.path.join(path, "frames.json"), 'r') as f:
+            info = json.load(f)
+        if info.get("version") != ARCHIVE_VERSION:
+            raise RuntimeError(f"지원하지 않는 아카이브 버전: {info.get('version')}")
+        self.frame_ids = info["frames"]
+        self.predictions = info["predictions"]
+
+        # 2. memmap 열기 (복사 없음)
+        self.offsets = np.load(os.path.join(path, "offsets.npy"))
+        self.points = np.load(os.path.join(path, "points.npy"), mmap_mode='r')
+        self.labels = None
+        if info["labels"]:
+            self.labels = np.load(os.path.join(path, "labels.npy"), mmap_mode='r')
+
+    @property
+    def has_labels(self):
+        return self.labels is not None
+
+    # 프레임 i의 [x, y, z, intensity] view
+    def scan(self, index):
+        return self.points[self.offsets[index]:self.offsets[index + 1]]
+
+    # 프레임 i의 label view
+    def label(self, index):
+        if self.labels is None:
+            raise RuntimeError("label이 없는 아카이브")
+        return self.labels[self.offsets[index]:self.offsets[index + 1]]
+
+    def __len__(self):
+        return len(self.frame_ids)
+
+    def __getitem__(self, index):
+        return self.frame_ids[index]
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+import os
+
+import numpy as np
+
+from auxiliary.formats import LABEL_EXTENSIONS, detect_extension
+from auxiliary.labelstats import read_labels
+from auxiliary.seqindex import SequenceIndex
+
+
+# run 이름으로 사용하지 않는 폴더 이름 (SemanticKITTI 제출 형식: {run}/sequences/00/predictions)
+RUN_DIR_NAMES = ('predictions', 'labels', 'sequences')
+
+
+# run 폴더 -> 표시 이름
+def run_name(run_dir):
+    path = os.path.abspath(run_dir)
+    while os.path.basename(path) in RUN_DIR_NAMES or os.path.basename(path).isdigit():
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return os.path.basename(path) or run_dir
+
+
+# run 폴더 형식 확인
+## .label 파일 폴더: label만 저장 (predictions=False)
+## 그 외: [x, y, z, intensity, label] prediction scan 파일 (predictions=True, label 열만 사용)
+def is_label_dir(run_dir):
+    return detect_extension(run_dir, LABEL_EXTENSIONS, None) is not None
+
+
+# geometry / ground truth / run 별 파일 목록을 frame id로 맞추기
+## geometry_dir: scan 폴더 (None이면 첫 번째 prediction scan run의 xyz 사용)
+## 모든 run에 있는 프레임만 사용
+def match_runs(geometry_dir, run_dirs, gt_dir=None, names=None):
+    problems = []
+    names = names or [run_name(run_dir) for run_dir in run_dirs]
+
+    # 1. geometry 폴더 결정
+    geometry_predictions = False
+    if geometry_dir is None:
+        scan_runs = [run_dir for run_dir in run_dirs if not is_label_dir(run_dir)]
+        if not scan_runs:
+            raise RuntimeError("geometry로 사용할 scan 폴더가 없습니다 (.label run만 있음)")
+        geometry_dir = scan_runs[0]
+        geometry_predictions = True
+        gt_dir = None
+
+    # 2. geometry (+ ground truth) 목록
+    geometry = SequenceIndex(geometry_dir, gt_dir, predictions=geometry_predictions).refresh()
+    problems += ["geometry " + problem for problem in geometry.problems]
+    frames = {frame["frame"]: frame for frame in geometry.frames}
+
+    # 3. run별 목록 (label 폴더는 geometry와 point 개수 비교)
+    runs = []
+    for name, run_dir in zip(names, run_dirs):
+        if is_label_dir(run_dir):
+            index = SequenceIndex(geometry_dir, run_dir, predictions=geometry_predictions).refresh()
+            files = {frame["frame"]: frame["label"] for frame in index.frames}
+            predictions = False
+        else:
+            index = SequenceIndex(run_dir, predictions=True).refresh()
+            files = {frame["frame"]: frame["scan"] for frame in index.frames}
+            predictions = True
+        problems += [f"{name} {problem}" for problem in index.problems]
+        runs.append((name, files, predictions))
+
+    # 4. 공통 프레임
+    common = sorted(set(frames).intersection(*[files for _, files, _ in runs]))
+    geometry_names = [frames[frame_id]["scan"] for frame_id in common]
+    gt_names = [frames[frame_id]["label"] for frame_id in common] if gt_dir is not None else None
+    runs = [(name, [files[frame_id] for frame_id in common], predictions)
+            for name, files, predictions in runs]
+    return geometry_names, geometry_predictions, gt_names, runs, problems
+
+
+# 비교 프레임 (geometry 하나 + source별 label/색상)
+class CompareFrame:
+
+    def __init__(self, index, points, unproj_range, proj_range, proj_idx, labels, colors, proj_colors,
+                 accuracy):
+        self.index = index
+        # 모든 source가 공유하는 geometry
+        self.points = points
+        self.unproj_range = unproj_range
+        self.proj_range = proj_range
+        self.proj_idx = proj_idx
+        # source 이름 -> semantic label [N], 색상 [N, 3], 2D 색상 [H, W, 3]
+        self.labels = labels
+        self.colors = colors
+        self.proj_colors = proj_colors
+        # run 이름 -> ground truth 일치 비율 (ground truth가 없으면 빈 dict)
+        self.accuracy = accuracy
+
+    # 프레임이 차지하는 메모리 크기 (byte)
+    @property
+    def nbytes(self):
+        total = self.points.nbytes + self.unproj_range.nbytes + self.proj_range.nbytes + self.proj_idx.nbytes
+        for group in (self.labels, self.colors, self.proj_colors):
+            total += sum(value.nbytes for value in group.values())
+        return total
+
+
+# 여러 run 비교 로더
+## geometry는 프레임마다 한 번만 읽고 투영 (scan: LaserScan, project=True)
+## run마다 label 열만 읽고 (prediction scan은 memmap으로 label 열만) 같은 proj_idx로 2D 색상 생성
+class RunComparison:
+
+    # ground truth source 이름
+    GT = "gt"
+
+    def __init__(self, scan, geometry_names, runs, color_lut, label_lut=None, gt_names=None):
+        self.scan = scan
+        self.geometry_names = geometry_names
+        self.color_lut = color_lut
+        self.label_lut = label_lut
+
+        # source 목록 [(이름, 파일 목록, prediction scan 여부)], ground truth가 있으면 맨 앞
+        self.sources = list(runs)
+        if gt_names is not None:
+            self.sources.insert(0, (self.GT, gt_names, False))
+        self.has_gt = gt_names is not None
+        self.total = len(geometry_names)
+
+    @property
+    def names(self):
+        return [name for name, _, _ in self.sources]
+
+    def __len__(self):
+        return self.total
+
+    # source 하나의 semantic label 읽기
+    def _read_label(self, files, predictions, index, num_points):
+        label = read_labels(files[index], predictions)
+        if label.shape[0] != num_points:
+            raise ValueError(f"Scan과 Label의 개수가 다름 ({num_points} != {label.shape[0]}): {files[index]}")
+        label = label & 0xFFFF
+        if self.label_lut is not None:
+            label = self.label_lut[label]
+        return label
+
+    # 프레임 읽기
+    def load(self, index):
+
+        # 1. geometry 읽기 및 투영 (한 번)
+        self.scan.open_scan(self.geometry_names[index])
+        points = self.scan.points
+        proj_idx = self.scan.proj_idx
+        num_points = points.shape[0]
+        ## 투영된 픽셀과 point index (모든 source가 공유)
+        mask = proj_idx >= 0
+        hit = proj_idx[mask]
+
+        # 2. source별 label 및 색상
+        labels = {}
+        colors = {}
+        proj_colors = {}
+        for name, files, predictions in self.sources:
+            label = self._read_label(files, predictions, index, num_points)
+            labels[name] = label
+            colors[name] = self.color_lut[label]
+            proj_color = np.zeros(proj_idx.shape + (3,), dtype=np.uint8)
+            proj_color[mask] = self.color_lut[label[hit]]
+            proj_colors[name] = proj_color
+
+        # 3. ground truth 일치 비율
+        accuracy = {}
+        if self.has_gt and num_points > 0:
+            gt = labels[self.GT]
+            for name in self.names[1:]:
+                accuracy[name] = np.count_nonzero(labels[name] == gt) / num_points
+
+        return CompareFrame(index, points, self.scan.unproj_range, self.scan.proj_range, proj_idx,
+                            labels, colors, proj_colors, accuracy)
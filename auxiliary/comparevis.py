@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# This file is covered by the LICENSE file in the root of this project.
+
+import vispy
+from vispy.scene import visuals, SceneCanvas
+from auxiliary.render import display_colors, range_point_colors, range_image
+from auxiliary.colormaps import get_colormap
+
+
+# 여러 run 비교 시각화 도구
+## view 순서: 거리 기반 색상, ground truth (있으면), run 순서
+## 모든 3D view는 거리 view의 카메라에 연결 (같은 시점)
+class CompareVis:
+
+    # 3D view 한 줄에 놓을 최대 개수
+    COLUMNS = 3
+
+    def __init__(self, comparison, images=True):
+        self.comparison = comparison
+        self.images = images
+        self.offset = 0
+        self.total = len(comparison)
+
+        # 거리 기반 색상 컬러맵 (미리 계산된 viridis, RGB)
+        self.range_colormap = get_colormap("viridis")
+
+        self.reset()
+        self.update_scan()
+
+    # 시각화 인터페이스 초기화
+    def reset(self):
+        names = ["range"] + self.comparison.names
+
+        # 1. 3D pointcloud 시각화 창 설정
+        self.canvas = SceneCanvas(keys='interactive', show=True)
+        self.canvas.events.key_press.connect(self.key_press)
+        self.canvas.events.draw.connect(self.draw)
+        self.grid = self.canvas.central_widget.add_grid()
+
+        ## view 생성 (COLUMNS 개씩 줄바꿈), 첫 번째 view의 카메라를 공유
+        self.views = {}
+        self.point_vis = {}
+        for k, name in enumerate(names):
+            view = vispy.scene.widgets.ViewBox(border_color='white', parent=self.canvas.scene)
+            self.grid.add_widget(view, k // self.COLUMNS, k % self.COLUMNS)
+            self.point_vis[name] = visuals.Markers(antialias=0)
+            view.camera = 'turntable'
+            view.add(self.point_vis[name])
+            visuals.XYZAxis(parent=view.scene)
+            if k > 0:
+                view.camera.link(self.views["range"].camera)
+            self.views[name] = view
+        print("view 순서: " + ", ".join(names))
+
+        # 2. 2D 이미지 시각화 창 설정 (한 줄에 하나씩)
+        if self.images:
+            W = self.comparison.scan.proj_W
+            H = self.comparison.scan.proj_H
+            self.img_canvas = SceneCanvas(keys='interactive', show=True, size=(W, H * len(names)))
+            self.img_canvas.events.key_press.connect(self.key_press)
+            self.img_canvas.events.draw.connect(self.draw)
+            self.img_grid = self.img_canvas.central_widget.add_grid()
+            self.img_vis = {}
+            for k, name in enumerate(names):
+                view = vispy.scene.widgets.ViewBox(border_color='white', parent=self.img_canvas.scene)
+                self.img_grid.add_widget(view, k, 0)
+                self.img_vis[name] = visuals.Image(cmap='viridis')
+                view.add(self.img_vis[name])
+
+    # 현재 프레임 로드 및 시각화
+    def update_scan(self):
+        frame = self.comparison.load(self.offset)
+
+        # 1. 3D pointcloud (모든 view가 같은 points 배열 사용)
+        colors = {"range": range_point_colors(frame.unproj_range, self.range_colormap)}
+        for name, color in frame.colors.items():
+            colors[name] = display_colors(color)
+        for name, color in colors.items():
+            self.point_vis[name].set_data(frame.points,
+                                          face_color=color,
+                                          edge_color=color,
+                                          size=1
+                                         )
+
+        # 2. 2D 이미지
+        if self.images:
+            self.img_vis["range"].set_data(range_image(frame.proj_range))
+            for name, proj_color in frame.proj_colors.items():
+                self.img_vis[name].set_data(display_colors(proj_color))
+            for vis in self.img_vis.values():
+                vis.update()
+
+        # 3. 창 제목 (ground truth가 있으면 run별 일치 비율)
+        title = "scan " + str(self.offset)
+        if frame.accuracy:
+            title += " | " + " / ".join("%s %.1f%%" % (name, value * 100.0)
+                                         for name, value in frame.accuracy.items())
+        self.canvas.title = title
+        if self.images:
+            self.img_canvas.title = title
+
+    # 키보드 입력 처리
+    def key_press(self, event):
+
+        # 1. 키 이벤트 중복 처리 방지
+        self.canvas.events.key_press.block()
+        if self.images:
+            self.img_canvas.events.key_press.block()
+
+        # 2. 키 입력에 따른 동작 처리
+        if event.key == 'N':
+            self.offset = (self.offset + 1) % self.total
+            self.update_scan()
+        elif event.key == 'B':
+            self.offset = (self.offset - 1) % self.total
+            self.update_scan()
+        elif event.key == 'Q' or event.key == 'Escape':
+            self.destroy()
+
+    # 그리기 이벤트 처리 (키보드 입력 차단 해제)
+    def draw(self, event):
+        if self.canvas.events.key_press.blocked():
+            self.canvas.events.key_press.unblock()
+        if self.images and self.img_canvas.events.key_press.blocked():
+            self.img_canvas.events.key_press.unblock()
+
+    # 시각화 종료
+    def destroy(self):
+        self.canvas.close()
+        if self.images:
+            self.img_canvas.close()
+        vispy.app.quit()
+
+    # 시각화 애플리케이션 실행
+    def run(self):
+        vispy.app.run()
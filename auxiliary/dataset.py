@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+import copy
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import yaml
+
+from auxiliary.laserscan import SemLaserScan, projection_options
+from auxiliary.frame import ScanFrame
+from auxiliary.seqindex import SequenceIndex
+
+
+# 학습용 sequence iterator (GUI 없이 사용, vispy/matplotlib 불러오지 않음)
+## worker thread가 다음 프레임을 미리 읽고, batch는 미리 할당한 버퍼를 재사용
+class ScanDataset:
+
+    def __init__(self,
+                 scan,
+                 scan_names,
+                 label_names,
+                 semantics=True,
+                 workers=2,
+                 prefetch=4
+                ):
+        self.scan = scan
+        self.scan_names = scan_names
+        self.label_names = label_names
+        self.semantics = semantics
+        self.workers = workers
+        self.prefetch = max(1, prefetch)
+
+        # worker thread 별 scan 객체
+        self._local = threading.local()
+
+        # batch 버퍼 (더 큰 batch/point 수가 필요할 때만 다시 할당)
+        self._buffers = {}
+
+    # sequence 폴더와 설정 파일로 생성 (visualize.py와 같은 폴더 구성)
+    @classmethod
+    def from_sequence(cls, sequence, config, predictions=False, semantics=True, project=False,
+                      label_map=None, **kwargs):
+        cfg = yaml.safe_load(open(config, 'r')) if isinstance(config, str) else config
+        lidar = cfg["lidar"]
+        if predictions:
+            scan_dir = os.path.join(sequence, "predictions")
+            label_dir = None
+        else:
+            scan_dir = os.path.join(sequence, lidar["manufacturer"])
+            label_dir = os.path.join(sequence, "labels") if semantics else None
+        index = SequenceIndex(scan_dir, label_dir, predictions=predictions).refresh()
+
+        scan = SemLaserScan(cfg.get("color_map", {}), project=project, H=lidar["H"], W=lidar["W"],
+                            fov_up=lidar["fov_up"], fov_down=lidar["fov_down"],
+                            **projection_options(lidar))
+        scan.set_combined(predictions)
+        if label_map is not None:
+            scan.set_mapping(True)
+            scan.set_label_map(label_map)
+        return cls(scan, index.scan_names, index.label_names,
+                   semantics=semantics or predictions, **kwargs)
+
+    def __len__(self):
+        return len(self.scan_names)
+
+    # worker thread 전용 scan 객체
+    def _worker_scan(self):
+        scan = getattr(self._local, "scan", None)
+        if scan is None:
+            scan = copy.deepcopy(self.scan)
+            self._local.scan = scan
+        return scan
+
+    # 프레임 하나 읽기 (색상 계산 없음)
+    def load(self, index, scan=None):
+        scan = scan or self._worker_scan()
+        scan.open_scan(self.scan_names[index])
+        if self.semantics and not scan.predictions:
+            scan.open_label(self.label_names[index])
+        return ScanFrame.from_scan(scan, index)
+
+    # 프레임 순서
+    def _order(self, shuffle, seed):
+        if shuffle:
+            return np.random.default_rng(seed).permutation(len(self)).tolist()
+        return list(range(len(self)))
+
+    # 프레임 단위 iterator (ScanFrame)
+    ## 읽는 중인 프레임은 prefetch 개수까지 (메모리 일정)
+    def frames(self, shuffle=False, seed=None):
+        order = self._order(shuffle, seed)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="dataset") as executor:
+            pending = deque()
+            for index in order:
+                pending.append(executor.submit(self.load, index))
+                if len(pending) >= self.prefetch:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def __iter__(self):
+        return self.frames()
+
+    # batch 버퍼 준비 (재사용)
+    ## 요청 크기보다 작을 때만 늘려서 다시 할당하고, 필요한 부분의 view를 반환
+    def _buffer(self, name, shape, dtype):
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.dtype != dtype or any(s > c for s, c in zip(shape, buffer.shape)):
+            capacity = shape if buffer is None else tuple(max(s, c) for s, c in zip(shape, buffer.shape))
+            buffer = np.empty(capacity, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer[tuple(slice(0, s) for s in shape)]
+
+    # 고정 크기 batch iterator
+    ## points [B, P, 3], intensity [B, P], mask [B, P] (실제 point 여부), index/counts [B] (빈 자리는 -1/0)
+    ## semantics: sem_label/inst_label [B, P]
+    ## 투영 사용 시 proj_range/proj_idx/proj_mask [B, H, W] (proj_idx는 batch 안 point index)
+    ## max_points: P 고정 (넘는 프레임은 seed로 고정한 random subsample, 빠진 point의 픽셀은 빈 픽셀), None이면 batch 안 최대 point 수
+    ## reuse: 버퍼를 다음 batch에서 다시 사용 (보관하려면 복사 필요)
+    def batches(self, batch_size, max_points=None, shuffle=False, seed=None, drop_last=False, reuse=True):
+        rng = np.random.default_rng(seed)
+        batch = []
+        for frame in self.frames(shuffle, seed):
+            batch.append(frame)
+            if len(batch) == batch_size:
+                yield self._collate(batch, batch_size, max_points, reuse, rng)
+                batch = []
+        if batch and not drop_last:
+            yield self._collate(batch, batch_size, max_points, reuse, rng)
+
+    # P개를 넘는 프레임의 point 선택 (point 순서 유지)
+    ## 앞에서부터 자르면 ring/방위각 구간이 통째로 빠지므로 random subsample
+    @staticmethod
+    def _subsample(num_points, P, rng):
+        if num_points <= P:
+            return None
+        keep = rng.choice(num_points, P, replace=False)
+        keep.sort()
+        return keep
+
+    # 프레임 목록 -> padding된 batch
+    def _collate(self, frames, batch_size, max_points, reuse, rng=None):
+        buffer = self._buffer if reuse else (lambda name, shape, dtype: np.empty(shape, dtype=dtype))
+        rng = rng if rng is not None else np.random.default_rng()
+        counts = np.array([frame.points.shape[0] for frame in frames], dtype=np.int64)
+        P = max_points or int(counts.max())
+        ## 마지막 batch도 같은 shape (빈 자리는 mask False, index -1, counts 0)
+        B = batch_size if reuse else len(frames)
+        index = np.full(B, -1, dtype=np.int64)
+        index[:len(frames)] = [frame.index for frame in frames]
+        counts = np.concatenate((np.minimum(counts, P), np.zeros(B - len(frames), dtype=np.int64)))
+
+        out = {
+            "index": index,
+            "counts": counts,
+            "points": buffer("points", (B, P, 3), np.float32),
+            "intensity": buffer("intensity", (B, P), np.float32),
+            "mask": buffer("mask", (B, P), np.bool_),
+        }
+        if self.semantics:
+            out["sem_label"] = buffer("sem_label", (B, P), np.uint32)
+            out["inst_label"] = buffer("inst_label", (B, P), np.uint32)
+        if self.scan.project:
+            H, W = self.scan.proj_H, self.scan.proj_W
+            out["proj_range"] = buffer("proj_range", (B, H, W), np.float32)
+            out["proj_idx"] = buffer("proj_idx", (B, H, W), np.int32)
+            out["proj_mask"] = buffer("proj_mask", (B, H, W), np.bool_)
+
+        for name in ("points", "intensity", "mask", "sem_label", "inst_label"):
+            if name in out:
+                out[name].fill(0)
+        for b, frame in enumerate(frames):
+            n = out["counts"][b]
+            keep = self._subsample(frame.points.shape[0], P, rng)
+            take = slice(0, n) if keep is None else keep
+            out["points"][b, :n] = frame.points[take]
+            out["intensity"][b, :n] = frame.intensity[take]
+            out["mask"][b, :n] = True
+            if self.semantics:
+                out["sem_label"][b, :n] = frame.sem_label[take]
+                out["inst_label"][b, :n] = frame.inst_label[take]
+            if self.scan.project:
+                out["proj_range"][b] = frame.proj_range
+                out["proj_idx"][b] = frame.proj_idx
+                ## subsample: 프레임 point index -> batch point index (빠진 point는 -1, 마지막 칸은 빈 픽셀 -1용)
+                if keep is not None:
+                    remap = np.full(frame.points.shape[0] + 1, -1, dtype=np.int32)
+                    remap[keep] = np.arange(n, dtype=np.int32)
+                    proj_idx = out["proj_idx"][b]
+                    proj_idx[:] = remap[proj_idx]
+                    out["proj_range"][b][proj_idx < 0] = -1
+                out["proj_mask"][b] = out["proj_idx"][b] >= 0
+        if self.scan.project and len(frames) < B:
+            for name in ("proj_range", "proj_mask"):
+                out[name][len(frames):] = 0
+            out["proj_idx"][len(frames):] = -1
+        return out
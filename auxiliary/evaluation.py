@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from auxiliary.laserscan import SEM_LABEL_RANGE
+from auxiliary.labelstats import read_labels
+from auxiliary.formats import read_scan
+from auxiliary.seqindex import PREDICTION_STRIDE
+
+
+# prediction/ground truth 비교 (confusion matrix 누적)
+## class는 설정 파일의 label 목록을 0 ~ n-1로 압축, 목록에 없는 label은 마지막 index(n)
+## confusion matrix: [ground truth, prediction]
+## postprocess: prediction label 후처리 (auxiliary.postproc, scan: 2D 투영용 LaserScan(project=True))
+class SemanticEvaluator:
+
+    def __init__(self,
+                 class_keys,
+                 label_lut=None,
+                 ignore=(),
+                 workers=None,
+                 scan=None,
+                 postprocess=None
+                ):
+        self.class_keys = np.array(sorted(int(key) for key in class_keys), dtype=np.int64)
+        self.num_classes = self.class_keys.shape[0] + 1
+        self.workers = workers or os.cpu_count()
+        if postprocess is not None and scan is None:
+            raise ValueError("후처리에는 2D 투영용 scan이 필요합니다")
+        self.scan = scan
+        self.postprocess = postprocess
+
+        # 원본 label -> (label_map) -> class index 를 look-up 테이블 하나로 합침
+        class_lut = np.full(SEM_LABEL_RANGE, self.num_classes - 1, dtype=np.int64)
+        class_lut[self.class_keys] = np.arange(self.class_keys.shape[0])
+        if label_lut is not None:
+            class_lut = class_lut[label_lut]
+        self.class_lut = class_lut
+
+        # 평가에서 제외할 class (ground truth 기준)
+        self.ignore = [int(np.searchsorted(self.class_keys, key)) for key in ignore
+                       if key in self.class_keys]
+        self.conf = np.zeros((self.num_classes, self.num_classes), dtype=np.int64)
+
+    # 프레임 하나 평가 (bincount 한 번)
+    def add(self, prediction, label):
+        gt = self.class_lut[label & 0xFFFF]
+        pred = self.class_lut[prediction & 0xFFFF]
+        self.conf += np.bincount(gt * self.num_classes + pred,
+                                 minlength=self.num_classes ** 2).reshape((self.num_classes, self.num_classes))
+
+    # 파일 쌍 목록 평가 ([(prediction 파일, label 파일)])
+    ## 프레임을 worker 수의 여러 배로 나누어 분배, worker별 부분 matrix를 합산
+    def run(self, pairs):
+        chunks = max(1, min(len(pairs), self.workers * 8))
+        bounds = np.linspace(0, len(pairs), chunks + 1).astype(int)
+        parts = [pairs[bounds[i]:bounds[i + 1]] for i in range(chunks)]
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=_init_worker,
+                                 initargs=(self.class_lut, self.num_classes, self.scan, self.postprocess)) as executor:
+            for done, conf in enumerate(executor.map(_evaluate_chunk, parts)):
+                self.conf += conf
+                print(f"평가 {bounds[done + 1]}/{len(pairs)}")
+        return self
+
+    # ignore class를 제외한 confusion matrix 기준 TP/FP/FN
+    ## ignore ground truth point와 ground truth가 정의되지 않은 label (마지막 행)인 point는 제외
+    ## ignore로 예측한 point는 해당 ground truth의 FN
+    def _counts(self):
+        conf = self.conf.copy()
+        conf[self.ignore, :] = 0
+        conf[-1, :] = 0
+        tp = np.diag(conf)
+        fp = conf.sum(axis=0) - tp
+        fn = conf.sum(axis=1) - tp
+        return tp, fp, fn
+
+    # class별 IoU 및 mIoU (ignore class, 정의되지 않은 label 제외)
+    ## ground truth/prediction 모두 없는 class는 mIoU에서 제외
+    def iou(self):
+        tp, fp, fn = self._counts()
+        union = tp + fp + fn
+        iou = np.where(union > 0, tp / np.maximum(union, 1), np.nan)
+        include = np.ones(self.num_classes, dtype=bool)
+        include[self.ignore] = False
+        include[-1] = False
+        valid = include & (union > 0)
+        miou = float(np.mean(iou[valid])) if valid.any() else float("nan")
+        return iou[:-1], miou
+
+    # 전체 정확도 (ignore ground truth, 정의되지 않은 ground truth 제외, IoU와 같은 point 집합)
+    def accuracy(self):
+        tp, _, fn = self._counts()
+        total = tp.sum() + fn.sum()
+        return float(tp.sum() / total) if total > 0 else float("nan")
+
+    # 결과 dict (JSON 저장용)
+    def report(self, class_names=None):
+        class_names = class_names or {}
+        iou, miou = self.iou()
+        classes = {}
+        for index, key in enumerate(self.class_keys):
+            if index in self.ignore:
+                continue
+            classes[str(int(key))] = {
+                "name": str(class_names.get(int(key), int(key))),
+                "iou": None if np.isnan(iou[index]) else float(iou[index]),
+                "points": int(self.conf[index].sum()),
+            }
+        return {
+            "miou": miou,
+            "accuracy": self.accuracy(),
+            "ignore": [int(self.class_keys[i]) for i in self.ignore],
+            "classes": classes,
+            "confusion": self.conf.tolist(),
+        }
+
+
+# worker process 상태 (look-up 테이블, scan 버퍼는 process마다 한 번만 전달)
+_worker = {}
+
+
+def _init_worker(class_lut, num_classes, scan=None, postprocess=None):
+    _worker["class_lut"] = class_lut
+    _worker["num_classes"] = num_classes
+    _worker["scan"] = scan
+    _worker["postprocess"] = postprocess
+
+
+# prediction 파일 -> semantic label [N] (후처리 사용 시 scan을 투영하여 적용)
+def _read_prediction(prediction_file):
+    postprocess = _worker["postprocess"]
+    if postprocess is None:
+        return read_labels(prediction_file, predictions=True) & 0xFFFF
+    scan = _worker["scan"]
+    data = read_scan(prediction_file, PREDICTION_STRIDE // 4)
+    scan.set_points(data[:, 0:3], data[:, 3])
+    label = data[:, 4].astype(np.uint32).astype(np.uint16)
+    return postprocess.apply(scan, label)
+
+
+def _evaluate_chunk(pairs):
+    class_lut = _worker["class_lut"]
+    num_classes = _worker["num_classes"]
+    conf = np.zeros(num_classes ** 2, dtype=np.int64)
+    for prediction_file, label_file in pairs:
+        pred = class_lut[_read_prediction(prediction_file)]
+        gt = class_lut[read_labels(label_file) & 0xFFFF]
+        if pred.shape[0] != gt.shape[0]:
+            raise ValueError(f"Scan과 Label의 개수가 다름: {prediction_file}")
+        conf += np.bincount(gt * num_classes + pred, minlength=num_classes ** 2)
+    return conf.reshape((num_classes, num_classes))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+import numpy as np
+
+from auxiliary.laserscan import SEM_LABEL_RANGE
+
+
+# 클래스 이름/번호 목록 -> label 번호 목록
+## labels: config의 labels 항목 {번호: 이름} (이름으로 지정할 때 사용)
+def parse_classes(values, labels=None):
+    names = {str(name): int(key) for key, name in (labels or {}).items()}
+    classes = []
+    for value in values:
+        if str(value).isdigit():
+            classes.append(int(value))
+        elif str(value) in names:
+            classes.append(names[str(value)])
+        else:
+            raise ValueError(f"알 수 없는 클래스: {value}")
+    return classes
+
+
+# 범위/영역/높이/클래스 필터
+## 모든 조건은 불러온 프레임 배열에 대한 bool mask로 적용 (scan을 다시 읽지 않음)
+## None인 조건은 사용하지 않음
+class PointFilter:
+
+    # 좌표/거리 조건 이름 (mask 캐시 key)
+    BOUNDS = ('min_range', 'max_range', 'box', 'z_min', 'z_max')
+
+    def __init__(self, min_range=None, max_range=None, box=None, z_min=None, z_max=None,
+                 hidden=None):
+        self.min_range = min_range
+        self.max_range = max_range
+        # 자차 기준 영역 (x_min, x_max, y_min, y_max)
+        self.box = tuple(box) if box is not None else None
+        self.z_min = z_min
+        self.z_max = z_max
+        self.enabled = True
+
+        # 숨길 semantic label look-up 테이블
+        self.hidden = set()
+        self._hidden_lut = np.zeros(SEM_LABEL_RANGE, dtype=bool)
+        for label in hidden or ():
+            self.toggle_class(label)
+
+        # 마지막 프레임의 좌표/거리 mask (클래스만 바꾸면 다시 계산하지 않음)
+        self._frame = None
+        self._bounds_key = None
+        self._bounds_mask = None
+
+    # 사용 중인 조건이 있는지
+    @property
+    def active(self):
+        return self.enabled and (any(getattr(self, name) is not None for name in self.BOUNDS) or
+                                 bool(self.hidden))
+
+    # 클래스 숨김/표시 전환
+    def toggle_class(self, label):
+        if label in self.hidden:
+            self.hidden.discard(label)
+        else:
+            self.hidden.add(label)
+        self._hidden_lut[label] = label in self.hidden
+
+    # 필터 설명 (창 제목용)
+    def describe(self):
+        if not self.active:
+            return ""
+        parts = []
+        if self.min_range is not None or self.max_range is not None:
+            parts.append("range %s~%s" % (self._format(self.min_range), self._format(self.max_range)))
+        if self.box is not None:
+            parts.append("box x %g~%g y %g~%g" % self.box)
+        if self.z_min is not None or self.z_max is not None:
+            parts.append("z %s~%s" % (self._format(self.z_min), self._format(self.z_max)))
+        if self.hidden:
+            parts.append("hide " + ",".join(str(label) for label in sorted(self.hidden)))
+        return "filter " + " ".join(parts)
+
+    @staticmethod
+    def _format(value):
+        return "" if value is None else "%g" % value
+
+    # 좌표/거리 조건 mask (point별 직접 비교)
+    ## point를 cell로 묶어 cell 단위로 먼저 판단하는 방식은 cell 생성 비용이 커서 오히려 느림
+    ## (120k point, 조건 4개: 직접 비교 0.7ms, cell 방식 1.5ms + 프레임마다 cell 생성 18ms)
+    def _bounds(self, frame):
+        keep = np.ones(frame.points.shape[0], dtype=bool)
+        points = frame.points
+
+        def bound(values, low, high):
+            if low is not None:
+                keep[:] &= values >= low
+            if high is not None:
+                keep[:] &= values <= high
+
+        bound(frame.unproj_range, self.min_range, self.max_range)
+        if self.box is not None:
+            bound(points[:, 0], self.box[0], self.box[1])
+            bound(points[:, 1], self.box[2], self.box[3])
+        bound(points[:, 2], self.z_min, self.z_max)
+        return keep
+
+    # 표시할 point mask [N] (필터를 사용하지 않으면 None)
+    def mask(self, frame):
+        if not self.active:
+            return None
+
+        # 1. 좌표/거리 조건 (프레임 또는 조건이 바뀔 때만 다시 계산)
+        bounds = tuple(getattr(self, name) for name in self.BOUNDS)
+        if any(value is not None for value in bounds):
+            if self._frame is not frame or self._bounds_key != bounds:
+                self._bounds_mask = self._bounds(frame)
+                self._frame = frame
+                self._bounds_key = bounds
+            keep = self._bounds_mask.copy()
+        else:
+            keep = np.ones(frame.points.shape[0], dtype=bool)
+
+        # 2. 클래스 조건
+        if self.hidden and frame.sem_label is not None:
+            keep &= ~self._hidden_lut[frame.sem_label]
+        return keep
+
+
+# point mask -> 2D 이미지 픽셀 mask (제외된 point가 투영된 픽셀은 빈 픽셀로 표시)
+def pixel_mask(proj_idx, keep):
+    valid = proj_idx >= 0
+    pixels = np.zeros(proj_idx.shape, dtype=bool)
+    pixels[valid] = keep[proj_idx[valid]]
+    return pixels
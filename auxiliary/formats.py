@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+import io
+import os
+import struct
+import zlib
+
+import numpy as np
+
+
+# scan/label 파일 형식 (확장자로 선택)
+## scan : .bin (float32 원본), .npz (float32, 무손실 압축),
+##        .f16 (float16 xyz + uint8 intensity), .q16 (int16 고정소수점 xyz + uint8 intensity)
+## label: .label (uint32 원본), .label16 (uint16 semantic label만, instance 없음)
+## 압축: 위 형식 뒤에 .zlib / .zst / .lz4 를 붙이면 파일 전체를 블록 압축 (예: 000000.q16.zst)
+
+# 양자화 scan 헤더: magic, 형식(0: f16, 1: q16), 열 개수(4/5), 예약, point 수, xyz 단위, intensity 단위
+QUANT_HEADER = struct.Struct("<4sBBHIff")
+QUANT_MAGIC = b"LQSC"
+QUANT_F16 = 0
+QUANT_Q16 = 1
+
+# q16 기본 xyz 단위 (m), 최대 거리를 넘으면 파일마다 단위를 키움
+Q16_SCALE = 0.005
+
+
+# 1. 압축 (선택 의존성은 사용할 때 불러옴)
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError(".zst 형식은 zstandard 패키지가 필요합니다 (pip install zstandard)")
+    return zstandard
+
+
+def _lz4():
+    try:
+        import lz4.frame
+    except ImportError:
+        raise RuntimeError(".lz4 형식은 lz4 패키지가 필요합니다 (pip install lz4)")
+    return lz4.frame
+
+
+## zlib은 level을 올려도 크기 차이가 작아 빠른 level 1 사용 (해제 속도는 level과 거의 무관)
+COMPRESSORS = {
+    '.zlib': (lambda data: zlib.compress(data, 1), zlib.decompress),
+    '.zst': (lambda data: _zstd().ZstdCompressor(level=3).compress(data),
+             lambda data: _zstd().ZstdDecompressor().decompress(data)),
+    '.lz4': (lambda data: _lz4().compress(data), lambda data: _lz4().decompress(data)),
+}
+
+
+# 2. scan 형식
+## reader(buffer, columns) -> float32 [N, columns]
+## writer(scan, **options) -> (bytes, 열별 최대 오차)
+def _read_bin(buffer, columns):
+    return np.frombuffer(buffer, dtype=np.float32).reshape((-1, columns))
+
+
+def _write_bin(scan, **options):
+    scan = np.ascontiguousarray(scan, dtype=np.float32)
+    return scan.tobytes(), np.zeros(scan.shape[1], dtype=np.float32)
+
+
+def _read_npz(buffer, columns):
+    with np.load(io.BytesIO(buffer)) as data:
+        scan = data["scan"]
+    if scan.shape[1] < columns:
+        raise ValueError(f"scan 열 개수 부족 ({scan.shape[1]} < {columns})")
+    return scan[:, 0:columns]
+
+
+def _write_npz(scan, **options):
+    out = io.BytesIO()
+    np.savez_compressed(out, scan=np.asarray(scan, dtype=np.float32))
+    return out.getvalue(), np.zeros(scan.shape[1], dtype=np.float32)
+
+
+# 양자화 scan 읽기 (f16/q16 공통)
+## 구성: 헤더 | xyz [N, 3] (float16 또는 int16) | intensity [N] uint8 | label [N] uint32 (5열)
+def _read_quantized(buffer, columns):
+    magic, kind, file_columns, _, count, xyz_scale, intensity_scale = \
+        QUANT_HEADER.unpack_from(buffer, 0)
+    if magic != QUANT_MAGIC:
+        raise ValueError("양자화 scan 형식 오류")
+    if file_columns < columns:
+        raise ValueError(f"scan 열 개수 부족 ({file_columns} < {columns})")
+
+    offset = QUANT_HEADER.size
+    xyz_type = np.float16 if kind == QUANT_F16 else np.int16
+    xyz = np.frombuffer(buffer, dtype=xyz_type, count=count * 3, offset=offset).reshape((count, 3))
+    offset += xyz.nbytes
+    intensity = np.frombuffer(buffer, dtype=np.uint8, count=count, offset=offset)
+    offset += intensity.nbytes
+
+    scan = np.empty((count, columns), dtype=np.float32)
+    if kind == QUANT_F16:
+        scan[:, 0:3] = xyz
+    else:
+        np.multiply(xyz, np.float32(xyz_scale), out=scan[:, 0:3])
+    np.multiply(intensity, np.float32(intensity_scale), out=scan[:, 3])
+    if columns == 5:
+        scan[:, 4] = np.frombuffer(buffer, dtype=np.uint32, count=count, offset=offset)
+    return scan
+
+
+def _write_quantized(scan, kind, scale=Q16_SCALE):
+    scan = np.asarray(scan, dtype=np.float32)
+    count, columns = scan.shape
+    xyz = scan[:, 0:3]
+    bound = np.zeros(columns, dtype=np.float32)
+
+    # 1. xyz 양자화
+    if kind == QUANT_F16:
+        xyz_scale = 0.0
+        data = xyz.astype(np.float16)
+        ## float16 상대 오차 (가수 10bit)
+        bound[0:3] = np.abs(xyz).max(axis=0) * 2.0 ** -11 if count else 0.0
+    else:
+        max_abs = float(np.abs(xyz).max()) if count else 0.0
+        xyz_scale = max(scale, max_abs / 32767.0)
+        data = np.round(xyz / xyz_scale).astype(np.int16)
+        ## 단위의 절반 + 복원 시 float32 반올림 오차
+        bound[0:3] = xyz_scale / 2 + max_abs * 2.0 ** -22
+
+    # 2. intensity 양자화 (파일마다 최대값 기준 256단계)
+    intensity = scan[:, 3]
+    max_intensity = float(intensity.max()) if count else 0.0
+    intensity_scale = max_intensity / 255.0 if max_intensity > 0 else 1.0
+    quantized = np.clip(np.round(intensity / intensity_scale), 0, 255).astype(np.uint8)
+    bound[3] = intensity_scale / 2 + max_intensity * 2.0 ** -22
+
+    parts = [QUANT_HEADER.pack(QUANT_MAGIC, kind, columns, 0, count, xyz_scale, intensity_scale),
+             data.tobytes(), quantized.tobytes()]
+    if columns == 5:
+        parts.append(scan[:, 4].astype(np.uint32).tobytes())
+    return b"".join(parts), bound
+
+
+SCAN_FORMATS = {
+    '.bin': (_read_bin, _write_bin),
+    '.npz': (_read_npz, _write_npz),
+    '.f16': (_read_quantized, lambda scan, **options: _write_quantized(scan, QUANT_F16)),
+    '.q16': (_read_quantized, lambda scan, **options: _write_quantized(scan, QUANT_Q16, **options)),
+}
+
+
+# 3. label 형식
+## reader(buffer) -> uint32 [N], writer(label) -> bytes
+def _read_label16(buffer):
+    return np.frombuffer(buffer, dtype=np.uint16).astype(np.uint32)
+
+
+LABEL_FORMATS = {
+    '.label': (lambda buffer: np.frombuffer(buffer, dtype=np.uint32),
+               lambda label: np.ascontiguousarray(label, dtype=np.uint32).tobytes()),
+    '.label16': (_read_label16,
+                 lambda label: (np.asarray(label) & 0xFFFF).astype(np.uint16).tobytes()),
+}
+
+# 압축하지 않아도 되는 형식 (이미 압축됨)
+UNCOMPRESSED_ONLY = ['.npz']
+
+
+# 사용 가능한 확장자 목록 (LaserScan.EXTENSIONS_SCAN / SemLaserScan.EXTENSIONS_LABEL)
+def _extensions(formats):
+    return [base + compression
+            for base in formats
+            for compression in [''] + ([] if base in UNCOMPRESSED_ONLY else list(COMPRESSORS))]
+
+
+SCAN_EXTENSIONS = _extensions(SCAN_FORMATS)
+LABEL_EXTENSIONS = _extensions(LABEL_FORMATS)
+
+
+# 형식 추가 (reader/writer는 위 형식과 같은 signature)
+def register_scan_format(ext, reader, writer):
+    SCAN_FORMATS[ext] = (reader, writer)
+    SCAN_EXTENSIONS[:] = _extensions(SCAN_FORMATS)
+
+
+def register_label_format(ext, reader, writer):
+    LABEL_FORMATS[ext] = (reader, writer)
+    LABEL_EXTENSIONS[:] = _extensions(LABEL_FORMATS)
+
+
+# 파일 이름 -> (형식 확장자, 압축 확장자 또는 None)
+def split_extension(filename, formats):
+    compression = None
+    for ext in COMPRESSORS:
+        if filename.endswith(ext):
+            compression = ext
+            filename = filename[:-len(ext)]
+            break
+    ## 긴 확장자부터 확인 (.label16 / .label)
+    for ext in sorted(formats, key=len, reverse=True):
+        if filename.endswith(ext):
+            return ext, compression
+    raise RuntimeError(f"지원하지 않는 파일 형식: {filename}")
+
+
+# 파일 이름 -> frame id (형식/압축 확장자 제외)
+def frame_id(filename):
+    name = os.path.basename(filename)
+    for extensions in (SCAN_EXTENSIONS, LABEL_EXTENSIONS):
+        for ext in sorted(extensions, key=len, reverse=True):
+            if name.endswith(ext):
+                return name[:-len(ext)]
+    return os.path.splitext(name)[0]
+
+
+# 폴더 안 파일의 확장자 (없으면 default)
+## 폴더 안에 여러 형식이 섞여 있으면 어느 형식을 쓸지 알 수 없으므로 오류
+def detect_extension(path, extensions, default):
+    ordered = sorted(extensions, key=len, reverse=True)
+    found = set()
+    with os.scandir(path) as it:
+        for entry in it:
+            for ext in ordered:
+                if entry.name.endswith(ext):
+                    found.add(ext)
+                    break
+    if len(found) > 1:
+        raise RuntimeError(f"{path}: 여러 형식이 섞여 있습니다 ({', '.join(sorted(found))})")
+    return found.pop() if found else default
+
+
+# 파일의 point 개수 (형식 헤더 또는 압축 해제한 길이 기준)
+## 원본 .bin은 None (파일 크기로 계산)
+def scan_count(filename, columns=4):
+    ext, compression = split_extension(filename, SCAN_FORMATS)
+    if ext == '.bin' and compression is None:
+        return None
+    ## 압축하지 않은 양자화 형식은 헤더만 읽고 파일 크기와 비교
+    if ext in ('.f16', '.q16') and compression is None:
+        with open(filename, 'rb') as f:
+            header = f.read(QUANT_HEADER.size)
+            size = os.fstat(f.fileno()).st_size
+        if len(header) < QUANT_HEADER.size or header[:4] != QUANT_MAGIC:
+            raise ValueError("양자화 scan 형식 오류")
+        _, _, file_columns, _, count, _, _ = QUANT_HEADER.unpack(header)
+        ## xyz 6 byte + intensity 1 byte (+ label 4 byte)
+        expected = QUANT_HEADER.size + count * (7 if file_columns == 4 else 11)
+        if size != expected:
+            raise ValueError(f"양자화 scan 크기 오류 ({size} != {expected} bytes)")
+        return count
+    buffer = _read_buffer(filename, compression)
+    if ext == '.bin':
+        if len(buffer) % (4 * columns) != 0:
+            raise ValueError(f"scan 크기 오류 ({len(buffer)} bytes)")
+        return len(buffer) // (4 * columns)
+    return SCAN_FORMATS[ext][0](buffer, columns).shape[0]
+
+
+# 파일의 label 개수 (압축 해제한 길이 기준, 원본 .label은 None)
+def label_count(filename):
+    ext, compression = split_extension(filename, LABEL_FORMATS)
+    if ext == '.label' and compression is None:
+        return None
+    if ext == '.label16' and compression is None:
+        size = os.path.getsize(filename)
+        if size % 2 != 0:
+            raise ValueError(f"label 크기 오류 ({size} bytes)")
+        return size // 2
+    return LABEL_FORMATS[ext][0](_read_buffer(filename, compression)).shape[0]
+
+
+# 파일 내용 읽기 (압축 해제 포함)
+def _read_buffer(filename, compression):
+    with open(filename, 'rb') as f:
+        data = f.read()
+    if compression is not None:
+        ## 잘린 파일 (쓰는 중인 파일 등)은 형식 오류로 처리
+        try:
+            data = COMPRESSORS[compression][1](data)
+        except zlib.error as e:
+            raise ValueError(f"압축 해제 오류: {e}")
+    return data
+
+
+# scan 읽기 -> float32 [N, columns]
+## 원본 .bin은 np.fromfile로 바로 읽음
+def read_scan(filename, columns=4):
+    ext, compression = split_extension(filename, SCAN_FORMATS)
+    if ext == '.bin' and compression is None:
+        return np.fromfile(filename, dtype=np.float32).reshape((-1, columns))
+    return SCAN_FORMATS[ext][0](_read_buffer(filename, compression), columns)
+
+
+# label 읽기 -> uint32 [N]
+def read_label(filename):
+    ext, compression = split_extension(filename, LABEL_FORMATS)
+    if ext == '.label' and compression is None:
+        return np.fromfile(filename, dtype=np.uint32)
+    return LABEL_FORMATS[ext][0](_read_buffer(filename, compression))
+
+
+# scan 저장 -> 열별 최대 오차 (양자화 형식)
+def write_scan(filename, scan, **options):
+    ext, compression = split_extension(filename, SCAN_FORMATS)
+    data, bound = SCAN_FORMATS[ext][1](scan, **options)
+    if compression is not None:
+        data = COMPRESSORS[compression][0](data)
+    with open(filename, 'wb') as f:
+        f.write(data)
+    return bound
+
+
+# label 저장
+def write_label(filename, label):
+    ext, compression = split_extension(filename, LABEL_FORMATS)
+    data = LABEL_FORMATS[ext][1](label)
+    if compression is not None:
+        data = COMPRESSORS[compression][0](data)
+    with open(filename, 'wb') as f:
+        f.write(data)
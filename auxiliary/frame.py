@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+import numpy as np
+
+from auxiliary.archive import PackedSequence
+from auxiliary.laserscan import instance_color_lut
+
+
+# 화면 표시에 필요한 scan 데이터 묶음 (한 프레임)
+## 고정 dtype: float32 좌표/거리, int32 point index, uint16 label
+## 색상은 저장하지 않고 view에서 필요할 때 look-up 테이블로 생성 (uint8 BGR, 프레임마다 한 번)
+class ScanFrame:
+
+    # LaserScan/SemLaserScan에서 가져올 속성과 dtype
+    FIELDS = {
+        'points': np.float32,
+        'intensity': np.float32,
+        'unproj_range': np.float32,
+        'proj_range': np.float32,
+        'proj_idx': np.int32,
+        'sem_label': np.uint16,
+        'inst_label': np.uint16,
+    }
+
+    __slots__ = tuple(FIELDS) + ('index', 'name', 'sem_color_lut', '_colors')
+
+    def __init__(self, index, sem_color_lut=None, name=None, **fields):
+        self.index = index
+        self.name = name
+        for field, dtype in self.FIELDS.items():
+            value = fields.get(field)
+            if value is not None:
+                value = np.asarray(value).astype(dtype, copy=False)
+            setattr(self, field, value)
+        # semantic 색상 look-up 테이블 (scan과 공유, 복사하지 않음)
+        self.sem_color_lut = sem_color_lut
+        # 생성된 색상 {이름: 배열}
+        self._colors = {}
+
+    # scan 객체의 현재 상태를 프레임으로 저장
+    @classmethod
+    def from_scan(cls, scan, index):
+        fields = {name: getattr(scan, name, None) for name in cls.FIELDS}
+
+        ## reuse_buffers 모드에서는 2D 투영 버퍼가 다음 scan에서 덮어써지므로 복사
+        if getattr(scan, "reuse_buffers", False):
+            for name, value in fields.items():
+                if name.startswith("proj_") and isinstance(value, np.ndarray):
+                    fields[name] = value.copy()
+        return cls(index, sem_color_lut=getattr(scan, "sem_color_lut", None), **fields)
+
+    # 2D 이미지 실제 포인트 투영 여부
+    @property
+    def proj_mask(self):
+        return self.proj_idx >= 0
+
+    # 색상 생성 (처음 요청할 때 한 번)
+    def _color(self, name, make):
+        colors = self._colors.get(name)
+        if colors is None:
+            colors = make()
+            self._colors[name] = colors
+        return colors
+
+    # label -> 2D 색상 이미지 (투영되지 않은 픽셀은 0)
+    def _project_colors(self, labels, lut):
+        colors = np.zeros(self.proj_idx.shape + (3,), dtype=np.uint8)
+        mask = self.proj_idx >= 0
+        colors[mask] = lut[labels[self.proj_idx[mask]]]
+        return colors
+
+    # point별 semantic 색상 [N, 3]
+    @property
+    def sem_label_color(self):
+        return self._color("sem", lambda: self.sem_color_lut[self.sem_label])
+
+    # point별 instance 색상 [N, 3]
+    @property
+    def inst_label_color(self):
+        return self._color("inst", lambda: instance_color_lut()[self.inst_label])
+
+    # 2D semantic 색상 [H, W, 3]
+    @property
+    def proj_sem_color(self):
+        return self._color("proj_sem", lambda: self._project_colors(self.sem_label, self.sem_color_lut))
+
+    # 2D instance 색상 [H, W, 3]
+    @property
+    def proj_inst_color(self):
+        return self._color("proj_inst", lambda: self._project_colors(self.inst_label, instance_color_lut()))
+
+    # 프레임이 차지하는 메모리 크기 (byte, 생성된 색상 포함, 공유 look-up 테이블 제외)
+    @property
+    def nbytes(self):
+        total = 0
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if isinstance(value, np.ndarray):
+                total += value.nbytes
+        for colors in self._colors.values():
+            total += colors.nbytes
+        return total
+
+
+# scan (+ label) 파일을 읽어 프레임 생성
+## scan_names가 PackedSequence이면 아카이브에서 읽음
+def load_frame(scan, scan_names, label_names, index, semantics=True):
+    packed = isinstance(scan_names, PackedSequence)
+
+    with scan.timer.frame(index, "load"):
+        # 1. pointcloud 불러오기
+        if packed:
+            scan.open_packed(scan_names, index)
+        else:
+            scan.open_scan(scan_names[index])
+
+        # 2. label 불러오기 (predictions 모드는 open_scan에서 처리)
+        ## 색상은 프레임에서 필요할 때 생성 (ScanFrame)
+        if semantics and not scan.predictions:
+            if packed:
+                scan.open_packed_label(scan_names, index)
+            else:
+                scan.open_label(label_names[index])
+
+        # 3. 프레임 생성
+        with scan.timer.stage("snapshot"):
+            return ScanFrame.from_scan(scan, index)
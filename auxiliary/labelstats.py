@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from auxiliary.laserscan import SEM_LABEL_RANGE
+from auxiliary.seqindex import PREDICTION_STRIDE
+from auxiliary.formats import read_label, read_scan
+
+
+# label 파일 읽기 -> uint32 label [N]
+## predictions 모드: [x, y, z, intensity, label] 파일의 label 열만 사용
+def read_labels(filename, predictions=False):
+    if predictions:
+        ## 원본 .bin은 memmap으로 label 열만 변환, 그 외 형식은 전체 해석
+        if filename.endswith('.bin'):
+            scan = np.memmap(filename, dtype=np.float32, mode='r').reshape((-1, PREDICTION_STRIDE // 4))
+        else:
+            scan = read_scan(filename, PREDICTION_STRIDE // 4)
+        return scan[:, 4].astype(np.uint32)
+    return read_label(filename)
+
+
+# 프레임 하나의 통계
+## semantic/instance 16bit 값을 bincount로 집계하고, 0이 아닌 항목만 반환 (process 간 전송량 최소화)
+## 물체 하나 = (semantic, instance) 쌍, 프레임에 나온 물체 key (semantic << 16 | instance)를 함께 반환
+def frame_stats(filename, predictions=False, label_lut=None):
+    label = read_labels(filename, predictions)
+    sem_label = label & 0xFFFF
+    inst_label = label >> 16
+    if label_lut is not None:
+        sem_label = label_lut[sem_label]
+
+    sem_hist = np.bincount(sem_label, minlength=SEM_LABEL_RANGE)
+    sem_keys = np.flatnonzero(sem_hist)
+    ## instance 0은 instance가 없는 point
+    has_instance = inst_label > 0
+    instance_keys = np.unique((sem_label[has_instance].astype(np.uint32) << 16) | inst_label[has_instance])
+    return {
+        "points": int(label.shape[0]),
+        "sem_keys": sem_keys.astype(np.uint32),
+        "sem_counts": sem_hist[sem_keys],
+        "instance_keys": instance_keys,
+        "instances": int(instance_keys.shape[0]),
+        "instance_points": int(np.count_nonzero(has_instance)),
+    }
+
+
+# sequence 전체 label 통계
+## 프레임 단위로 process pool에 분배하고 결과를 순서대로 받아 누적
+## 동시에 처리 중인 프레임 수를 제한하여 sequence 길이와 상관없이 메모리 일정
+class LabelStats:
+
+    def __init__(self,
+                 class_keys,
+                 class_names=None,
+                 predictions=False,
+                 label_lut=None,
+                 workers=None
+                ):
+        self.class_keys = sorted(int(key) for key in class_keys)
+        self.class_names = class_names or {}
+        self.predictions = predictions
+        self.label_lut = label_lut
+        self.workers = workers or os.cpu_count()
+
+        # 전체 누적값
+        self.sem_points = np.zeros(SEM_LABEL_RANGE, dtype=np.int64)
+        self.sem_frames = np.zeros(SEM_LABEL_RANGE, dtype=np.int64)
+        self.frames = 0
+        self.points = 0
+        self.instance_points = 0
+        ## instance id는 sequence 안에서만 같은 물체를 뜻하므로 sequence별로 물체 key 집합 유지
+        ## instance_observations: 프레임별 물체 수의 합 (여러 프레임에 나온 물체는 여러 번)
+        self.instance_keys = {}
+        self.instance_observations = 0
+
+        ## per-frame CSV 열 순서 (class_keys에 없는 label은 other)
+        self.column = np.full(SEM_LABEL_RANGE, len(self.class_keys), dtype=np.int64)
+        self.column[self.class_keys] = np.arange(len(self.class_keys))
+
+    # 서로 다른 물체 수 (sequence별 (semantic, instance) 쌍의 합)
+    @property
+    def instances(self):
+        return sum(len(keys) for keys in self.instance_keys.values())
+
+    # 프레임 결과 누적 -> per-frame CSV 행의 class별 point 수
+    def add(self, result, sequence=None):
+        keys = result["sem_keys"]
+        counts = result["sem_counts"]
+        self.sem_points[keys] += counts
+        self.sem_frames[keys] += 1
+        self.frames += 1
+        self.points += result["points"]
+        self.instance_keys.setdefault(sequence, set()).update(result["instance_keys"].tolist())
+        self.instance_observations += result["instances"]
+        self.instance_points += result["instance_points"]
+        return np.bincount(self.column[keys], counts, minlength=len(self.class_keys) + 1).astype(np.int64)
+
+    # 파일 목록 처리 (frames: [(sequence, frame id, 파일 경로)])
+    ## frames_csv: per-frame 행을 처리 순서대로 바로 기록
+    def run(self, frames, frames_csv=None):
+        writer = None
+        if frames_csv is not None:
+            f = open(frames_csv, 'w', newline='')
+            writer = csv.writer(f)
+            writer.writerow(["sequence", "frame", "points", "instances", "instance_points"] +
+                            [self.class_name(key) for key in self.class_keys] + ["other"])
+
+        total = len(frames)
+        try:
+            for done, ((sequence, frame_id, _), result) in enumerate(zip(frames, self._map(frames))):
+                row = self.add(result, sequence)
+                if writer is not None:
+                    writer.writerow([sequence, frame_id, result["points"], result["instances"],
+                                     result["instance_points"]] + row.tolist())
+                if (done + 1) % 1000 == 0 or done + 1 == total:
+                    print(f"통계 {done + 1}/{total}")
+        finally:
+            if writer is not None:
+                f.close()
+        return self
+
+    # 프레임별 통계를 순서대로 반환 (처리 중인 프레임은 worker 수의 4배까지)
+    def _map(self, frames):
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=_init_worker,
+                                 initargs=(self.predictions, self.label_lut)) as executor:
+            pending = deque()
+            for _, _, filename in frames:
+                pending.append(executor.submit(_frame_stats, filename))
+                if len(pending) >= self.workers * 4:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def class_name(self, key):
+        return str(self.class_names.get(key, key))
+
+    # class별 합계 CSV
+    def write_classes(self, filename):
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["label", "name", "points", "ratio", "frames"])
+            for key in np.flatnonzero(self.sem_points):
+                writer.writerow([int(key), self.class_name(int(key)), int(self.sem_points[key]),
+                                 "%.6f" % (self.sem_points[key] / max(self.points, 1)),
+                                 int(self.sem_frames[key])])
+
+    # 전체 요약 JSON
+    def write_json(self, filename):
+        keys = np.flatnonzero(self.sem_points)
+        summary = {
+            "frames": self.frames,
+            "points": self.points,
+            "instances": self.instances,
+            "instance_observations": self.instance_observations,
+            "instance_points": self.instance_points,
+            "classes": {
+                str(int(key)): {
+                    "name": self.class_name(int(key)),
+                    "points": int(self.sem_points[key]),
+                    "frames": int(self.sem_frames[key]),
+                }
+                for key in keys
+            },
+        }
+        with open(filename, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+# worker process 상태 (label look-up 테이블은 process마다 한 번만 전달)
+_worker = {}
+
+
+def _init_worker(predictions, label_lut):
+    _worker["predictions"] = predictions
+    _worker["label_lut"] = label_lut
+
+
+def _frame_stats(filename):
+    return frame_stats(filename, _worker["predictions"], _worker["label_lut"])
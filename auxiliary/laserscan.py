@@ -1,21 +1,104 @@
 #!/usr/bin/env python3
+from functools import lru_cache
+
 import numpy as np
-import yaml
 
+from auxiliary.profiler import NullTimer
+from auxiliary.formats import LABEL_EXTENSIONS, SCAN_EXTENSIONS, read_label, read_scan
 
-class LaserScan:
 
-    # pointcloud 파일 확장자
-    EXTENSIONS_SCAN = ['.bin']
+# 16bit semantic label 전체 범위 (0 ~ 65535)
+SEM_LABEL_RANGE = 0x10000
+
+
+# label_map -> look-up 테이블 변환 (원본 label -> mapping label)
+## label_map에 없는 label은 default로 매핑
+def build_label_lut(label_map, default=4):
+    lut = np.full(SEM_LABEL_RANGE, default, dtype=np.uint16)
+    for key, value in label_map.items():
+        lut[int(key)] = value
+    return lut
+
+
+# instance id -> 색상 look-up 테이블 (uint8, 0 ~ 255)
+## 난수 대신 id hash 값으로 색상 결정 (실행할 때마다 같은 색상), instance 0(미분류)은 회색
+def build_instance_lut(size=SEM_LABEL_RANGE):
+    h = np.arange(size, dtype=np.uint32)
+    ## 32bit hash (murmur3 finalizer)
+    h ^= h >> 16
+    h *= np.uint32(0x85EBCA6B)
+    h ^= h >> 13
+    h *= np.uint32(0xC2B2AE35)
+    h ^= h >> 16
+    lut = np.empty((size, 3), dtype=np.uint8)
+    lut[:, 0] = h & 0xFF
+    lut[:, 1] = (h >> 8) & 0xFF
+    lut[:, 2] = (h >> 16) & 0xFF
+    lut[0] = 26
+    return lut
+
+
+# instance 색상 look-up 테이블 (process 안에서 한 번만 생성, 모든 scan/프레임이 공유)
+@lru_cache(maxsize=None)
+def instance_color_lut():
+    lut = build_instance_lut()
+    lut.setflags(write=False)
+    return lut
+
+
+# color_map -> look-up 테이블 변환 (label -> 색상, uint8 0 ~ 255, color_map과 같은 BGR 순서)
+## color_map에 없는 label은 default_color로 표시
+def build_color_lut(color_dict, default_color=(0, 0, 0)):
+    lut = np.empty((SEM_LABEL_RANGE, 3), dtype=np.uint8)
+    lut[:] = default_color
+    for key, value in color_dict.items():
+        lut[int(key)] = value
+    return lut
+
 
-    def __init__(self, project=False, H=64, W=1024, fov_up=3.0, fov_down=-25.0):
+class LaserScan:
+
+    # pointcloud 파일 확장자 (auxiliary/formats.py, 압축/양자화 형식 포함)
+    EXTENSIONS_SCAN = SCAN_EXTENSIONS
+
+    # 2D 투영 backend (픽셀마다 가장 가까운 point 선택 방식)
+    ## sort: 전체 point를 거리 기준 정렬 후 덮어쓰기 (O(N log N))
+    ## zbuffer: 픽셀별 최소 거리 reduction (O(N), 정렬 없음)
+    PROJ_BACKENDS = ['sort', 'zbuffer']
+
+    # 2D 투영 방식
+    ## spherical: point마다 수평각/수직각 계산
+    ## organized: point 순서로 행/열 결정 (센서 발사 순서로 저장된 H x W개 point, 삼각함수 없음)
+    ##            point 개수가 H x W가 아니면 spherical로 처리
+    PROJ_MODES = ['spherical', 'organized']
+
+    # organized 모드 point 순서
+    ## row: 행 우선 [H, W] (Ouster 등), column: 열 우선 [W, H] (firing 단위로 beam H개)
+    PROJ_ORDERS = ['row', 'column']
+
+    def __init__(self, project=False, H=64, W=1024, fov_up=3.0, fov_down=-25.0, reuse_buffers=False,
+                 proj_backend='zbuffer', proj_mode='spherical', proj_order='row', elevation=None):
+        if proj_backend not in self.PROJ_BACKENDS:
+            raise ValueError(f"지원하지 않는 투영 backend: {proj_backend}")
+        if proj_mode not in self.PROJ_MODES:
+            raise ValueError(f"지원하지 않는 투영 방식: {proj_mode}")
+        if proj_order not in self.PROJ_ORDERS:
+            raise ValueError(f"지원하지 않는 point 순서: {proj_order}")
         self.project = project
+        self.reuse_buffers = reuse_buffers
+        self.proj_backend = proj_backend
+        self.proj_mode = proj_mode
+        self.proj_order = proj_order
         self.proj_H = H
         self.proj_W = W
         self.proj_fov_up = fov_up
         self.proj_fov_down = fov_down
+        self.set_elevation(elevation)
+        # 마지막 scan을 organized 방식으로 투영했는지 여부
+        self.proj_organized = False
         self.predictions = False
         self.mapping = False
+        self.timer = NullTimer()
         self.reset()
 
     def set_combined(self, predictions):
@@ -24,6 +107,34 @@ class LaserScan:
     def set_mapping(self, mapping):
         self.mapping = mapping
 
+    # 단계별 시간 측정 설정 (auxiliary.profiler)
+    def set_timer(self, timer):
+        self.timer = timer
+
+    # beam별 수직각 테이블 설정 (degree, 위쪽 beam부터 H개)
+    ## 간격이 고르지 않은 센서: 수직각이 가장 가까운 beam의 행으로 투영
+    def set_elevation(self, elevation):
+        if elevation is None:
+            self.proj_elevation = None
+            self._elevation_bounds = None
+            return
+        elevation = np.radians(np.asarray(elevation, dtype=np.float64))
+        if elevation.shape != (self.proj_H,):
+            raise ValueError(f"수직각 테이블 크기 오류 ({elevation.shape[0]} != H {self.proj_H})")
+        if np.any(np.diff(elevation) >= 0):
+            raise ValueError("수직각 테이블은 위쪽 beam부터 내림차순이어야 합니다")
+        self.proj_elevation = elevation
+        ## 인접 beam 사이 경계 (오름차순, searchsorted용)
+        self._elevation_bounds = ((elevation[:-1] + elevation[1:]) / 2)[::-1].copy()
+
+    # 2D 투영 이미지 버퍼 준비
+    ## reuse_buffers 모드: 센서 설정(H, W)별로 한 번만 할당하고 이후에는 제자리에서 초기화
+    def _proj_buffer(self, name, shape, dtype, fill_value):
+        buffer = getattr(self, name, None) if self.reuse_buffers else None
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            return np.full(shape, fill_value, dtype=dtype)
+        buffer.fill(fill_value)
+        return buffer
 
     # 새로운 LiDAR scan을 처리할 준비
     def reset(self):
@@ -37,15 +148,15 @@ class LaserScan:
 
         # 3D -> 2D 전환 (이미지가 여러 정보를 포함)
         ## 정보1: 각 point의 거리
-        self.proj_range = np.full((self.proj_H, self.proj_W), -1, dtype=np.float32)
+        self.proj_range = self._proj_buffer("proj_range", (self.proj_H, self.proj_W), np.float32, -1)
         ## 정보2: 3D 좌표 공간 (x, y, z)
-        self.proj_xyz = np.full((self.proj_H, self.proj_W, 3), -1, dtype=np.float32)
+        self.proj_xyz = self._proj_buffer("proj_xyz", (self.proj_H, self.proj_W, 3), np.float32, -1)
         ## 정보3: 반사 강도 (intensity)
-        self.proj_intensity = np.full((self.proj_H, self.proj_W), -1, dtype=np.float32)
+        self.proj_intensity = self._proj_buffer("proj_intensity", (self.proj_H, self.proj_W), np.float32, -1)
         ## 정보4: 원본 3D point의 index
-        self.proj_idx = np.full((self.proj_H, self.proj_W), -1, dtype=np.int32)
-        ## 정보5: 2D 이미지 실제 포인트 투영 여부 (1 또는 0)
-        self.proj_mask = np.zeros((self.proj_H, self.proj_W), dtype=np.int32)
+        self.proj_idx = self._proj_buffer("proj_idx", (self.proj_H, self.proj_W), np.int32, -1)
+        ## 정보5: 2D 이미지 실제 포인트 투영 여부 (bool)
+        self.proj_mask = self._proj_buffer("proj_mask", (self.proj_H, self.proj_W), np.bool_, False)
 
         # 3D -> 2D 계산 중 사용되는 변수
         ## point의 2D 좌표
@@ -64,10 +175,8 @@ class LaserScan:
     # LiDAR scan 열기
     def open_scan(self, filename):
 
-        # 1. 기존 데이터 초기화
-        self.reset()
-
-        # 2. 파일 유효성 검사
+        # 1. 파일 유효성 검사
+        ## 기존 데이터 초기화는 set_points에서 처리 (중복 reset 방지)
         ## 파일명 검증
         if not isinstance(filename, str):
             raise TypeError(f"파일명이 오류, 현재 type: {str(type(filename))}")
@@ -75,23 +184,36 @@ class LaserScan:
         if not any(filename.endswith(ext) for ext in self.EXTENSIONS_SCAN):
             raise RuntimeError("파일 확장자 오류")
 
-        # 3. pointcloud 불러오기
-        scan = np.fromfile(filename, dtype=np.float32)
-        if self.predictions:
-            # predictions 모드 처리: [x, y, z, intensity, label] 형식
-            scan = scan.reshape((-1, 5))
+        # 2. pointcloud 불러오기 (확장자에 맞는 형식으로 해석)
+        ## predictions 모드: [x, y, z, intensity, label] 형식
+        ## 기존 방식: [x, y, z, intensity] 형식
+        with self.timer.stage("read") as stage:
+            scan = read_scan(filename, 5 if self.predictions else 4)
+            stage.nbytes = scan.nbytes
+
+        # 3. 데이터 형식 해석
+        with self.timer.stage("reshape", scan.nbytes):
+            if self.predictions:
+                labels = scan[:, 4].astype(np.uint32)
+            else:
+                labels = None
             points = scan[:, 0:3]
             intensity = scan[:, 3]
-            labels = scan[:, 4].astype(np.uint32)
-            self.set_points(points, intensity)
-            if hasattr(self, "set_label"):
-                self.set_label(labels)
-        else:
-            # 기존 방식: [x, y, z, intensity] 형식으로 파일을 해석
-            scan = scan.reshape((-1, 4))
-            points = scan[:, 0:3]
-            intensity = scan[:, 3]
-            self.set_points(points, intensity)
+
+        # 4. 멤버 변수 설정
+        self.set_points(points, intensity)
+        if labels is not None and hasattr(self, "set_label"):
+            self.set_label(labels)
+
+    # 아카이브에서 LiDAR scan 열기 (memmap view, 복사 없음)
+    def open_packed(self, archive, index):
+        scan = archive.scan(index)
+        points = scan[:, 0:3]
+        intensity = scan[:, 3]
+        self.set_points(points, intensity)
+        ## predictions 모드: label도 함께 설정
+        if self.predictions and hasattr(self, "set_label"):
+            self.set_label(archive.label(index))
 
     # pointcloud 설정
     def set_points(self, points, intensity=None):
@@ -116,11 +238,19 @@ class LaserScan:
 
         # 4. 2D 투영 실행
         if self.project:
-            self.do_range_projection()
+            with self.timer.stage("range_projection", self.points.nbytes):
+                self.do_range_projection()
 
     # pointcloud 2D 투영 변환
     def do_range_projection(self):
-        
+
+        # 0. organized 모드: point 순서로 투영 (H x W개가 아니면 아래 spherical 방식)
+        self.proj_organized = (self.proj_mode == 'organized' and
+                               self.points.shape[0] == self.proj_H * self.proj_W)
+        if self.proj_organized:
+            self._project_organized()
+            return
+
         # 1. LiDAR 센서 파라미터 설정
         fov_up = self.proj_fov_up / 180.0 * np.pi
         fov_down = self.proj_fov_down / 180.0 * np.pi
@@ -142,30 +272,86 @@ class LaserScan:
         # 4. 3D 각도 -> 2D 이미지 변환 준비
         ## 정규화 변환 (-pi, pi) -> (0, 1)
         proj_x = 0.5 * (yaw / np.pi + 1.0)
-        proj_y = 1.0 - (pitch + abs(fov_down)) / fov
 
         ## 정규화 좌표 -> 실제 이미지 크기에 맞게 스케일링
         proj_x *= self.proj_W
-        proj_y *= self.proj_H
+        if self.proj_elevation is None:
+            proj_y = 1.0 - (pitch + abs(fov_down)) / fov
+            proj_y *= self.proj_H
+        else:
+            ## 수직각 테이블: 가장 가까운 beam의 행 (위쪽 beam이 0행)
+            proj_y = (self.proj_H - 1) - np.searchsorted(self._elevation_bounds, pitch, side='right')
 
         # 5. 픽셀 index 처리 (원본 순서대로 처리)
-        ## 좌표 저장
+        ## 좌표 저장 (투영 backend는 읽기만 하므로 복사하지 않음)
         proj_x = np.floor(proj_x)
         proj_x = np.minimum(self.proj_W - 1, proj_x)
         proj_x = np.maximum(0, proj_x).astype(np.int32)
-        self.proj_x = np.copy(proj_x)
+        self.proj_x = proj_x
 
         proj_y = np.floor(proj_y)
         proj_y = np.minimum(self.proj_H - 1, proj_y)
         proj_y = np.maximum(0, proj_y).astype(np.int32)
-        self.proj_y = np.copy(proj_y)
+        self.proj_y = proj_y
 
         ## 거리 저장
-        self.unproj_range = np.copy(depth)
+        self.unproj_range = depth
+
+        # 6. 픽셀마다 가장 가까운 point 할당
+        if self.proj_backend == 'zbuffer':
+            self._project_zbuffer(depth, proj_x, proj_y)
+        else:
+            self._project_sort(depth, proj_x, proj_y)
+        ## point가 투영된 픽셀 (proj_idx >= 0, point 0도 포함)
+        np.greater_equal(self.proj_idx, 0, out=self.proj_mask)
+
+    # organized 투영: point i -> (행, 열) = point 순서
+    ## 픽셀마다 point가 하나이므로 가장 가까운 point 선택이 필요 없음 (reshape + 복사)
+    ## 거리가 0이거나 NaN인 point (반사 없음)는 빈 픽셀로 처리
+    def _project_organized(self):
+        H, W = self.proj_H, self.proj_W
+        num_points = self.points.shape[0]
+
+        # 1. point 배열 -> [H, W] 이미지 view
+        if self.proj_order == 'row':
+            image = lambda a: a.reshape((H, W) + a.shape[1:])
+        else:
+            image = lambda a: a.reshape((W, H) + a.shape[1:]).swapaxes(0, 1)
+
+        # 2. 거리 및 유효 point
+        depth = np.sqrt(np.einsum('ij,ij->i', self.points, self.points))
+        valid = image(depth > 0)
+        indices = np.arange(num_points, dtype=np.int32)
+
+        # 3. 2D 이미지 할당 (전체 복사 후 빈 픽셀만 reset 값으로 되돌림)
+        self.proj_range[...] = image(depth)
+        self.proj_xyz[...] = image(self.points)
+        self.proj_intensity[...] = image(self.intensity.reshape(-1))
+        self.proj_idx[...] = image(indices)
+        empty = ~valid
+        if empty.any():
+            self.proj_range[empty] = -1
+            self.proj_xyz[empty] = -1
+            self.proj_intensity[empty] = -1
+            self.proj_idx[empty] = -1
+        ## spherical 투영과 같은 기준 (proj_idx >= 0)
+        np.greater_equal(self.proj_idx, 0, out=self.proj_mask)
+
+        # 4. point별 픽셀 좌표 및 거리
+        if self.proj_order == 'row':
+            self.proj_y, self.proj_x = np.divmod(indices, W)
+        else:
+            self.proj_x, self.proj_y = np.divmod(indices, H)
+        self.unproj_range = depth
 
-        # 6. 거리 기준 정렬 (내림차순)
+    # 투영 backend: 거리 기준 정렬
+    ## 먼 point부터 할당하여 마지막에 할당된 (가장 가까운) point가 남도록 처리
+    ## 거리가 같으면 index가 작은 point가 마지막에 할당되도록 stable 정렬 (zbuffer와 같은 결과)
+    def _project_sort(self, depth, proj_x, proj_y):
+
+        # 1. 거리 기준 정렬 (내림차순)
         indices = np.arange(depth.shape[0])
-        order = np.argsort(depth)[::-1]
+        order = np.argsort(depth, kind='stable')[::-1]
         depth = depth[order]
         indices = indices[order]
         points = self.points[order]
@@ -173,46 +359,73 @@ class LaserScan:
         proj_y = proj_y[order]
         proj_x = proj_x[order]
 
-        # 7. 3D -> 2D 이미지 할당
+        # 2. 3D -> 2D 이미지 할당
         self.proj_range[proj_y, proj_x] = depth
         self.proj_xyz[proj_y, proj_x] = points
         self.proj_intensity[proj_y, proj_x] = intensity
         self.proj_idx[proj_y, proj_x] = indices
-        self.proj_mask = (self.proj_idx > 0).astype(np.float32)
+
+    # 투영 backend: z-buffer (정렬 없이 픽셀별 최소 거리 선택)
+    ## 거리가 같은 point가 겹치면 index가 작은 point 선택
+    def _project_zbuffer(self, depth, proj_x, proj_y):
+        num_points = depth.shape[0]
+
+        # 1. 픽셀 linear index
+        pixel = proj_y.astype(np.intp) * self.proj_W + proj_x
+
+        # 2. 픽셀별 최소 거리
+        nearest = np.full(self.proj_H * self.proj_W, np.inf, dtype=depth.dtype)
+        np.minimum.at(nearest, pixel, depth)
+
+        # 3. 최소 거리인 point 중 index가 가장 작은 point 선택
+        candidates = np.flatnonzero(depth == nearest[pixel])
+        winner = np.full(self.proj_H * self.proj_W, num_points, dtype=np.intp)
+        np.minimum.at(winner, pixel[candidates], candidates)
+        hit = np.flatnonzero(winner < num_points)
+        indices = winner[hit]
+
+        # 4. 3D -> 2D 이미지 할당 (픽셀 linear index 기준)
+        self.proj_range.reshape(-1)[hit] = depth[indices]
+        self.proj_xyz.reshape(-1, 3)[hit] = self.points[indices]
+        self.proj_intensity.reshape(-1)[hit] = self.intensity[indices]
+        self.proj_idx.reshape(-1)[hit] = indices
+
+
+# 설정 파일 lidar 항목 -> 투영 옵션 (LaserScan/SemLaserScan 생성자 인자)
+## proj_backend, projection (spherical/organized), point_order (row/column), elevation (beam별 수직각)
+def projection_options(lidar):
+    return {
+        "proj_backend": lidar.get("proj_backend", "zbuffer"),
+        "proj_mode": lidar.get("projection", "spherical"),
+        "proj_order": lidar.get("point_order", "row"),
+        "elevation": lidar.get("elevation"),
+    }
 
 
 # semantic segmentation label 처리 기능 추가
 class SemLaserScan(LaserScan):
 
-    # label 파일 확장자
-    EXTENSIONS_LABEL = ['.label']
+    # label 파일 확장자 (auxiliary/formats.py)
+    EXTENSIONS_LABEL = LABEL_EXTENSIONS
 
-    def __init__(self, sem_color_dict=None, project=False, H=64, W=1024, fov_up=3.0, fov_down=-25.0):
-        super(SemLaserScan, self).__init__(project, H, W, fov_up, fov_down)
+    def __init__(self, sem_color_dict=None, project=False, H=64, W=1024, fov_up=3.0, fov_down=-25.0, reuse_buffers=False,
+                 proj_backend='zbuffer', unknown_color=(0, 0, 0), proj_mode='spherical', proj_order='row',
+                 elevation=None):
+        super(SemLaserScan, self).__init__(project, H, W, fov_up, fov_down, reuse_buffers, proj_backend,
+                                           proj_mode, proj_order, elevation)
         self.label_map = {}
+        self.label_lut = build_label_lut(self.label_map)
+        self.postprocess = None
         self.reset()
 
-        # 최대 클래스 ID 찾기 (YAML 키를 정수로 변환)
-        max_sem_key = 0
-        for key, data in sem_color_dict.items():
-            int_key = int(key)
-            if int_key + 1 > max_sem_key:
-                max_sem_key = int_key + 1
-        
-        # semantic color look-up 테이블 생성
-        self.sem_color_lut = np.zeros((max_sem_key + 100, 3), dtype=np.float32)
-        ## 각 클래스의 색상 정보 저장 (0 ~ 255 -> 0 ~ 1)
-        for key, value in sem_color_dict.items():
-            int_key = int(key)
-            self.sem_color_lut[int_key] = np.array(value, np.float32) / 255.0
-
-        # instance label color look-up 테이블 생성
-        max_inst_id = 100000
-        self.inst_color_lut = np.random.uniform(low=0.0,
-                                                high=1.0,
-                                                size=(max_inst_id, 3))
-        ## instance 미분류 -> 회색
-        self.inst_color_lut[0] = np.full((3), 0.1)
+        # semantic color look-up 테이블 생성 (16bit label 전체 범위)
+        ## 각 클래스의 색상 정보 저장 (uint8 BGR 0 ~ 255, 표시할 때 RGB 0 ~ 1로 변환), 정의되지 않은 label은 unknown_color
+        self.sem_color_lut = build_color_lut(sem_color_dict, unknown_color)
+
+    # instance 색상 look-up 테이블 (16bit instance label 전체 범위, 처음 사용할 때 생성)
+    @property
+    def inst_color_lut(self):
+        return instance_color_lut()
 
     # 새로운 LiDAR scan을 처리할 준비
     def reset(self):
@@ -222,23 +435,23 @@ class SemLaserScan(LaserScan):
         super(SemLaserScan, self).reset()
 
         # semantic labels
-        ## label: [m, 1]
-        ## color: [m, 3] (B, G, R)
-        self.sem_label = np.zeros((0, 1), dtype=np.uint32)
-        self.sem_label_color = np.zeros((0, 3), dtype=np.float32)
+        ## label: [m] uint16
+        ## color: [m, 3] uint8 (B, G, R)
+        self.sem_label = np.zeros((0,), dtype=np.uint16)
+        self.sem_label_color = np.zeros((0, 3), dtype=np.uint8)
 
         # instance labels
-        self.inst_label = np.zeros((0, 1), dtype=np.uint32)
-        self.inst_label_color = np.zeros((0, 3), dtype=np.float32)
+        self.inst_label = np.zeros((0,), dtype=np.uint16)
+        self.inst_label_color = np.zeros((0, 3), dtype=np.uint8)
 
         # 2D 이미지 정보
         ## 정보6: semantic labels
-        self.proj_sem_label = np.zeros((self.proj_H, self.proj_W), dtype=np.int32)
-        self.proj_sem_color = np.zeros((self.proj_H, self.proj_W, 3), dtype=float)
+        self.proj_sem_label = self._proj_buffer("proj_sem_label", (self.proj_H, self.proj_W), np.uint16, 0)
+        self.proj_sem_color = self._proj_buffer("proj_sem_color", (self.proj_H, self.proj_W, 3), np.uint8, 0)
 
         ## 정보6: semantic labels
-        self.proj_inst_label = np.zeros((self.proj_H, self.proj_W), dtype=np.int32)
-        self.proj_inst_color = np.zeros((self.proj_H, self.proj_W, 3), dtype=float)
+        self.proj_inst_label = self._proj_buffer("proj_inst_label", (self.proj_H, self.proj_W), np.uint16, 0)
+        self.proj_inst_color = self._proj_buffer("proj_inst_color", (self.proj_H, self.proj_W, 3), np.uint8, 0)
 
 
     # Label 파일 열기
@@ -254,10 +467,16 @@ class SemLaserScan(LaserScan):
 
         # 2. label 불러오기
         ## predictions 모드는 open_scan에서 처리 (파일 두 번 읽기 방지)
-        label = np.fromfile(filename, dtype=np.uint32)
-        label = label.reshape((-1))
+        with self.timer.stage("read_label") as stage:
+            label = read_label(filename)
+            label = label.reshape((-1))
+            stage.nbytes = label.nbytes
         self.set_label(label)
 
+    # 아카이브에서 Label 열기 (memmap view, 복사 없음)
+    def open_packed_label(self, archive, index):
+        self.set_label(archive.label(index))
+
     # label 설정
     def set_label(self, label):
         
@@ -270,36 +489,43 @@ class SemLaserScan(LaserScan):
         if label.shape[0] == self.points.shape[0]:
             # 3. 32bit label 분리
             ## label (32bit) = instance label (16bit) + semantic label (16bit)
-            self.sem_label = label & 0xFFFF
-            self.inst_label = label >> 16
+            ## uint16 변환 시 하위 16bit만 남음 (& 0xFFFF와 같음)
+            with self.timer.stage("set_label", label.nbytes):
+                label = label.astype(np.uint32, copy=False)
+                self.sem_label = label.astype(np.uint16)
+                self.inst_label = (label >> 16).astype(np.uint16)
         else:
             print("Points 개수: ", self.points.shape)
             print("Label 개수: ", label.shape)
             raise ValueError("Scan과 Label의 개수가 다름")
-        
-        # 4. 분리된 label과 원본 label 비교
-        assert((self.sem_label + (self.inst_label << 16) == label).all())
 
+        # 4. label 후처리 (range image KNN 투표 등, 2D 투영 결과 필요)
+        ## 원본 label 기준으로 투표 (mapping 전, evaluate.py와 같은 순서)
+        if self.postprocess is not None and self.project:
+            with self.timer.stage("postprocess", self.sem_label.nbytes):
+                self.sem_label = self.postprocess.apply(self, self.sem_label)
+
+        # 5. mapping 모드 처리: 원본 label -> [unlabeld, road, sidewalk, car, other-vehicle]
+        ## look-up 테이블 한 번으로 매핑 (label_map에 없는 label은 default)
         if self.mapping:
-            # mapping 모드 처리: 원본 label -> [unlabeld, road, sidewalk, car, other-vehicle]
-            mapped_label = np.copy(self.sem_label)
-            
-            # 먼저 모든 라벨을 unlabeled(4)로 초기화
-            mapped_label[:] = 4
-            
-            # label_map에 정의된 라벨들만 매핑
-            for key, val in self.label_map.items():
-                mapped_label[self.sem_label == key] = val
-                
-            self.sem_label = mapped_label
-
-        # 5. 2D 투영 실행
+            with self.timer.stage("mapping", self.sem_label.nbytes):
+                self.sem_label = self.label_lut[self.sem_label]
+
+        # 6. 2D 투영 실행
         if self.project:
-            self.do_label_projection()
+            with self.timer.stage("label_projection", self.sem_label.nbytes):
+                self.do_label_projection()
     
     # 라벨 매핑 설정
-    def set_label_map(self, label_map):
+    ## label_map에 없는 label은 default로 매핑 (기본값: unlabeled(4))
+    def set_label_map(self, label_map, default=4):
         self.label_map = label_map
+        self.label_lut = build_label_lut(label_map, default)
+
+    # label 후처리 설정 (auxiliary.postproc, None이면 사용 안 함)
+    ## apply(scan, labels) -> labels, project 모드에서만 적용
+    def set_postprocess(self, postprocess):
+        self.postprocess = postprocess
 
     # 색상 할당
     def colorize(self):
@@ -313,15 +539,18 @@ class SemLaserScan(LaserScan):
 
     # label 2D 투영 변환
     def do_label_projection(self):
-        # 1. 유효한 픽셀만 선택
+        # 1. 유효한 픽셀 및 해당 point index (한 번만 계산)
         mask = self.proj_idx >= 0
+        hit = self.proj_idx[mask]
 
         # 2. 2D 이미지 정보
         ## 정보7: label
         ## semantic
-        self.proj_sem_label[mask] = self.sem_label[self.proj_idx[mask]]
-        self.proj_sem_color[mask] = self.sem_color_lut[self.sem_label[self.proj_idx[mask]]]
+        sem_label = self.sem_label[hit]
+        self.proj_sem_label[mask] = sem_label
+        self.proj_sem_color[mask] = self.sem_color_lut[sem_label]
 
         ## instances
-        self.proj_inst_label[mask] = self.inst_label[self.proj_idx[mask]]
-        self.proj_inst_color[mask] = self.inst_color_lut[self.inst_label[self.proj_idx[mask]]]
+        inst_label = self.inst_label[hit]
+        self.proj_inst_label[mask] = inst_label
+        self.proj_inst_color[mask] = self.inst_color_lut[inst_label]
@@ -1,11 +1,21 @@
 #!/usr/bin/env python3
 # This file is covered by the LICENSE file in the root of this project.
 
+import os
+import time
 import vispy
 from vispy.scene import visuals, SceneCanvas
 import numpy as np
-from matplotlib import pyplot as plt
 from auxiliary.laserscan import LaserScan, SemLaserScan
+from auxiliary.frame import load_frame
+from auxiliary.render import display_colors, range_point_colors, range_image
+from auxiliary.colormaps import get_colormap
+from auxiliary.filters import PointFilter, pixel_mask
+from auxiliary.labelstats import read_labels
+from auxiliary.picking import PointGrid, canvas_ray, format_info, pick_pixel, point_info
+from auxiliary.lod import voxel_downsample
+from auxiliary.playback import PlaybackScheduler
+from auxiliary.voxelmap import frame_number, transform_points
 
 
 # Scan 시각화 도구
@@ -17,7 +27,18 @@ class LaserScanVis:
                  label_names,
                  label=True,
                  predictions=False,
-                 mapping=False
+                 mapping=False,
+                 prefetch=None,
+                 lod_budget=0,
+                 lod_delay=0.3,
+                 voxel_map=None,
+                 poses=None,
+                 live=None,
+                 live_interval=0.02,
+                 playback_fps=10.0,
+                 play=False,
+                 point_filter=None,
+                 class_names=None
                 ):
         self.scan = scan
         self.scan_names = scan_names
@@ -25,14 +46,58 @@ class LaserScanVis:
         self.semantics = label
         self.predictions = predictions
         self.mapping = mapping
+        self.prefetch = prefetch
+
+        # 3D view level-of-detail (0: 사용 안 함)
+        ## 카메라 조작 중에는 lod_budget 개수로 축소, lod_delay 초 동안 멈추면 전체 표시
+        self.lod_budget = lod_budget
+        self.lod_delay = lod_delay
+        self.lod_voxel_size = None
+        self.lod_data = None
+        self.lod_full = True
+        self.point_frame = None
+        self.point_colors = {}
+
+        # 거리 기반 색상 컬러맵 (미리 계산된 viridis, RGB)
+        self.range_colormap = get_colormap("viridis")
+
+        # 범위/영역/높이/클래스 필터 (3D view와 2D 이미지에 같이 적용)
+        ## filter_index: 표시할 point index (None이면 전체)
+        self.point_filter = point_filter if point_filter is not None else PointFilter()
+        self.filter_index = None
+        self.filter_mask = None
+
+        # point 선택 (마우스 클릭)
+        ## pick_grid: 현재 프레임의 spatial grid (처음 선택할 때 생성)
+        ## class_names: {label: 이름} (선택 정보 출력용)
+        self.class_names = class_names
+        self.pick_grid = None
+        self.pick_raw = None
+        self.pick_text = ""
+
+        # pose 기반 누적 map (voxel_map이 None이면 사용 안 함)
+        self.voxel_map = voxel_map
+        self.poses = poses
+
+        # live 모드 (LiveStream, None이면 사용 안 함)
+        self.live = live
+        self.live_interval = live_interval
         
         self.offset = 0
+        self.direction = 1
         self.total = len(self.scan_names)
         self.images = True
         self.instances = False
 
+        # 재생 모드 (Space: 재생/정지, 숫자 + Enter: 프레임 이동, +/-: 목표 FPS 변경)
+        self.playback = PlaybackScheduler(self.total, playback_fps) if self.live is None else None
+        self.seek_input = ""
+
         self.reset()
-        self.update_scan()
+        if self.live is None:
+            self.update_scan()
+            if play:
+                self.toggle_play()
 
     # 시각화 인터페이스 초기화
     def reset(self):
@@ -47,6 +112,26 @@ class LaserScanVis:
         ## 키보드/그리기 이벤트 핸들러 연결
         self.canvas.events.key_press.connect(self.key_press)
         self.canvas.events.draw.connect(self.draw)
+        ## 마우스 클릭으로 point 선택
+        self.canvas.events.mouse_release.connect(self.mouse_release)
+        ## LOD 사용 시 카메라 조작 이벤트 연결
+        if self.lod_budget > 0:
+            self.canvas.events.mouse_move.connect(self.camera_move)
+            self.canvas.events.mouse_wheel.connect(self.camera_move)
+            self.lod_timer = vispy.app.Timer(interval=self.lod_delay,
+                                             connect=self.refine_points,
+                                             iterations=1,
+                                             start=False)
+        ## live 모드: 최신 프레임 확인 timer
+        if self.live is not None:
+            self.live_timer = vispy.app.Timer(interval=self.live_interval,
+                                              connect=self.poll_live,
+                                              start=True)
+        ## 재생 timer (목표 주기의 절반마다 표시할 프레임 확인)
+        if self.playback is not None:
+            self.play_timer = vispy.app.Timer(interval=0.5 / self.playback.fps,
+                                              connect=self.play_tick,
+                                              start=False)
         ## grid layout 생성
         self.grid = self.canvas.central_widget.add_grid()
 
@@ -60,6 +145,8 @@ class LaserScanVis:
         self.scan_view.camera = 'turntable'
         self.scan_view.add(self.scan_vis)
         visuals.XYZAxis(parent=self.scan_view.scene)
+        ## 선택한 point 표시 (view마다 하나)
+        self.pick_vis = {"scan": self.pick_marker(self.scan_view)}
 
         # 2-2. semantic label 시각화 (grid: (0,1))
         if self.semantics:
@@ -73,6 +160,7 @@ class LaserScanVis:
             self.sem_view.camera = 'turntable'
             self.sem_view.add(self.sem_vis)
             visuals.XYZAxis(parent=self.sem_view.scene)
+            self.pick_vis["sem"] = self.pick_marker(self.sem_view)
             self.sem_view.camera.link(self.scan_view.camera)
 
         # 2-3. instance label 시각화 (grid: (0,2))
@@ -87,8 +175,23 @@ class LaserScanVis:
             self.inst_view.camera = 'turntable'
             self.inst_view.add(self.inst_vis)
             visuals.XYZAxis(parent=self.inst_view.scene)
+            self.pick_vis["inst"] = self.pick_marker(self.inst_view)
             self.inst_view.camera.link(self.scan_view.camera)
 
+        # 2-4. 누적 map 시각화 (grid: 마지막 열)
+        if self.voxel_map is not None:
+            print("누적 map 사용 중...")
+            self.map_view = vispy.scene.widgets.ViewBox(
+                                                        border_color='white',
+                                                        parent=self.canvas.scene
+                                                       )
+            self.grid.add_widget(self.map_view, 0, 1 + int(self.semantics) + int(self.instances))
+            self.map_vis = visuals.Markers(antialias=0)
+            self.map_view.camera = 'turntable'
+            self.map_view.add(self.map_vis)
+            visuals.XYZAxis(parent=self.map_view.scene)
+            self.map_view.camera.link(self.scan_view.camera)
+
         # 3. 2D 이미지 시각화 창 설정
         if self.images:
             self.multiplier = 1
@@ -108,6 +211,7 @@ class LaserScanVis:
             ## 키보드/그리기 이벤트 핸들러 연결
             self.img_canvas.events.key_press.connect(self.key_press)
             self.img_canvas.events.draw.connect(self.draw)
+            self.img_canvas.events.mouse_release.connect(self.mouse_release)
 
             # 3-1. 기본 거리 기반 2D 이미지 시각화 (grid: (0,0))
             self.img_view = vispy.scene.widgets.ViewBox(
@@ -137,96 +241,367 @@ class LaserScanVis:
                 self.inst_img_view.add(self.inst_img_vis)
                 self.inst_view.camera.link(self.scan_view.camera)
 
-    # matplotlib 컬러맵을 vispy에 맞게 변환
-    def get_mpl_colormap(self, cmap_name):
-
-        # 1. plt에 맞춰 컬러맵 가져오기
-        cmap = plt.get_cmap(cmap_name)
-
-        # 2. 색상 매핑 처리 객체 생성
-        sm = plt.cm.ScalarMappable(cmap=cmap)
-
-        # 3. 컬러맵에서 256개 색상 샘플 추출
-        color_range = sm.to_rgba(np.linspace(0, 1, 256), bytes=True)[:, 2::-1]
-
-        # 4. 최종 변환
-        return color_range.reshape(256, 3).astype(np.float32) / 255.0
-
     # 현재 scan 로드 및 시각화
     def update_scan(self):
         
         # 1. 데이터 파일 열기
-        ## 현재 scan 데이터 로드
-        self.scan.open_scan(self.scan_names[self.offset])
-
-        ## predictions 모드 처리
-        if self.semantics:
-            if self.scan.predictions:
-                self.scan.colorize()
-            else:
-                self.scan.open_label(self.label_names[self.offset])
-                self.scan.colorize()
-
-        # 2. 창 제목 업데이트
+        ## prefetch 사용 시 미리 읽어둔 프레임 사용
+        if self.prefetch is not None:
+            frame = self.prefetch.get(self.offset, self.direction)
+        else:
+            frame = load_frame(self.scan, self.scan_names, self.label_names,
+                               self.offset, self.semantics)
+
+        # 2. 화면 표시
+        with self.scan.timer.frame(self.offset, "display"):
+            self.show_frame(frame)
+
+        # 3. 창 제목 업데이트
+        self.update_title()
+
+    # 창 제목 업데이트 (현재 프레임, prefetch/재생 상태, 입력 중인 프레임 번호)
+    def update_title(self):
         title = "scan " + str(self.offset)
+        if self.prefetch is not None:
+            stats = self.prefetch.stats()
+            title += " (prefetch hit %d / miss %d)" % (stats["hits"], stats["misses"])
+        if self.playback is not None and self.playback.playing:
+            stats = self.playback.stats()
+            title += " | play %.1f / %.1f fps (skipped %d)" % (
+                stats["achieved_fps"], stats["target_fps"], stats["skipped"])
+        if self.seek_input:
+            title += " | 이동: " + self.seek_input + "_"
+        if self.point_filter.active:
+            title += " | " + self.point_filter.describe()
+        if self.pick_text:
+            title += " | " + self.pick_text
+        if self.scan.timer.enabled:
+            title += " | " + self.scan.timer.summary()
         self.canvas.title = title
         if self.images:
             self.img_canvas.title = title
 
-        # 3-1. 3D pointcloud 시각화 (거리 기반 색상)
+    # 재생 timer: 표시할 프레임이 있으면 표시 (밀린 프레임은 건너뜀)
+    def play_tick(self, event):
+        index = self.playback.due()
+        if index is None:
+            return
+        self.offset = index
+        ## prefetch는 실제로 표시될 간격으로 미리 읽음
+        self.direction = self.playback.stride
+        start = time.perf_counter()
+        self.update_scan()
+        self.playback.shown(time.perf_counter() - start)
+
+    # 재생/정지 전환
+    def toggle_play(self):
+        if self.playback.toggle(self.offset):
+            self.play_timer.start()
+        else:
+            self.play_timer.stop()
+            self.direction = 1
+        self.update_title()
+
+    # live 모드: 새 프레임이 있으면 표시 (이전 프레임은 건너뜀)
+    def poll_live(self, event):
+        frame = self.live.latest()
+        if frame is None:
+            return
+        with self.scan.timer.frame(frame.index, "display"):
+            self.show_frame(frame)
+
+        stats = self.live.stats()
+        title = "live %s (ingest %.1f fps / render %.1f fps / dropped %d)" % (
+            frame.name, stats["ingest_fps"], stats["render_fps"], stats["dropped"])
+        if self.scan.timer.enabled:
+            title += " | " + self.scan.timer.summary()
+        self.canvas.title = title
+        if self.images:
+            self.img_canvas.title = title
+
+    # 프레임 데이터를 visual에 업로드
+    def show_frame(self, frame):
+
+        # 1-1. 3D pointcloud 색상 (거리 기반 색상)
         ## 거리 값에 따라 색 강도 조정 (16등분)
-        power = 16
-        range_data = np.copy(self.scan.unproj_range)
-        range_data = range_data**(1 / power)
-        viridis_range = ((range_data - range_data.min()) /
-                        (range_data.max() - range_data.min()) *
-                        255).astype(np.uint8)
-        viridis_map = self.get_mpl_colormap("viridis")
-        viridis_colors = viridis_map[viridis_range]
-        self.scan_vis.set_data(self.scan.points,
-                               face_color=viridis_colors[..., ::-1],
-                               edge_color=viridis_colors[..., ::-1],
-                               size=1
-                              )
-
-        # 3-2. 3D pointcloud 시각화 (semantic label 기반 색상)
+        with self.scan.timer.stage("range_colormap", frame.unproj_range.nbytes):
+            viridis_colors = range_point_colors(frame.unproj_range, self.range_colormap)
+        self.point_frame = frame
+        self.point_colors = {"scan": viridis_colors}
+
+        ## 이전 프레임의 선택 정보 초기화 (spatial grid는 다음 선택 때 생성)
+        self.pick_grid = None
+        self.pick_text = ""
+        for marker in self.pick_vis.values():
+            marker.visible = False
+
+        # 1-2. 3D pointcloud 색상 (semantic label 기반 색상, 프레임에서 처음 사용할 때 생성)
         if self.semantics:
-            self.sem_vis.set_data(self.scan.points,
-                                  face_color=self.scan.sem_label_color[..., ::-1],
-                                  edge_color=self.scan.sem_label_color[..., ::-1],
-                                  size=1
-                                 )
+            with self.scan.timer.stage("colorize", frame.sem_label.nbytes):
+                self.point_colors["sem"] = display_colors(frame.sem_label_color)
 
-        # 3-3. 3D pointcloud 시각화 (instance label 기반 색상)
+        # 1-3. 3D pointcloud 색상 (instance label 기반 색상)
         if self.instances:
-            self.inst_vis.set_data(self.scan.points,
-                                   face_color=self.scan.inst_label_color[..., ::-1],
-                                   edge_color=self.scan.inst_label_color[..., ::-1],
-                                   size=1
-                                  )
-
-        # 4-1. 2D 이미지 시각화 (거리 기반 색상)
-        if self.images:
-            data = np.copy(self.scan.proj_range)
-            data[data > 0] = data[data > 0]**(1 / power)
-            data[data < 0] = data[data > 0].min()
-            data = ((data - data[data > 0].min()) / 
-                    (data.max() - data[data > 0].min()))
+            with self.scan.timer.stage("colorize", frame.inst_label.nbytes):
+                self.point_colors["inst"] = display_colors(frame.inst_label_color)
+
+        # 1-4. 3D pointcloud 및 2D 이미지 시각화 (필터 적용)
+        self.apply_filter()
+
+        # 1-5. 누적 map 시각화 (필터와 관계없이 전체 point 누적)
+        if self.voxel_map is not None:
+            self.update_map(frame)
+
+    # 현재 프레임에 필터를 적용하여 3D view와 2D 이미지 갱신 (프레임을 다시 읽지 않음)
+    def apply_filter(self):
+        frame = self.point_frame
+
+        # 1. 표시할 point mask
+        with self.scan.timer.stage("filter", frame.points.nbytes):
+            keep = self.point_filter.mask(frame)
+        self.filter_index = np.flatnonzero(keep) if keep is not None else None
+        self.filter_mask = keep
+
+        # 2. 3D pointcloud 시각화
+        ## LOD 사용 시 축소된 pointcloud를 먼저 표시하고, 카메라가 멈추면 전체 표시
+        self.lod_data = None
+        self.upload_points(lod=self.lod_budget > 0)
+        if self.lod_budget > 0:
+            self.lod_timer.stop()
+            self.lod_timer.start()
+
+        if not self.images:
+            return
+
+        # 3. 2D 이미지 픽셀 mask (제외된 point가 투영된 픽셀은 빈 픽셀)
+        pixels = pixel_mask(frame.proj_idx, keep) if keep is not None else None
+
+        # 3-1. 2D 이미지 시각화 (거리 기반 색상)
+        with self.scan.timer.stage("range_image", frame.proj_range.nbytes):
+            proj_range = frame.proj_range
+            if pixels is not None:
+                proj_range = np.where(pixels, proj_range, np.float32(-1))
+            data = range_image(proj_range) if np.any(proj_range > 0) else np.zeros_like(proj_range)
+        with self.scan.timer.stage("upload", data.nbytes):
             self.img_vis.set_data(data)
             self.img_vis.update()
 
-            # 4-2. 2D 이미지 시각화 (semantic label 기반 색상)
-            if self.semantics:
-                self.sem_img_vis.set_data(self.scan.proj_sem_color[..., ::-1])
+        # 3-2. 2D 이미지 시각화 (semantic label 기반 색상)
+        if self.semantics:
+            colors = display_colors(frame.proj_sem_color)
+            if pixels is not None:
+                colors *= pixels[..., None]
+            with self.scan.timer.stage("upload", colors.nbytes):
+                self.sem_img_vis.set_data(colors)
                 self.sem_img_vis.update()
 
-            # 4-2. 2D 이미지 시각화 (instance label 기반 색상)
-            if self.instances:
-                self.inst_img_vis.set_data(self.scan.proj_inst_color[..., ::-1])
+        # 3-3. 2D 이미지 시각화 (instance label 기반 색상)
+        if self.instances:
+            colors = display_colors(frame.proj_inst_color)
+            if pixels is not None:
+                colors *= pixels[..., None]
+            with self.scan.timer.stage("upload", colors.nbytes):
+                self.inst_img_vis.set_data(colors)
                 self.inst_img_vis.update()
 
+    # 3D view에 pointcloud 업로드
+    ## lod: voxel downsampling된 pointcloud 사용 (모든 view가 같은 대표 point 사용)
+    def upload_points(self, lod=False):
+        ## 필터 사용 시 필터를 통과한 point만 사용
+        index = self.filter_index
+        points = self.point_frame.points if index is None else self.point_frame.points[index]
+
+        # 1. 대표 point 선택 (프레임/필터마다 한 번만 계산, 카메라 조작 시에는 저장된 결과 업로드)
+        self.lod_full = True
+        if lod and points.shape[0] > self.lod_budget:
+            self.lod_full = False
+            if self.lod_data is None:
+                with self.scan.timer.stage("lod", points.nbytes):
+                    ## voxel 크기는 이전 프레임의 크기에서 시작하여 프레임마다 다시 맞춤 (키우거나 줄임)
+                    lod_index, self.lod_voxel_size = voxel_downsample(points, self.lod_budget,
+                                                                      self.lod_voxel_size)
+                index = lod_index if index is None else index[lod_index]
+                points = points[lod_index]
+                self.lod_data = (points, {name: colors[index] for name, colors in self.point_colors.items()})
+            points, colors = self.lod_data
+            self.set_point_data(points, colors)
+            return
+
+        # 2. 전체 pointcloud 업로드
+        if index is None:
+            colors = self.point_colors
+        else:
+            colors = {name: colors[index] for name, colors in self.point_colors.items()}
+        self.set_point_data(points, colors)
+
+    # view별 pointcloud 업로드
+    def set_point_data(self, points, point_colors):
+        point_visuals = {"scan": self.scan_vis}
+        if self.semantics:
+            point_visuals["sem"] = self.sem_vis
+        if self.instances:
+            point_visuals["inst"] = self.inst_vis
+        for name, colors in point_colors.items():
+            with self.scan.timer.stage("upload", points.nbytes + colors.nbytes):
+                point_visuals[name].set_data(points,
+                                             face_color=colors,
+                                             edge_color=colors,
+                                             size=1
+                                            )
+
+    # 선택한 point 표시용 marker (처음에는 숨김)
+    def pick_marker(self, view):
+        marker = visuals.Markers(parent=view.scene)
+        marker.set_data(np.zeros((1, 3), dtype=np.float32), face_color='red', edge_color='white', size=10)
+        marker.visible = False
+        return marker
+
+    # 마우스 클릭 (드래그가 아닌 경우) -> point 선택
+    def mouse_release(self, event):
+        press = event.press_event
+        if event.button != 1 or press is None or self.point_frame is None:
+            return
+        if np.linalg.norm(np.asarray(event.pos) - np.asarray(press.pos)) > 3:
+            return
+
+        # 1. 클릭한 view 찾기 (3D view: ray 선택, 2D 이미지: proj_idx 선택)
+        index = None
+        with self.scan.timer.frame(self.point_frame.index, "pick"):
+            if event.source is self.canvas:
+                views = [(self.scan_view, self.scan_vis)]
+                if self.semantics:
+                    views.append((self.sem_view, self.sem_vis))
+                if self.instances:
+                    views.append((self.inst_view, self.inst_vis))
+                for view, vis in views:
+                    if self.view_contains(self.canvas, view, event.pos):
+                        index = self.pick_point(view, vis, event.pos)
+                        break
+            else:
+                views = [(self.img_view, self.img_vis)]
+                if self.semantics:
+                    views.append((self.sem_img_view, self.sem_img_vis))
+                if self.instances:
+                    views.append((self.inst_img_view, self.inst_img_vis))
+                for view, vis in views:
+                    if self.view_contains(self.img_canvas, view, event.pos):
+                        index = self.pick_image(vis, event.pos)
+                        break
+
+        # 2. 선택 정보 출력 및 표시
+        if index is None:
+            self.pick_text = ""
+            for marker in self.pick_vis.values():
+                marker.visible = False
+        else:
+            info = point_info(self.point_frame, index, self.raw_label(index), self.class_names)
+            self.pick_text = format_info(info)
+            print(self.pick_text)
+            for marker in self.pick_vis.values():
+                marker.set_data(self.point_frame.points[index:index + 1],
+                                face_color='red', edge_color='white', size=10)
+                marker.visible = True
+        if self.live is None:
+            self.update_title()
+
+    # canvas 좌표가 view 안에 있는지
+    @staticmethod
+    def view_contains(canvas, view, pos):
+        local = canvas.scene.node_transform(view).map(pos)[:2]
+        return 0 <= local[0] < view.size[0] and 0 <= local[1] < view.size[1]
+
+    # 3D view 클릭 -> 카메라 ray에 가장 먼저 닿는 point (필터로 숨긴 point 제외)
+    ## spatial grid는 프레임마다 처음 선택할 때 한 번 생성
+    def pick_point(self, view, vis, pos):
+        if self.point_frame.points.shape[0] == 0:
+            return None
+        if self.pick_grid is None:
+            with self.scan.timer.stage("pick_index", self.point_frame.points.nbytes):
+                self.pick_grid = PointGrid(self.point_frame.points)
+        origin, direction = canvas_ray(vis, pos)
+        ## 허용 각도: 클릭 위치 주변 4 픽셀
+        angle = np.radians(max(view.camera.fov, 1.0)) * 4.0 / max(view.size[1], 1.0)
+        return self.pick_grid.pick_ray(origin, direction, angle, self.filter_mask)
+
+    # 2D 이미지 클릭 -> proj_idx로 point 선택 (필터로 숨긴 픽셀 제외)
+    def pick_image(self, vis, pos):
+        col, row = vis.get_transform(map_from='canvas', map_to='visual').map(pos)[:2]
+        proj_idx = self.point_frame.proj_idx
+        pixels = pixel_mask(proj_idx, self.filter_mask) if self.filter_mask is not None else None
+        return pick_pixel(proj_idx, int(np.floor(row)), int(np.floor(col)), pixels=pixels)
+
+    # mapping 전 원본 semantic label (mapping 모드에서만 파일에서 읽음, 프레임마다 한 번)
+    def raw_label(self, index):
+        if not (self.semantics and self.mapping) or self.live is not None:
+            return None
+        names = self.scan_names if self.predictions else self.label_names
+        filename = names[self.offset]
+        if not isinstance(filename, str) or not os.path.isfile(filename):
+            return None
+        if self.pick_raw is None or self.pick_raw[0] != filename:
+            self.pick_raw = (filename, read_labels(filename, self.predictions) & 0xFFFF)
+        return self.pick_raw[1][index]
+
+    # 현재 프레임을 누적 map에 추가하고 map view 갱신
+    ## 이미 추가된 프레임은 다시 추가하지 않음 (앞/뒤 이동 반복 시 중복 방지)
+    def update_map(self, frame):
+        number = frame_number(self.scan_names[self.offset])
+        if number >= self.poses.shape[0]:
+            print(f"프레임 {number}의 pose가 없습니다! 누적 map에 추가하지 않음")
+            return
+
+        # 1. world 좌표로 변환 후 누적
+        ## 이미 추가된 프레임은 다시 추가하지 않지만, 표시 좌표계는 현재 프레임 기준으로 다시 변환
+        if number not in self.voxel_map.frames:
+            with self.scan.timer.stage("accumulate", frame.points.nbytes):
+                points = transform_points(frame.points, self.poses[number])
+                if self.semantics:
+                    labels = frame.sem_label
+                else:
+                    labels = np.zeros(points.shape[0], dtype=np.uint32)
+                self.voxel_map.add_frame(points, labels, number)
+
+        # 2. voxel 중심 좌표 / 다수결 label 색상 업로드
+        ## map은 현재 scan 위치 기준으로 표시 (현재 scan view와 같은 좌표계)
+        centers, labels = self.voxel_map.voxels()
+        centers = transform_points(centers, np.linalg.inv(self.poses[number]))
+        colors = display_colors(self.scan.sem_color_lut[labels])
+        with self.scan.timer.stage("upload", centers.nbytes + colors.nbytes):
+            self.map_vis.set_data(centers,
+                                  face_color=colors,
+                                  edge_color=colors,
+                                  size=1
+                                 )
+
+    # 카메라 조작 시 축소된 pointcloud 표시
+    def camera_move(self, event):
+        if event.type == "mouse_move" and not event.is_dragging:
+            return
+        if self.lod_full:
+            self.upload_points(lod=True)
+        self.lod_timer.stop()
+        self.lod_timer.start()
+
+    # 카메라가 멈추면 전체 pointcloud 표시
+    def refine_points(self, event):
+        if not self.lod_full and self.point_frame is not None:
+            self.upload_points(lod=False)
+            self.canvas.update()
+
     # 키보드 입력 처리
     def key_press(self, event):
+
+        # 필터 변경 (현재 프레임에 바로 적용)
+        if self.filter_key(event):
+            return
+
+        # live 모드에서는 종료만 가능
+        if self.live is not None and event.key not in ('Q', 'Escape'):
+            return
+
+        # 재생/프레임 번호 입력 (프레임을 바로 읽지 않는 키)
+        if self.live is None and self.playback_key(event):
+            return
         
         # 1. 키 이벤트 중복 처리 방지
         self.canvas.events.key_press.block()
@@ -236,20 +611,87 @@ class LaserScanVis:
         
         # 2. 키 입력에 따른 동작 처리
         if event.key == 'N':
+            self.direction = 1
             self.offset += 1
             if self.offset >= self.total:
                 self.offset = 0
             self.update_scan()
 
         elif event.key == 'B':
+            self.direction = -1
             self.offset -= 1
             if self.offset < 0:
                 self.offset = self.total - 1
             self.update_scan()
 
+        elif event.key == 'Enter' and self.seek_input:
+            self.offset = self.playback.seek(int(self.seek_input))
+            self.seek_input = ""
+            self.update_scan()
+
         elif event.key == 'Q' or event.key == 'Escape':
             self.destroy()
 
+        ## 재생 중 수동 이동: 이동한 프레임부터 다시 재생
+        if event.key in ('N', 'B') and self.playback.playing:
+            self.playback.seek(self.offset)
+
+    # 재생 관련 키 처리 (처리한 경우 True)
+    def playback_key(self, event):
+        if event.key == 'Space':
+            self.toggle_play()
+        elif event.text and event.text.isdigit():
+            self.seek_input += event.text
+            self.update_title()
+        elif event.key == 'Backspace' and self.seek_input:
+            self.seek_input = self.seek_input[:-1]
+            self.update_title()
+        elif event.key == 'Enter' and self.seek_input and int(self.seek_input) >= self.total:
+            ## 범위를 벗어난 번호는 프레임을 읽지 않음 (이동은 key_press에서 처리)
+            print(f"프레임 {self.seek_input} 범위 오류 (0 ~ {self.total - 1})")
+            self.seek_input = ""
+            self.update_title()
+        elif event.text in ('+', '=', '-'):
+            factor = 0.8 if event.text == '-' else 1.25
+            fps = self.playback.set_fps(self.playback.fps * factor, self.offset)
+            self.play_timer.interval = 0.5 / fps
+            print(f"목표 재생 FPS: {fps:.1f}")
+            self.update_title()
+        else:
+            return False
+        return True
+
+    # 필터 관련 키 처리 (처리한 경우 True)
+    ## [ / ]: 최대 거리 -/+ 5m, { / }: 최대 높이 -/+ 0.5m, F: 필터 사용/해제
+    def filter_key(self, event):
+        point_filter = self.point_filter
+        ## 처음 누르면 50m / 2m부터 시작, 범위를 넘으면 해제
+        if event.text in ('[', ']'):
+            if point_filter.max_range is None:
+                point_filter.max_range = 50.0
+            else:
+                max_range = point_filter.max_range + (5.0 if event.text == ']' else -5.0)
+                point_filter.max_range = max(5.0, max_range) if max_range <= 200.0 else None
+        elif event.text in ('{', '}'):
+            if point_filter.z_max is None:
+                point_filter.z_max = 2.0
+            else:
+                z_max = point_filter.z_max + (0.5 if event.text == '}' else -0.5)
+                point_filter.z_max = z_max if z_max <= 10.0 else None
+        elif event.key == 'F':
+            point_filter.enabled = not point_filter.enabled
+        else:
+            return False
+        if event.key != 'F':
+            point_filter.enabled = True
+        print(point_filter.describe() or "필터 사용 안 함")
+        if self.point_frame is not None:
+            with self.scan.timer.frame(self.point_frame.index, "filter"):
+                self.apply_filter()
+        if self.live is None:
+            self.update_title()
+        return True
+
     # 그리기 이벤트 처리
     def draw(self, event):
         # 장면 전환 시, 키보드 입력 차단 상태에서 활성화
@@ -261,6 +703,18 @@ class LaserScanVis:
 
     # 시각화 종료
     def destroy(self):
+        # prefetch worker 종료
+        if self.prefetch is not None:
+            self.prefetch.close()
+        # 재생 timer 종료
+        if self.playback is not None:
+            self.play_timer.stop()
+        # live 입력 종료
+        if self.live is not None:
+            self.live_timer.stop()
+            self.live.close()
+        # 계측 로그 종료
+        self.scan.timer.close()
         # 3D pointcloud
         self.canvas.close()
         # 2D 이미지
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+import os
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from auxiliary.formats import (LABEL_EXTENSIONS, SCAN_EXTENSIONS, detect_extension, frame_id, label_count,
+                               scan_count)
+from auxiliary.frame import ScanFrame
+from auxiliary.seqindex import LABEL_STRIDE, PREDICTION_STRIDE, SCAN_STRIDE
+
+
+# socket 메시지 헤더 (payload byte 수, little endian uint32)
+HEADER = struct.Struct("<I")
+
+
+# 프레임 전송 (모델 쪽에서 사용)
+## points: [N, 4] (x, y, z, intensity) 또는 [N, 5] (predictions 형식, label 포함) float32
+def send_frame(sock, points):
+    payload = np.ascontiguousarray(points, dtype=np.float32).tobytes()
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+# 폴더 감시 입력 (새로 생긴 scan/label 파일)
+## 파일 크기가 한 번의 polling 동안 변하지 않고 point/label 개수가 맞을 때 완성된 파일로 판단
+## 처리가 밀려 한 번에 여러 파일이 생기면 가장 최신 파일만 전달 (나머지는 skipped)
+## 확장자를 지정하지 않으면 폴더 안의 파일로 형식 확인 (파일이 생길 때까지 polling마다 확인)
+class DirectorySource:
+
+    def __init__(self,
+                 scan_dir,
+                 label_dir=None,
+                 predictions=False,
+                 scan_ext=None,
+                 label_ext=None,
+                 interval=0.05
+                ):
+        self.scan_dir = scan_dir
+        self.label_dir = label_dir
+        self.scan_stride = PREDICTION_STRIDE if predictions else SCAN_STRIDE
+        self.scan_ext = scan_ext
+        self.label_ext = label_ext
+        self.interval = interval
+        self.skipped = 0
+
+        # 마지막으로 전달한 프레임 (frame id 순서), 크기 확인 중인 파일 {frame id: 크기}
+        ## 마지막 프레임보다 이전 파일은 크기를 확인하지 않음
+        self._last = None
+        self._sizes = {}
+
+        ## 시작 시 이미 있는 파일은 가장 최신 프레임만 표시
+        existing = sorted(self._list())
+        if len(existing) > 1:
+            self._last = existing[-2]
+
+    # 마지막 프레임 이후의 scan 파일 목록 {frame id: 파일 크기}
+    ## 목록을 읽는 사이 삭제된 파일은 제외
+    def _list(self):
+        if self.scan_ext is None:
+            self.scan_ext = detect_extension(self.scan_dir, SCAN_EXTENSIONS, None)
+            if self.scan_ext is None:
+                return {}
+        files = {}
+        with os.scandir(self.scan_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(self.scan_ext):
+                    continue
+                name = frame_id(entry.name)
+                if self._last is not None and name <= self._last:
+                    continue
+                try:
+                    files[name] = entry.stat().st_size
+                except OSError:
+                    continue
+        return files
+
+    # 파일이 완성되었는지 확인
+    ## 원본 .bin/.label은 파일 크기로, 다른 형식은 읽어서 point/label 개수 확인 (쓰는 중이면 형식 오류)
+    def _ready(self, name, size):
+        stable = self._sizes.get(name) == size
+        self._sizes[name] = size
+        if not stable or size == 0:
+            return False
+        try:
+            count = scan_count(self._scan_path(name), self.scan_stride // 4)
+            if count is None:
+                if size % self.scan_stride != 0:
+                    return False
+                count = size // self.scan_stride
+            if count == 0:
+                return False
+            if self.label_dir is None:
+                return True
+            if self.label_ext is None:
+                self.label_ext = detect_extension(self.label_dir, LABEL_EXTENSIONS, None)
+                if self.label_ext is None:
+                    return False
+            label_path = self._label_path(name)
+            labels = label_count(label_path)
+            if labels is None:
+                return os.stat(label_path).st_size == count * LABEL_STRIDE
+            return labels == count
+        except (OSError, ValueError, RuntimeError):
+            return False
+
+    def _scan_path(self, name):
+        return os.path.join(self.scan_dir, name + self.scan_ext)
+
+    def _label_path(self, name):
+        return os.path.join(self.label_dir, name + self.label_ext)
+
+    # 새 프레임 반환 (stop 설정 시 종료)
+    ## 폴더를 읽을 수 없거나 형식이 섞여 있으면 오류를 출력하고 다음 polling에서 다시 시도
+    def frames(self, stop):
+        while not stop.is_set():
+            try:
+                files = self._list()
+            except (OSError, RuntimeError) as e:
+                print(f"live 폴더 읽기 오류: {e}")
+                stop.wait(self.interval)
+                continue
+            ## 목록에서 사라진 파일의 크기 기록 제거
+            self._sizes = {name: size for name, size in self._sizes.items() if name in files}
+            ready = [name for name, size in sorted(files.items()) if self._ready(name, size)]
+            if ready:
+                name = ready[-1]
+                self._last = name
+                self.skipped += len(ready) - 1
+                yield {
+                    "name": name,
+                    "scan": self._scan_path(name),
+                    "label": self._label_path(name) if self.label_dir else None,
+                }
+            else:
+                stop.wait(self.interval)
+
+
+# socket 입력 (local TCP)
+## 메시지: 헤더(payload byte 수) + float32 [x, y, z, intensity(, label)] payload
+## 연결이 끊기면 다음 연결을 기다림
+class SocketSource:
+
+    def __init__(self, host="127.0.0.1", port=5555, predictions=False, timeout=0.5):
+        self.host = host
+        self.port = port
+        self.columns = (PREDICTION_STRIDE if predictions else SCAN_STRIDE) // 4
+        self.timeout = timeout
+        self.skipped = 0
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen(1)
+        self._server.settimeout(timeout)
+
+    # 정확히 size byte 읽기 (연결 종료 시 None)
+    def _recv(self, conn, size, stop):
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            if stop.is_set():
+                return None
+            try:
+                n = conn.recv_into(view[received:])
+            except socket.timeout:
+                continue
+            if n == 0:
+                return None
+            received += n
+        return buffer
+
+    # 새 프레임 반환 (stop 설정 시 종료)
+    def frames(self, stop):
+        while not stop.is_set():
+            try:
+                conn, address = self._server.accept()
+            except socket.timeout:
+                continue
+            print(f"live 연결: {address[0]}:{address[1]}")
+            conn.settimeout(self.timeout)
+            count = 0
+            with conn:
+                while not stop.is_set():
+                    header = self._recv(conn, HEADER.size, stop)
+                    if header is None:
+                        break
+                    size = HEADER.unpack(header)[0]
+                    if size == 0 or size % (self.columns * 4) != 0:
+                        print(f"live 데이터 크기 오류 ({size} bytes), 연결 종료")
+                        break
+                    payload = self._recv(conn, size, stop)
+                    if payload is None:
+                        break
+                    count += 1
+                    yield {
+                        "name": "%s:%d #%d" % (address[0], address[1], count),
+                        "data": np.frombuffer(payload, dtype=np.float32).reshape((-1, self.columns)),
+                    }
+            print(f"live 연결 종료: {address[0]}:{address[1]}")
+
+    def close(self):
+        self._server.close()
+
+
+# 최근 window 초 동안의 처리 속도 (frames/s)
+class RateMeter:
+
+    def __init__(self, window=2.0):
+        self.window = window
+        self._times = deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        while self._times and now - self._times[0] > self.window:
+            self._times.popleft()
+
+    def tick(self):
+        now = time.perf_counter()
+        with self._lock:
+            self._times.append(now)
+            self._trim(now)
+
+    def rate(self):
+        with self._lock:
+            self._trim(time.perf_counter())
+            return len(self._times) / self.window
+
+
+# live 입력 처리
+## worker thread가 입력을 SemLaserScan으로 처리하여 bounded queue에 넣고,
+## 화면은 가장 최신 프레임만 가져감 (queue가 가득 차면 가장 오래된 프레임 제거)
+class LiveStream:
+
+    def __init__(self,
+                 scan,
+                 source,
+                 semantics=True,
+                 queue_size=2
+                ):
+        self.scan = scan
+        self.source = source
+        self.semantics = semantics
+
+        self._queue = deque()
+        self._queue_size = max(1, queue_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        # 통계
+        self.ingested = 0
+        self.rendered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.ingest_rate = RateMeter()
+        self.render_rate = RateMeter()
+
+        self._thread = threading.Thread(target=self._run, name="live", daemon=True)
+        self._thread.start()
+
+    # 입력 하나 처리 -> 프레임
+    def _process(self, item, index):
+        scan = self.scan
+        with scan.timer.frame(index, "load"):
+            # 1. pointcloud (+ predictions label)
+            if "data" in item:
+                data = item["data"]
+                scan.set_points(data[:, 0:3], data[:, 3])
+                if scan.predictions and self.semantics:
+                    scan.set_label(data[:, 4].astype(np.uint32))
+            else:
+                scan.open_scan(item["scan"])
+
+            # 2. label (색상은 프레임에서 필요할 때 생성)
+            if self.semantics and not scan.predictions and item.get("label"):
+                scan.open_label(item["label"])
+
+            # 3. 프레임 생성
+            with scan.timer.stage("snapshot"):
+                frame = ScanFrame.from_scan(scan, index)
+        frame.name = item["name"]
+        return frame
+
+    # worker thread
+    def _run(self):
+        for item in self.source.frames(self._stop):
+            try:
+                frame = self._process(item, self.ingested)
+            ## OSError: 목록을 읽은 뒤 삭제/교체된 파일 등 (thread가 종료되지 않도록 프레임만 건너뜀)
+            except (ValueError, RuntimeError, OSError) as e:
+                print(f"live 프레임 오류 ({item['name']}): {e}")
+                self.errors += 1
+                continue
+            self.ingested += 1
+            self.ingest_rate.tick()
+            with self._lock:
+                self._queue.append(frame)
+                while len(self._queue) > self._queue_size:
+                    self._queue.popleft()
+                    self.dropped += 1
+
+    # 가장 최신 프레임 (없으면 None), 화면에 표시하지 못한 이전 프레임은 dropped
+    def latest(self):
+        with self._lock:
+            if not self._queue:
+                return None
+            frame = self._queue.pop()
+            self.dropped += len(self._queue)
+            self._queue.clear()
+        self.rendered += 1
+        self.render_rate.tick()
+        return frame
+
+    # 통계 정보
+    def stats(self):
+        return {
+            "ingested": self.ingested,
+            "rendered": self.rendered,
+            "dropped": self.dropped + self.source.skipped,
+            "errors": self.errors,
+            "ingest_fps": self.ingest_rate.rate(),
+            "render_fps": self.render_rate.rate(),
+        }
+
+    # 종료
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        if hasattr(self.source, "close"):
+            self.source.close()
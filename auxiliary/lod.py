@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+import numpy as np
+
+
+# voxel 좌표 -> voxel key (좌표 범위 안에서 int64 하나로 묶음, 서로 다른 voxel은 항상 다른 key)
+def voxel_keys(points, voxel_size):
+    cell = np.floor(points / voxel_size).astype(np.int64)
+    ## [N, 3] 배열의 axis=0 min/max는 느려서 열마다 계산
+    lower = np.array([cell[:, k].min() for k in range(3)], dtype=np.int64)
+    cell -= lower
+    size = np.array([cell[:, k].max() for k in range(3)], dtype=np.int64) + 1
+    return (cell[:, 0] * size[1] + cell[:, 1]) * size[2] + cell[:, 2]
+
+
+# voxel마다 대표 point 하나 선택 (point 순서 유지)
+## np.unique(return_index=True)는 stable sort를 사용하여 느리므로 argsort 후 key가 바뀌는 위치 사용
+def _voxel_select(keys):
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    first = np.ones(keys.shape[0], dtype=bool)
+    np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=first[1:])
+    index = order[first]
+    index.sort()
+    return index
+
+
+# 점유된 voxel 수
+def _voxel_count(keys):
+    sorted_keys = np.sort(keys)
+    return int(np.count_nonzero(sorted_keys[1:] != sorted_keys[:-1])) + 1 if keys.shape[0] > 0 else 0
+
+
+# point 수가 budget에 가깝도록 voxel 크기 추정
+## 처음에는 xy 면적 기준으로 추정하고, 점유된 voxel 수를 보고 몇 번 보정
+def estimate_voxel_size(points, budget, iterations=3):
+    extent = np.array([points[:, k].max() - points[:, k].min() for k in range(2)], dtype=np.float64)
+    area = max(float(extent[0] * extent[1]), 1e-6)
+    voxel_size = np.sqrt(area / budget)
+    for _ in range(iterations):
+        occupied = _voxel_count(voxel_keys(points, voxel_size))
+        ratio = occupied / budget
+        if 0.8 <= ratio <= 1.2:
+            break
+        voxel_size *= np.sqrt(ratio)
+    return voxel_size
+
+
+# voxel downsampling (점유된 voxel마다 대표 point 하나)
+## 반환값: 대표 point의 index (모든 view가 같은 index를 사용하여 색상 일관성 유지), 사용한 voxel 크기
+## voxel_size는 이전 프레임에서 사용한 크기 (시작값), 프레임마다 voxel 수를 보고 다시 맞춤
+## - budget을 넘으면 voxel을 버리지 않고 voxel 크기를 키워서 다시 선택
+## - budget보다 많이 적으면 (fill 미만) voxel 크기를 줄여서 다시 선택 (budget을 넘으면 이전 결과 사용)
+def voxel_downsample(points, budget, voxel_size=None, fill=0.8, iterations=3):
+    num_points = points.shape[0]
+    if num_points <= budget:
+        return np.arange(num_points), voxel_size
+    if voxel_size is None:
+        voxel_size = estimate_voxel_size(points, budget)
+
+    # 1. budget 근처가 될 때까지 voxel 크기 보정 (최대 iterations번)
+    best = None
+    for _ in range(iterations):
+        index = _voxel_select(voxel_keys(points, voxel_size))
+        ratio = index.shape[0] / budget
+        if ratio > 1.0:
+            if best is not None:
+                break
+            voxel_size *= max(np.sqrt(ratio), 1.05)
+            continue
+        best = (index, voxel_size)
+        if ratio >= fill:
+            break
+        voxel_size *= max(np.sqrt(ratio), 0.5)
+    if best is not None:
+        return best
+
+    # 2. 아직 budget을 넘으면 budget 이하가 될 때까지 voxel 크기 증가
+    while True:
+        index = _voxel_select(voxel_keys(points, voxel_size))
+        if index.shape[0] <= budget:
+            return index, voxel_size
+        voxel_size *= max(np.sqrt(index.shape[0] / budget), 1.05)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+import numpy as np
+
+
+# 프레임별 spatial grid (point 선택용)
+## point를 cell_size 크기의 3D cell로 묶고 cell 번호 순서로 정렬한 index 저장
+## 처음 선택할 때 한 번 생성하고 같은 프레임의 이후 선택에 재사용
+class PointGrid:
+
+    # cell 주변 탐색 offset (3x3x3)
+    NEIGHBORS = np.stack(np.meshgrid([-1, 0, 1], [-1, 0, 1], [-1, 0, 1], indexing='ij'), axis=-1).reshape(-1, 3)
+
+    def __init__(self, points, cell_size=1.0):
+        self.points = points
+        self.cell_size = cell_size
+
+        # 1. grid 경계 (ray가 grid를 지나는 구간 계산용)
+        ## [N, 3] 배열의 axis=0 min/max는 느려서 열마다 계산
+        self.lower = np.array([points[:, k].min() for k in range(3)], dtype=np.float64)
+        self.upper = np.array([points[:, k].max() for k in range(3)], dtype=np.float64)
+
+        # 2. point별 cell 좌표 (grid 범위 안에서 0부터 시작)
+        self.origin = np.floor(self.lower / cell_size).astype(np.int64)
+        self.size = np.floor(self.upper / cell_size).astype(np.int64) - self.origin + 1
+        cell = np.floor(points / cell_size).astype(np.int64) - self.origin
+
+        # 3. cell 번호 순서로 정렬 (같은 cell 안의 순서는 상관없음)
+        key = self._key(cell)
+        self.order = np.argsort(key).astype(np.int32)
+        self.keys = key[self.order]
+
+    # cell 좌표 -> cell 번호
+    def _key(self, cell):
+        return (cell[:, 0] * self.size[1] + cell[:, 1]) * self.size[2] + cell[:, 2]
+
+    # cell 좌표 목록에 속한 point index
+    def candidates(self, cells):
+        cells = cells - self.origin
+        inside = np.all((cells >= 0) & (cells < self.size), axis=1)
+        keys = np.unique(self._key(cells[inside]))
+        start = np.searchsorted(self.keys, keys, side='left')
+        end = np.searchsorted(self.keys, keys, side='right')
+        count = end - start
+        ## 구간 [start, end) 여러 개를 한 번에 이어 붙임
+        total = int(count.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int32)
+        offsets = np.repeat(start - np.cumsum(count) + count, count) + np.arange(total)
+        return self.order[offsets]
+
+    # ray에 가장 먼저 닿는 point index (없으면 None)
+    ## origin/direction: ray 시작점과 방향 (point 좌표계)
+    ## angle: 허용 각도 (radian), 거리에 비례하여 허용 반경 증가 (최대 cell_size)
+    ## mask: 선택 가능한 point (None이면 전체)
+    def pick_ray(self, origin, direction, angle=0.01, mask=None):
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        direction = direction / np.linalg.norm(direction)
+
+        # 1. ray가 grid 경계 상자를 지나는 구간 [t0, t1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_lower = (self.lower - self.cell_size - origin) / direction
+            t_upper = (self.upper + self.cell_size - origin) / direction
+        t_near = np.where(np.isnan(t_lower), -np.inf, np.minimum(t_lower, t_upper))
+        t_far = np.where(np.isnan(t_upper), np.inf, np.maximum(t_lower, t_upper))
+        t0 = max(float(t_near.max()), 0.0)
+        t1 = float(t_far.min())
+        if not np.isfinite(t1) or t1 < t0:
+            return None
+
+        # 2. ray를 반 cell 간격으로 따라가며 지나는 cell과 주변 cell의 point 수집
+        t = np.arange(t0, t1 + self.cell_size, self.cell_size * 0.5)
+        samples = origin + t[:, None] * direction
+        cells = np.floor(samples / self.cell_size).astype(np.int64)
+        cells = (cells[:, None, :] + self.NEIGHBORS[None, :, :]).reshape(-1, 3)
+        index = self.candidates(cells)
+        if mask is not None:
+            index = index[mask[index]]
+        if index.shape[0] == 0:
+            return None
+
+        # 3. ray와의 거리가 허용 반경 안에 있는 point 중 가장 가까운 point
+        offset = self.points[index] - origin
+        along = offset @ direction
+        across = np.linalg.norm(offset - along[:, None] * direction, axis=1)
+        radius = np.minimum(np.maximum(along * np.tan(angle), self.cell_size * 0.05), self.cell_size)
+        hit = (along > 0) & (across <= radius)
+        if not np.any(hit):
+            return None
+        return int(index[hit][np.argmin(along[hit])])
+
+
+# 2D 이미지 픽셀 -> point index (빈 픽셀이면 radius 픽셀 안의 가장 가까운 투영 픽셀 사용, 없으면 None)
+## pixels: 선택 가능한 픽셀 mask (None이면 투영된 모든 픽셀)
+def pick_pixel(proj_idx, row, col, radius=2, pixels=None):
+    H, W = proj_idx.shape
+    if not (0 <= row < H and 0 <= col < W):
+        return None
+    valid = proj_idx >= 0 if pixels is None else pixels
+    r0, r1 = max(0, row - radius), min(H, row + radius + 1)
+    c0, c1 = max(0, col - radius), min(W, col + radius + 1)
+    rows, cols = np.nonzero(valid[r0:r1, c0:c1])
+    if rows.shape[0] == 0:
+        return None
+    nearest = np.argmin((rows + r0 - row) ** 2 + (cols + c0 - col) ** 2)
+    return int(proj_idx[rows[nearest] + r0, cols[nearest] + c0])
+
+
+# canvas 좌표 -> visual 좌표계의 ray (시작점, 방향)
+## visual: vispy visual (get_transform 사용), pos: canvas 픽셀 좌표
+def canvas_ray(visual, pos):
+    transform = visual.get_transform(map_from='canvas', map_to='visual')
+    near = transform.map([pos[0], pos[1], -1, 1])
+    far = transform.map([pos[0], pos[1], 1, 1])
+    near = near[:3] / near[3]
+    far = far[:3] / far[3]
+    return near, far - near
+
+
+# 선택한 point 정보
+## raw_label: mapping 전 원본 semantic label (없으면 frame의 label 사용)
+## class_names: {label: 이름}
+def point_info(frame, index, raw_label=None, class_names=None):
+    info = {
+        "index": index,
+        "xyz": tuple(float(value) for value in frame.points[index]),
+        "range": float(frame.unproj_range[index]),
+        "intensity": float(frame.intensity[index]) if frame.intensity is not None else None,
+    }
+    if frame.sem_label is not None:
+        label = int(frame.sem_label[index])
+        info["label"] = label
+        info["raw_label"] = int(raw_label) if raw_label is not None else label
+        info["class"] = (class_names or {}).get(label)
+        info["instance"] = int(frame.inst_label[index])
+    return info
+
+
+# point 정보 -> 한 줄 문자열
+def format_info(info):
+    text = "point %d (%.2f, %.2f, %.2f) range %.2fm" % ((info["index"],) + info["xyz"] + (info["range"],))
+    if info["intensity"] is not None:
+        text += " intensity %.3f" % info["intensity"]
+    if "label" in info:
+        text += " label %d" % info["label"]
+        if info["class"] is not None:
+            text += " (%s)" % info["class"]
+        if info["raw_label"] != info["label"]:
+            text += " raw %d" % info["raw_label"]
+        text += " instance %d" % info["instance"]
+    return text
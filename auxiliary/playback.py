@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import time
+from collections import deque
+
+
+# 재생 스케줄러 (목표 FPS로 sequence 재생)
+## 표시할 프레임은 재생 시작 시각 기준 경과 시간으로 결정 (지연이 누적되지 않음)
+## 프레임 표시가 목표 주기보다 오래 걸리면 밀린 프레임은 건너뜀
+## timer 이벤트는 LaserScanVis에서 vispy timer로 호출 (이 모듈은 vispy를 사용하지 않음)
+class PlaybackScheduler:
+
+    # 목표 FPS 범위
+    MIN_FPS = 0.5
+    MAX_FPS = 120.0
+
+    def __init__(self, total, fps=10.0, window=2.0):
+        self.total = total
+        self.fps = min(max(fps, self.MIN_FPS), self.MAX_FPS)
+        self.window = window
+        self.playing = False
+
+        # 재생 기준점 (시작 시각, 시작 프레임) 및 마지막으로 표시한 step
+        self._anchor_time = 0.0
+        self._anchor_offset = 0
+        self._step = 0
+
+        # 최근 표시 시각 (achieved FPS 계산용) 및 표시 시간 (지수 이동 평균)
+        self._shown = deque()
+        self.frame_cost = 0.0
+        self.skipped = 0
+
+    # 재생 시작 (offset 프레임부터)
+    def play(self, offset, now=None):
+        self.playing = True
+        self._shown.clear()
+        self._anchor(offset, now)
+
+    def pause(self):
+        self.playing = False
+
+    def toggle(self, offset, now=None):
+        if self.playing:
+            self.pause()
+        else:
+            self.play(offset, now)
+        return self.playing
+
+    # 재생 기준점 다시 설정 (seek, FPS 변경, 수동 이동)
+    def _anchor(self, offset, now=None):
+        self._anchor_time = time.perf_counter() if now is None else now
+        self._anchor_offset = offset
+        self._step = 0
+
+    # 프레임 이동 -> 실제 프레임 index (범위를 벗어나면 None)
+    def seek(self, index, now=None):
+        if not 0 <= index < self.total:
+            return None
+        if self.playing:
+            self._anchor(index, now)
+        return index
+
+    # 목표 FPS 변경 (현재 프레임부터 새 속도로 재생)
+    def set_fps(self, fps, offset, now=None):
+        self.fps = min(max(fps, self.MIN_FPS), self.MAX_FPS)
+        if self.playing:
+            self._anchor(offset, now)
+        return self.fps
+
+    # 지금 표시해야 할 프레임 (새로 표시할 프레임이 없으면 None)
+    ## 여러 step이 밀렸으면 마지막 step의 프레임만 반환하고 나머지는 건너뜀
+    def due(self, now=None):
+        if not self.playing:
+            return None
+        now = time.perf_counter() if now is None else now
+        step = int((now - self._anchor_time) * self.fps)
+        if step <= self._step:
+            return None
+        self.skipped += step - self._step - 1
+        self._step = step
+        return (self._anchor_offset + step) % self.total
+
+    # 프레임 표시 완료 기록 (cost: 표시에 걸린 시간, 초)
+    def shown(self, cost, now=None):
+        now = time.perf_counter() if now is None else now
+        self._shown.append(now)
+        while self._shown and now - self._shown[0] > self.window:
+            self._shown.popleft()
+        self.frame_cost = cost if self.frame_cost == 0.0 else 0.8 * self.frame_cost + 0.2 * cost
+
+    # 다음 표시 프레임까지의 예상 간격 (prefetch 방향/간격으로 사용)
+    ## 실제 표시 FPS 기준 (그리기/timer 지연 포함), 측정 전에는 표시 시간 기준
+    @property
+    def stride(self):
+        achieved = self.achieved_fps
+        if achieved > 0:
+            return max(1, round(self.fps / achieved))
+        return max(1, round(self.frame_cost * self.fps))
+
+    # 실제 표시 FPS (최근 window 초)
+    @property
+    def achieved_fps(self):
+        if len(self._shown) < 2:
+            return 0.0
+        span = self._shown[-1] - self._shown[0]
+        return (len(self._shown) - 1) / span if span > 0 else 0.0
+
+    # 통계 정보
+    def stats(self):
+        return {
+            "playing": self.playing,
+            "target_fps": self.fps,
+            "achieved_fps": self.achieved_fps,
+            "skipped": self.skipped,
+            "frame_ms": self.frame_cost * 1000.0,
+            "stride": self.stride,
+        }
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# search x search 가우시안 커널의 역가중치 (1 - 정규화된 가우시안)
+## 창 중심에서 먼 픽셀일수록 거리 차이를 크게 봄 (RangeNet++ 후처리와 같은 방식)
+def inverse_gaussian_kernel(search, sigma):
+    coord = np.arange(search, dtype=np.float64) - (search - 1) / 2.0
+    kernel = np.exp(-(coord[:, None] ** 2 + coord[None, :] ** 2) / (2.0 * sigma ** 2))
+    kernel /= kernel.sum()
+    return (1.0 - kernel).astype(np.float32).reshape(-1)
+
+
+# range image 창 기반 KNN label 투표 (모든 point 한 번에 처리, point별 python loop 없음)
+## proj_range/proj_label: [H, W] 2D 거리 / label 이미지 (빈 픽셀은 거리 < 0)
+## unproj_range/proj_x/proj_y/labels: point별 거리, 투영 좌표, label [N]
+## 1. point마다 투영 픽셀 주변 search x search 창의 거리와 label 수집 (창 중심은 point 자신의 거리)
+## 2. 거리 차이 |창 거리 - point 거리|에 가우시안 역가중치를 곱하고 가까운 knn개 선택
+## 3. 거리 차이가 cutoff보다 큰 이웃은 제외하고 다수결 (동점이면 작은 label), 투표할 이웃이 없으면 원래 label 유지
+def knn_vote(proj_range, proj_label, unproj_range, proj_x, proj_y, labels,
+             knn=5, search=5, sigma=1.0, cutoff=1.0):
+    num_points = unproj_range.shape[0]
+    if num_points == 0:
+        return labels.copy()
+    H, W = proj_range.shape
+    size = search * search
+    pad = search // 2
+    knn = min(knn, size)
+
+    # 1. label 이미지를 0 ~ C-1로 압축 (C: 제외 label)
+    classes, compact = np.unique(proj_label, return_inverse=True)
+    num_classes = classes.shape[0]
+    dtype = np.uint8 if num_classes < 255 else np.uint16
+    compact = compact.reshape(H, W).astype(dtype)
+
+    # 2. 픽셀별 창 [H * W, search * search] (빈 픽셀 및 가장자리는 거리 무한대)
+    ranges = np.where(proj_range >= 0, proj_range, np.inf).astype(np.float32)
+    ranges = np.pad(ranges, pad, mode='constant', constant_values=np.inf)
+    compact = np.pad(compact, pad, mode='constant', constant_values=num_classes)
+    pixel_range = sliding_window_view(ranges, (search, search)).reshape(H * W, size)
+    ## 창 column -> 가장자리를 채운 label 이미지의 index 차이
+    offsets = (np.arange(search)[:, None] * (W + 2 * pad) + np.arange(search)[None, :]).reshape(-1)
+
+    # 3. point별 창 [N, search * search] 및 가중 거리 차이 (창 중심은 point 자신의 거리)
+    pixel = proj_y.astype(np.intp) * W + proj_x
+    distance = np.take(pixel_range, pixel, axis=0)
+    distance[:, size // 2] = unproj_range
+    distance -= unproj_range[:, None]
+    np.abs(distance, out=distance)
+    distance *= inverse_gaussian_kernel(search, sigma)
+
+    # 4. 가까운 knn개 이웃 선택 (argpartition 대신 정수 key 하나를 partition)
+    ## key = (양자화한 거리 << column bit) | 창 안의 column, cutoff는 levels로 양자화
+    ## cutoff보다 먼 이웃은 2 * cutoff로 고정 (선택되어도 투표에서 제외), 거리가 같으면 column 순서
+    column_bits = (size - 1).bit_length()
+    levels = 1 << (30 - column_bits)
+    invalid = distance > cutoff
+    np.minimum(distance, np.float32(2 * cutoff), out=distance)
+    key = (distance * np.float32(levels / cutoff)).astype(np.uint32)
+    key[invalid] = 2 * levels
+    key <<= column_bits
+    key |= np.arange(size, dtype=np.uint32)
+    if knn < size:
+        key = np.partition(key, knn - 1, axis=1)[:, :knn]
+    valid = (key >> column_bits) < 2 * levels
+    nearest = offsets[key & ((1 << column_bits) - 1)]
+
+    ## 선택한 이웃의 label [knn, N] (제외된 이웃은 C)
+    nearest += (proj_y.astype(np.intp) * (W + 2 * pad) + proj_x)[:, None]
+    vote = np.take(compact.reshape(-1), nearest)
+    vote[~valid] = num_classes
+    vote = np.ascontiguousarray(vote.T)
+
+    # 5. 다수결 (point별로 label 정렬 후 같은 label이 이어지는 길이 = 표 수)
+    ## knn개 행을 odd-even 정렬 (행 단위 min/max, point 축으로 정렬하는 np.sort보다 빠름)
+    for step in range(knn):
+        for i in range(step % 2, knn - 1, 2):
+            low = np.minimum(vote[i], vote[i + 1])
+            np.maximum(vote[i], vote[i + 1], out=vote[i + 1])
+            vote[i] = low
+    ## 같은 label이 이어지는 길이가 지금까지의 최대 표 수보다 크면 선택 (표 수가 같으면 먼저 나온 작은 label)
+    ## 제외 label (C)은 선택하지 않고, 선택된 label이 없으면 C
+    run = np.ones(num_points, dtype=np.uint8 if knn < 255 else np.uint16)
+    best = vote[0].copy()
+    best_count = (vote[0] < num_classes).astype(run.dtype)
+    for i in range(1, knn):
+        run *= vote[i] == vote[i - 1]
+        run += 1
+        better = run > best_count
+        better &= vote[i] < num_classes
+        np.copyto(best, vote[i], where=better)
+        np.copyto(best_count, run, where=better)
+    np.copyto(best, num_classes, where=best_count == 0)
+
+    # 6. 압축 label -> 원래 label (투표할 이웃이 없으면 원래 label)
+    result = classes[np.minimum(best, num_classes - 1)].astype(labels.dtype)
+    keep = best == num_classes
+    result[keep] = labels[keep]
+    return result
+
+
+# range image KNN 후처리 (scan의 2D 투영 결과 사용)
+## scan: do_range_projection을 실행한 LaserScan/SemLaserScan
+class KNNPostProcess:
+
+    def __init__(self, knn=5, search=5, sigma=1.0, cutoff=1.0):
+        if knn < 1:
+            raise ValueError("knn 이웃 수는 1 이상이어야 합니다")
+        if search < 1 or search % 2 == 0:
+            raise ValueError("search 창 크기는 1 이상의 홀수여야 합니다")
+        if sigma <= 0:
+            raise ValueError("sigma는 0보다 커야 합니다")
+        if cutoff <= 0:
+            raise ValueError("cutoff는 0보다 커야 합니다")
+        self.knn = knn
+        self.search = search
+        self.sigma = sigma
+        self.cutoff = cutoff
+
+    # point label [N] -> 후처리 label [N]
+    def apply(self, scan, labels):
+        # 1. 2D label 이미지 (투영된 point의 label)
+        mask = scan.proj_idx >= 0
+        proj_label = np.zeros(scan.proj_idx.shape, dtype=labels.dtype)
+        proj_label[mask] = labels[scan.proj_idx[mask]]
+
+        # 2. KNN 투표
+        return knn_vote(scan.proj_range, proj_label, scan.unproj_range, scan.proj_x, scan.proj_y, labels,
+                        knn=self.knn, search=self.search, sigma=self.sigma, cutoff=self.cutoff)
+
+    def __repr__(self):
+        return "KNNPostProcess(knn=%d, search=%d, sigma=%g, cutoff=%g)" % (
+            self.knn, self.search, self.sigma, self.cutoff)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+import copy
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from auxiliary.frame import load_frame
+
+
+# 다음/이전 scan을 미리 읽어두는 prefetch 엔진
+class ScanPrefetcher:
+
+    def __init__(self,
+                 scan,
+                 scan_names,
+                 label_names,
+                 semantics=True,
+                 window=4,
+                 workers=2,
+                 max_bytes=1024 * 1024 * 1024
+                ):
+        self.scan = scan
+        self.scan_names = scan_names
+        self.label_names = label_names
+        self.semantics = semantics
+        self.window = window
+        self.max_bytes = max_bytes
+        self.total = len(scan_names)
+
+        # 진행 방향 (1: next, -1: back)
+        self.direction = 1
+
+        # 캐시 (LRU 순서) 및 진행 중인 작업
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._pending = {}
+        self._lock = threading.RLock()
+
+        # worker 별 scan 객체 (thread 마다 하나씩 복사)
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="prefetch")
+
+        # 통계
+        self.hits = 0
+        self.waits = 0
+        self.misses = 0
+        self.cancelled = 0
+        self.evicted = 0
+
+    # worker thread 전용 scan 객체
+    def _worker_scan(self):
+        scan = getattr(self._local, "scan", None)
+        if scan is None:
+            scan = copy.deepcopy(self.scan)
+            self._local.scan = scan
+        return scan
+
+    # worker에서 실행되는 프레임 로드
+    def _load(self, index):
+        return load_frame(self._worker_scan(), self.scan_names, self.label_names,
+                          index, self.semantics)
+
+    # 작업 완료 처리
+    def _on_done(self, index, future):
+        with self._lock:
+            if self._pending.get(index) is future:
+                del self._pending[index]
+            if future.cancelled() or future.exception() is not None:
+                return
+            self._store(index, future.result())
+
+    # 캐시에 프레임 저장 (LRU + 메모리 제한)
+    def _store(self, index, frame):
+        with self._lock:
+            if index in self._cache:
+                self._cache.move_to_end(index)
+                return
+            self._cache[index] = frame
+            self._cache_bytes += frame.nbytes
+
+            ## 메모리 제한 또는 window 크기를 넘으면 가장 오래된 프레임 제거
+            max_frames = 2 * self.window + 1
+            while len(self._cache) > 1 and (self._cache_bytes > self.max_bytes or
+                                            len(self._cache) > max_frames):
+                _, old = self._cache.popitem(last=False)
+                self._cache_bytes -= old.nbytes
+                self.evicted += 1
+
+    # 현재 위치 기준으로 미리 읽을 프레임 목록
+    def _wanted(self, index):
+        wanted = [(index + self.direction * k) % self.total
+                  for k in range(1, self.window + 1)]
+        ## 방향을 바꿀 때를 대비해 바로 이전 프레임은 유지
+        wanted.append((index - self.direction) % self.total)
+        return wanted
+
+    # prefetch 작업 예약 (필요 없어진 작업은 취소)
+    def _schedule(self, index):
+        wanted = self._wanted(index)
+        with self._lock:
+            # 1. 오래된 작업 취소 (아직 시작하지 않은 작업만 취소 가능)
+            for i, future in list(self._pending.items()):
+                if i not in wanted and future.cancel():
+                    self._pending.pop(i, None)
+                    self.cancelled += 1
+
+            # 2. 새 작업 예약
+            for i in wanted:
+                if i in self._cache or i in self._pending:
+                    continue
+                future = self._executor.submit(self._load, i)
+                self._pending[i] = future
+                future.add_done_callback(partial(self._on_done, i))
+
+    # 프레임 가져오기
+    def get(self, index, direction=None):
+        if direction is not None:
+            self.direction = direction
+
+        # 1. 캐시 확인
+        with self._lock:
+            frame = self._cache.get(index)
+            future = self._pending.get(index)
+            if frame is not None:
+                self._cache.move_to_end(index)
+                self.hits += 1
+
+        # 2. 캐시에 없으면 진행 중인 작업을 기다리거나 직접 로드
+        if frame is None:
+            if future is not None and not future.cancelled():
+                self.waits += 1
+                frame = future.result()
+            else:
+                self.misses += 1
+                frame = load_frame(self.scan, self.scan_names, self.label_names,
+                                   index, self.semantics)
+            self._store(index, frame)
+
+        # 3. 다음 프레임 예약
+        self._schedule(index)
+        return frame
+
+    # 통계 정보
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "waits": self.waits,
+                "misses": self.misses,
+                "cancelled": self.cancelled,
+                "evicted": self.evicted,
+                "cached": len(self._cache),
+                "cached_bytes": self._cache_bytes,
+                "pending": len(self._pending),
+            }
+
+    # 종료
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# 환경 변수로 계측 활성화 ("1": 화면 표시만, 그 외: JSON lines 저장 경로)
+PROFILE_ENV = "LIDAR_VIS_PROFILE"
+
+
+# 단계 하나의 측정 정보 (처리한 byte 수는 단계 안에서 설정 가능)
+class StageRecord:
+    __slots__ = ('name', 'nbytes')
+
+    def __init__(self, name, nbytes=0):
+        self.name = name
+        self.nbytes = nbytes
+
+
+# 계측 비활성화 시 사용 (아무것도 기록하지 않음)
+class NullTimer:
+
+    enabled = False
+
+    @contextmanager
+    def stage(self, name, nbytes=0):
+        yield StageRecord(name, nbytes)
+
+    @contextmanager
+    def frame(self, index, phase):
+        yield
+
+    def summary(self):
+        return ""
+
+    def close(self):
+        pass
+
+
+# 프레임별 단계 시간/처리량 측정
+## 단계 기록은 thread마다 따로 저장 (prefetch worker에서도 사용 가능)
+class StageTimer:
+
+    enabled = True
+
+    def __init__(self, log_path=None, window=30):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.history = deque(maxlen=window)
+        self._log = open(log_path, 'a') if log_path else None
+
+    # 여러 thread가 같은 timer를 공유하도록 복사하지 않음
+    def __deepcopy__(self, memo):
+        return self
+
+    # 다른 process로 전달될 때는 계측하지 않음
+    def __reduce__(self):
+        return (NullTimer, ())
+
+    # 단계 시간 측정
+    @contextmanager
+    def stage(self, name, nbytes=0):
+        record = StageRecord(name, nbytes)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            elapsed = time.perf_counter() - start
+            current = getattr(self._local, "frame", None)
+            if current is not None:
+                current["stages"][name] = current["stages"].get(name, 0.0) + elapsed * 1000.0
+                current["bytes"][name] = current["bytes"].get(name, 0) + int(record.nbytes)
+
+    # 프레임 단위 측정 (phase: load, display 등)
+    @contextmanager
+    def frame(self, index, phase):
+        current = {
+            "frame": int(index),
+            "phase": phase,
+            "thread": threading.current_thread().name,
+            "time": time.time(),
+            "stages": {},
+            "bytes": {},
+        }
+        self._local.frame = current
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current["total_ms"] = (time.perf_counter() - start) * 1000.0
+            self._local.frame = None
+            with self._lock:
+                self.history.append(current)
+                if self._log is not None:
+                    self._log.write(json.dumps(current) + "\n")
+                    self._log.flush()
+
+    # 최근 프레임 평균 (창 제목 표시용)
+    def summary(self):
+        with self._lock:
+            records = list(self.history)
+        if not records:
+            return ""
+        totals = {}
+        stages = {}
+        for record in records:
+            phase = totals.setdefault(record["phase"], [0.0, 0])
+            phase[0] += record["total_ms"]
+            phase[1] += 1
+            for name, ms in record["stages"].items():
+                stage = stages.setdefault(name, [0.0, 0])
+                stage[0] += ms
+                stage[1] += 1
+        text = " ".join(f"{name} {ms / n:.1f}ms" for name, (ms, n) in totals.items())
+        text += " | " + " ".join(f"{name} {ms / n:.1f}" for name, (ms, n) in stages.items())
+        return text
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+# 계측 timer 생성 (CLI 옵션 또는 환경 변수)
+## profile: None이면 환경 변수 확인, ""이면 화면 표시만, 그 외에는 JSON lines 저장 경로
+def create_timer(profile=None):
+    if profile is None:
+        profile = os.environ.get(PROFILE_ENV)
+        if profile in (None, "", "0"):
+            return NullTimer()
+        if profile == "1":
+            profile = ""
+    return StageTimer(log_path=profile or None)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from auxiliary.frame import load_frame
+from auxiliary.colormaps import get_colormap
+from auxiliary.formats import frame_id
+
+
+# 거리 값 압축 지수 (거리 값에 따라 색 강도 조정, 16등분)
+RANGE_POWER = 16
+
+
+# 3D point 색상 (거리 기반)
+## colormap: (256, 3) 컬러맵, 반환값은 colormap과 같은 채널 순서
+def range_point_colors(unproj_range, colormap, power=RANGE_POWER):
+    range_data = np.copy(unproj_range)
+    range_data = range_data**(1 / power)
+    range_index = ((range_data - range_data.min()) /
+                   (range_data.max() - range_data.min()) *
+                   255).astype(np.uint8)
+    return colormap[range_index]
+
+
+# 표시용 색상 변환: label 색상 uint8 BGR (0 ~ 255) -> float32 RGB (0 ~ 1, vispy 입력 형식)
+## 프레임에는 uint8로 저장하고 업로드할 때만 변환
+def display_colors(colors):
+    return colors[..., ::-1] * np.float32(1.0 / 255.0)
+
+
+# 2D 거리 이미지 정규화 (0 ~ 1)
+def range_image(proj_range, power=RANGE_POWER):
+    data = np.copy(proj_range)
+    data[data > 0] = data[data > 0]**(1 / power)
+    data[data < 0] = data[data > 0].min()
+    data = ((data - data[data > 0].min()) /
+            (data.max() - data[data > 0].min()))
+    return data
+
+
+# 위에서 내려다본 (bird's-eye view) pointcloud 이미지
+## 높은 point가 위에 보이도록 z 오름차순으로 그림, 이미지 dtype은 colors와 같음
+def bev_image(points, colors, size=800, extent=50.0):
+    image = np.zeros((size, size, 3), dtype=colors.dtype)
+    scale = size / (2.0 * extent)
+    col = np.floor((points[:, 1] * -1 + extent) * scale).astype(np.int64)
+    row = np.floor((points[:, 0] * -1 + extent) * scale).astype(np.int64)
+    valid = (row >= 0) & (row < size) & (col >= 0) & (col < size)
+    order = np.argsort(points[valid, 2], kind="stable")
+    image[row[valid][order], col[valid][order]] = colors[valid][order]
+    return image
+
+
+# 0 ~ 1 이미지 또는 uint8 이미지 -> PNG 저장
+def save_png(filename, image):
+    from matplotlib import image as mpimg
+    if image.dtype == np.uint8:
+        data = image
+    else:
+        data = (np.clip(image, 0.0, 1.0) * 255).astype(np.uint8)
+    mpimg.imsave(filename, data)
+
+
+# PNG 목록 -> GIF 저장
+## 프레임을 하나씩 읽어 바로 기록 (전체 프레임을 메모리에 올리지 않음), 프레임마다 자체 palette 사용
+def save_gif(filename, png_names, fps=10):
+    from PIL import GifImagePlugin, Image
+    f = None
+    try:
+        for name in png_names:
+            with Image.open(name) as image:
+                frame = image.convert("RGB").convert("P", palette=Image.ADAPTIVE)
+            ## 첫 프레임: GIF 헤더 (화면 크기, 반복 재생)
+            if f is None:
+                f = open(filename, 'wb')
+                header, _ = GifImagePlugin.getheader(frame, info={"loop": 0})
+                for data in header:
+                    f.write(data)
+            for data in GifImagePlugin.getdata(frame, duration=int(1000 / fps), include_color_table=True):
+                f.write(data)
+        if f is not None:
+            f.write(b";")
+    finally:
+        if f is not None:
+            f.close()
+
+
+# headless 일괄 렌더링 도구
+## worker process마다 scan 객체를 하나씩 가지고 프레임 단위로 렌더링
+class HeadlessRenderer:
+
+    # 출력 이미지 종류
+    KINDS = ['range', 'semantic', 'bev']
+
+    def __init__(self,
+                 scan,
+                 scan_names,
+                 label_names,
+                 out_dir,
+                 semantics=True,
+                 workers=None,
+                 gif=False
+                ):
+        self.scan = scan
+        self.scan_names = scan_names
+        self.label_names = label_names
+        self.out_dir = out_dir
+        self.semantics = semantics
+        self.workers = workers or os.cpu_count()
+        self.gif = gif
+
+    # 출력 경로
+    def output_name(self, kind, index):
+        name = frame_id(self.scan_names[index])
+        return os.path.join(self.out_dir, kind, name + ".png")
+
+    # 한 프레임 렌더링
+    def render(self, index):
+
+        # 1. 프레임 로드
+        frame = load_frame(self.scan, self.scan_names, self.label_names,
+                           index, self.semantics)
+
+        # 2. 2D 이미지 (거리 기반 색상)
+        viridis_map = get_colormap("viridis")
+        save_png(self.output_name("range", index),
+                 viridis_map[(range_image(frame.proj_range) * 255).astype(np.uint8)])
+
+        # 3. 2D 이미지 (semantic label 기반 색상), BGR -> RGB
+        if self.semantics:
+            save_png(self.output_name("semantic", index), frame.proj_sem_color[..., ::-1])
+
+        # 4. 3D pointcloud 스냅샷 (bird's-eye view)
+        if self.semantics:
+            colors = frame.sem_label_color[..., ::-1]
+        else:
+            colors = range_point_colors(frame.unproj_range, viridis_map)
+        save_png(self.output_name("bev", index), bev_image(frame.points, colors))
+        return index
+
+    # 전체 sequence 렌더링
+    def run(self):
+
+        # 1. 출력 폴더 생성
+        kinds = self.KINDS if self.semantics else ['range', 'bev']
+        for kind in kinds:
+            os.makedirs(os.path.join(self.out_dir, kind), exist_ok=True)
+
+        # 2. process pool로 프레임 분배
+        total = len(self.scan_names)
+        chunksize = max(1, total // (self.workers * 8))
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=_init_worker,
+                                 initargs=(self,)) as executor:
+            for done, index in enumerate(executor.map(_render_frame, range(total),
+                                                      chunksize=chunksize)):
+                if (done + 1) % 100 == 0 or done + 1 == total:
+                    print(f"렌더링 {done + 1}/{total}")
+
+        # 3. GIF 저장 (선택)
+        if self.gif:
+            for kind in kinds:
+                png_names = [self.output_name(kind, i) for i in range(total)]
+                save_gif(os.path.join(self.out_dir, kind + ".gif"), png_names)
+
+
+# worker process 상태
+_worker = {}
+
+
+## worker process에서만 matplotlib을 GUI 없는 Agg backend로 설정 (PNG 저장)
+def _init_worker(renderer):
+    import matplotlib
+    matplotlib.use("Agg")
+    _worker["renderer"] = renderer
+
+
+def _render_frame(index):
+    return _worker["renderer"].render(index)
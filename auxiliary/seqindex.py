@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+
+from auxiliary.formats import LABEL_EXTENSIONS, SCAN_EXTENSIONS, detect_extension, label_count, scan_count
+
+
+# sequence index 파일 형식 버전
+INDEX_VERSION = 3
+
+# sequence 폴더에 저장되는 index 파일 이름
+INDEX_NAME = ".seqindex.json"
+
+# 파일 형식별 point/label 크기 (byte)
+SCAN_STRIDE = 16            # [x, y, z, intensity] float32
+PREDICTION_STRIDE = 20      # [x, y, z, intensity, label] float32
+LABEL_STRIDE = 4            # uint32
+
+# 개수를 알 수 없는 파일 (형식 오류)
+BAD_COUNT = -1
+
+# 폴더 mtime이 같을 때 다시 stat해 보는 파일 수 (제자리 덮어쓰기는 폴더 mtime을 바꾸지 않음)
+SPOT_CHECK = 8
+
+
+# scan/label 파일 목록 및 크기 정보 (sequence 단위)
+## 폴더 mtime이 바뀌지 않으면 파일 목록을 다시 읽지 않고,
+## 바뀐 경우에는 새로 생겼거나 교체된 (inode가 바뀐) 파일만 stat
+## 폴더 mtime이 같아도 파일 몇 개의 크기/mtime을 확인하고, 다르면 폴더 전체를 다시 stat
+## 원본 형식은 파일 크기로, 압축/양자화 형식은 헤더 또는 압축 해제한 길이로 point/label 개수 확인 (파일마다 한 번)
+class SequenceIndex:
+
+    def __init__(self,
+                 scan_dir,
+                 label_dir=None,
+                 predictions=False,
+                 scan_ext=None,
+                 label_ext=None,
+                 index_path=None
+                ):
+        self.scan_dir = os.path.abspath(os.path.expanduser(scan_dir))
+        self.label_dir = os.path.abspath(os.path.expanduser(label_dir)) if label_dir else None
+        self.predictions = predictions
+        # 파일 확장자 (지정하지 않으면 refresh에서 폴더 안 파일로 판단, auxiliary/formats.py)
+        ## 판단한 확장자는 index에 폴더 mtime과 함께 저장 (폴더가 바뀌지 않으면 다시 목록을 읽지 않음)
+        self._scan_ext = scan_ext
+        self._label_ext = label_ext
+        self.scan_ext = scan_ext or '.bin'
+        self.label_ext = label_ext or '.label'
+        self.index_path = index_path or self._default_index_path()
+
+        # 폴더별 캐시: {"mtime": ns, "ext": 확장자, "files": {name: [bytes, mtime, inode, 개수]}}
+        ## 개수: 원본 형식은 None (파일 크기로 계산), 형식 오류는 BAD_COUNT
+        self.dirs = {}
+        self.frames = []
+        self.problems = []
+
+    # index 파일 경로 (sequence 폴더에 쓸 수 없으면 사용자 캐시 폴더)
+    def _default_index_path(self):
+        sequence_dir = os.path.dirname(self.scan_dir)
+        if os.access(sequence_dir, os.W_OK):
+            return os.path.join(sequence_dir, INDEX_NAME)
+        key = hashlib.sha1(self.scan_dir.encode()).hexdigest()[:16]
+        return os.path.join(os.path.expanduser("~/.cache/lidar-visualize"), key + ".json")
+
+    # point 하나의 크기 (byte, 원본 .bin 기준)
+    @property
+    def scan_stride(self):
+        return PREDICTION_STRIDE if self.predictions else SCAN_STRIDE
+
+    # 파일 하나의 개수 (원본 형식은 None)
+    def _count(self, filename, scan):
+        try:
+            if scan:
+                return scan_count(filename, self.scan_stride // 4)
+            return label_count(filename)
+        except (OSError, ValueError, RuntimeError):
+            return BAD_COUNT
+
+    # 저장된 index 불러오기
+    def load(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION:
+            return False
+        self.dirs = data.get("dirs", {})
+        return True
+
+    # index 저장 (임시 파일에 쓴 뒤 교체)
+    def save(self):
+        data = {"version": INDEX_VERSION, "dirs": self.dirs}
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"index 저장 실패: {e}")
+
+    # 폴더 파일 목록 갱신 (변경된 경우에만)
+    ## ext: 지정한 확장자 (None이면 폴더가 바뀌었을 때만 폴더 안 파일로 판단)
+    ## scan: scan 폴더 여부 (확장자 목록, 개수 확인 방식)
+    def _refresh_dir(self, path, ext, scan, full=False):
+        mtime = os.stat(path).st_mtime_ns
+        cached = self.dirs.get(path)
+        ## 다른 확장자로 만든 목록은 사용하지 않음
+        if cached is not None and ext is not None and cached.get("ext") != ext:
+            cached = None
+        if cached is not None and cached["mtime"] == mtime and not full:
+            if self._spot_check(path, cached["files"]):
+                return False
+            full = True
+        if ext is None:
+            ext = (detect_extension(path, SCAN_EXTENSIONS, '.bin') if scan else
+                   detect_extension(path, LABEL_EXTENSIONS, '.label'))
+            if cached is not None and cached.get("ext") != ext:
+                cached = None
+
+        old_files = {} if cached is None or full else cached["files"]
+        files = {}
+        with os.scandir(path) as it:
+            for entry in it:
+                if not entry.name.endswith(ext):
+                    continue
+                ## 이름이 같아도 rename으로 교체된 파일은 inode가 다름 (scandir의 inode는 stat 없이 사용 가능)
+                old = old_files.get(entry.name)
+                if old is not None and old[2] == entry.inode():
+                    files[entry.name] = old
+                    continue
+                st = entry.stat()
+                files[entry.name] = [st.st_size, st.st_mtime_ns, st.st_ino, self._count(entry.path, scan)]
+        self.dirs[path] = {"mtime": mtime, "ext": ext, "files": files}
+        return True
+
+    # 캐시한 파일 중 일부 (고르게 SPOT_CHECK개)의 크기/mtime이 그대로인지 확인
+    @staticmethod
+    def _spot_check(path, files):
+        names = sorted(files)
+        step = max(1, len(names) // SPOT_CHECK)
+        for name in names[::step][:SPOT_CHECK] + names[-1:]:
+            try:
+                st = os.stat(os.path.join(path, name))
+            except OSError:
+                return False
+            size, mtime = files[name][0:2]
+            if st.st_size != size or st.st_mtime_ns != mtime:
+                return False
+        return True
+
+    # index 생성/갱신
+    ## full: 이 폴더들의 모든 파일을 다시 stat (파일 내용만 바뀐 경우)
+    ## 같은 index 파일에 있는 다른 폴더의 캐시는 유지
+    def refresh(self, full=False):
+
+        # 1. 저장된 index 불러오기
+        self.load()
+
+        # 2. 폴더별 파일 목록 갱신
+        changed = self._refresh_dir(self.scan_dir, self._scan_ext, True, full)
+        self.scan_ext = self.dirs[self.scan_dir]["ext"]
+        if self.label_dir is not None:
+            changed |= self._refresh_dir(self.label_dir, self._label_ext, False, full)
+            self.label_ext = self.dirs[self.label_dir]["ext"]
+        if changed:
+            self.save()
+
+        # 3. 프레임 목록 생성 및 검증
+        self._build_frames()
+        return self
+
+    # frame id 기준으로 scan/label 짝 맞추기 및 개수 검증 (캐시한 크기/개수만 사용)
+    def _build_frames(self):
+        self.frames = []
+        self.problems = []
+
+        scan_files = self.dirs[self.scan_dir]["files"]
+        label_files = self.dirs[self.label_dir]["files"] if self.label_dir is not None else {}
+        scan_ids = {name[:-len(self.scan_ext)]: name for name in scan_files}
+        label_ids = {name[:-len(self.label_ext)]: name for name in label_files}
+        scan_stride = self.scan_stride
+
+        for frame_id in sorted(scan_ids):
+            scan_name = scan_ids[frame_id]
+            scan_bytes, scan_mtime, _, points = scan_files[scan_name]
+
+            # 1. scan point 개수 (원본 형식은 파일 크기로 계산)
+            if points is None:
+                if scan_bytes % scan_stride != 0:
+                    self.problems.append(f"{frame_id}: scan 크기 오류 ({scan_bytes} bytes)")
+                    continue
+                points = scan_bytes // scan_stride
+            elif points == BAD_COUNT:
+                self.problems.append(f"{frame_id}: scan 형식 오류")
+                continue
+
+            frame = {
+                "frame": frame_id,
+                "scan": os.path.join(self.scan_dir, scan_name),
+                "label": None,
+                "points": points,
+                "scan_bytes": scan_bytes,
+                "scan_mtime": scan_mtime,
+            }
+
+            # 2. label 짝 확인 및 point 개수 비교
+            if self.label_dir is not None:
+                label_name = label_ids.get(frame_id)
+                if label_name is None:
+                    self.problems.append(f"{frame_id}: label 파일 없음")
+                    continue
+                label_bytes, label_mtime, _, labels = label_files[label_name]
+                if labels is None:
+                    labels = label_bytes // LABEL_STRIDE if label_bytes % LABEL_STRIDE == 0 else BAD_COUNT
+                if labels == BAD_COUNT:
+                    self.problems.append(f"{frame_id}: label 형식 오류")
+                    continue
+                if labels != points:
+                    self.problems.append(f"{frame_id}: Scan과 Label의 개수가 다름 ({points} != {labels})")
+                    continue
+                frame["label"] = os.path.join(self.label_dir, label_name)
+                frame["label_bytes"] = label_bytes
+                frame["label_mtime"] = label_mtime
+
+            self.frames.append(frame)
+
+        ## scan 없이 label만 있는 프레임
+        for frame_id in sorted(set(label_ids) - set(scan_ids)):
+            self.problems.append(f"{frame_id}: scan 파일 없음")
+
+    @property
+    def scan_names(self):
+        return [frame["scan"] for frame in self.frames]
+
+    @property
+    def label_names(self):
+        if self.label_dir is None:
+            return []
+        return [frame["label"] for frame in self.frames]
+
+    def __len__(self):
+        return len(self.frames)
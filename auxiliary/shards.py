@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+import json
+import os
+
+import numpy as np
+
+
+# range image shard 형식
+## 채널마다 shard 하나당 .npy 파일 하나: [프레임 수, H, W(, 3)]
+## manifest.json: 투영 설정, 채널 정보, shard 목록, 프레임 목록
+## 버전 2: mask 채널이 point 0이 투영된 픽셀도 포함 (proj_idx >= 0)
+SHARD_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+
+# 채널 이름 -> (scan 속성, dtype, 픽셀당 shape)
+CHANNELS = {
+    "range": ("proj_range", np.float32, ()),
+    "xyz": ("proj_xyz", np.float32, (3,)),
+    "intensity": ("proj_intensity", np.float32, ()),
+    "mask": ("proj_mask", np.bool_, ()),
+    "label": ("proj_sem_label", np.uint16, ()),
+}
+
+
+# shard 파일 이름
+def shard_file(channel, index):
+    return "%s_%05d.npy" % (channel, index)
+
+
+# 프레임 목록을 shard 단위로 나누기 -> [(shard 번호, 시작 index, 프레임 수)]
+def plan_shards(total, shard_size):
+    return [(k, start, min(shard_size, total - start))
+            for k, start in enumerate(range(0, total, shard_size))]
+
+
+# shard 하나 기록 (scan 객체로 투영 후 memmap에 바로 기록)
+## frames: [(scan 파일, label 파일 또는 None)]
+def write_shard(scan, out_dir, index, frames, channels):
+    H, W = scan.proj_H, scan.proj_W
+    outputs = {}
+    for channel in channels:
+        _, dtype, shape = CHANNELS[channel]
+        outputs[channel] = np.lib.format.open_memmap(os.path.join(out_dir, shard_file(channel, index)),
+                                                     mode='w+', dtype=dtype,
+                                                     shape=(len(frames), H, W) + shape)
+    for slot, (scan_name, label_name) in enumerate(frames):
+        scan.open_scan(scan_name)
+        if label_name is not None:
+            scan.open_label(label_name)
+        for channel, output in outputs.items():
+            output[slot] = getattr(scan, CHANNELS[channel][0])
+    for output in outputs.values():
+        output.flush()
+    return index
+
+
+# manifest 저장
+def write_manifest(out_dir, scan, channels, shards, frames, extra=None):
+    manifest = {
+        "version": SHARD_VERSION,
+        "H": scan.proj_H,
+        "W": scan.proj_W,
+        "fov_up": scan.proj_fov_up,
+        "fov_down": scan.proj_fov_down,
+        "projection": scan.proj_mode,
+        "channels": {
+            channel: {"dtype": np.dtype(CHANNELS[channel][1]).name, "shape": list(CHANNELS[channel][2])}
+            for channel in channels
+        },
+        "shards": [
+            {"index": k, "start": start, "frames": count,
+             "files": {channel: shard_file(channel, k) for channel in channels}}
+            for k, start, count in shards
+        ],
+        "frames": frames,
+    }
+    if extra:
+        manifest.update(extra)
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=1)
+
+
+# shard 읽기 (np.load mmap, 복사/디코딩 없음)
+class ShardDataset:
+
+    def __init__(self, path, channels=None):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_NAME), 'r') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("version") != SHARD_VERSION:
+            raise RuntimeError(f"지원하지 않는 shard 버전: {self.manifest.get('version')}")
+        self.channels = channels or list(self.manifest["channels"])
+        self.shards = self.manifest["shards"]
+        self.starts = np.array([shard["start"] for shard in self.shards], dtype=np.int64)
+        self.total = sum(shard["frames"] for shard in self.shards)
+
+        # 열어둔 shard memmap {(shard 번호, 채널): 배열}
+        self._open = {}
+
+    # shard 하나의 채널 배열 (처음 사용할 때 memmap)
+    def shard(self, index, channel):
+        key = (index, channel)
+        if key not in self._open:
+            filename = os.path.join(self.path, self.shards[index]["files"][channel])
+            self._open[key] = np.load(filename, mmap_mode='r')
+        return self._open[key]
+
+    # 프레임 i -> {채널: [H, W(, 3)] view}
+    def __getitem__(self, index):
+        k = int(np.searchsorted(self.starts, index, side='right')) - 1
+        slot = index - self.shards[k]["start"]
+        return {channel: self.shard(k, channel)[slot] for channel in self.channels}
+
+    def __len__(self):
+        return self.total
+
+    # batch 단위 반환 {채널: [B, H, W(, 3)]}
+    ## shuffle=False: shard 안의 연속 구간을 그대로 반환 (memmap view, 복사 없음)
+    ## shuffle=True : shard 순서와 shard 안 순서를 섞음 (batch는 shard 하나 안에서 구성)
+    def batches(self, batch_size, shuffle=False, seed=None, drop_last=False):
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(self.shards)) if shuffle else range(len(self.shards))
+        for k in order:
+            count = self.shards[k]["frames"]
+            slots = rng.permutation(count) if shuffle else None
+            for start in range(0, count, batch_size):
+                end = min(start + batch_size, count)
+                if drop_last and end - start < batch_size:
+                    continue
+                if slots is None:
+                    yield {channel: self.shard(k, channel)[start:end] for channel in self.channels}
+                else:
+                    ## 정렬된 index로 읽으면 memmap 접근이 순차적
+                    index = np.sort(slots[start:end])
+                    yield {channel: self.shard(k, channel)[index] for channel in self.channels}
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+import os
+
+import numpy as np
+
+from auxiliary.laserscan import SEM_LABEL_RANGE
+from auxiliary.formats import frame_id
+
+
+# KITTI poses.txt 읽기 (한 줄에 3x4 행렬 12개 값) -> [프레임 수, 4, 4]
+def read_poses(filename):
+    values = np.loadtxt(filename, dtype=np.float64).reshape((-1, 3, 4))
+    poses = np.zeros((values.shape[0], 4, 4), dtype=np.float64)
+    poses[:, 0:3, :] = values
+    poses[:, 3, 3] = 1.0
+    return poses
+
+
+# KITTI calib.txt 읽기 ("이름: 12개 값") -> {이름: 4x4 행렬}
+def read_calib(filename):
+    calib = {}
+    with open(filename, 'r') as f:
+        for line in f:
+            if ':' not in line:
+                continue
+            key, values = line.split(':', 1)
+            values = np.array([float(v) for v in values.split()], dtype=np.float64)
+            if values.shape[0] != 12:
+                continue
+            matrix = np.eye(4, dtype=np.float64)
+            matrix[0:3, :] = values.reshape((3, 4))
+            calib[key.strip()] = matrix
+    return calib
+
+
+# sequence 폴더의 poses.txt/calib.txt -> LiDAR 좌표계 기준 pose
+## KITTI pose는 카메라 좌표계 기준이므로 Tr(LiDAR -> 카메라)로 변환: Tr^-1 * pose * Tr
+def load_lidar_poses(sequence_dir, poses_path=None):
+    poses = read_poses(poses_path or os.path.join(sequence_dir, "poses.txt"))
+    calib_path = os.path.join(sequence_dir, "calib.txt")
+    if os.path.isfile(calib_path):
+        tr = read_calib(calib_path).get("Tr")
+        if tr is not None:
+            poses = np.linalg.inv(tr) @ poses @ tr
+    return poses
+
+
+# 파일 이름 -> 프레임 번호 (pose index)
+def frame_number(name):
+    return int(frame_id(name))
+
+
+# 빈 slot 표시
+EMPTY_KEY = np.iinfo(np.int64).min
+
+# voxel 좌표 1축당 bit 수 (key = x | y | z, 각 21bit)
+KEY_BITS = 21
+KEY_OFFSET = 1 << (KEY_BITS - 1)
+KEY_MASK = (1 << KEY_BITS) - 1
+
+# class 빈도 saturation 방지 (이 값 이상이 되면 해당 voxel 빈도를 이 값 아래가 될 때까지 절반으로)
+HIST_LIMIT = 1 << 15
+
+# 처음 할당하는 hash 테이블 slot 수 (이후 누적된 voxel 수에 맞춰 2배씩 늘림)
+INITIAL_CAPACITY = 1 << 16
+
+
+# 프레임을 누적하는 voxel hash map
+## open addressing hash 테이블 (numpy 배열), 프레임 추가는 프레임 point 수에 비례
+## voxel마다 point 좌표 합, point 수, semantic class 빈도, 처음/마지막 갱신 시점 저장
+## window 사용 시 프레임별 voxel 기여분을 보관하고, 프레임이 window를 벗어나면 기여분을 빼서
+## window 안의 프레임만으로 중심 좌표/다수결 label 계산 (기여분이 모두 빠진 voxel은 제거)
+## 테이블은 작게 시작하여 누적된 voxel 수에 맞춰 늘리고, 사용 중인 slot 목록을 따로 유지 (전체 slot을 훑지 않음)
+class VoxelMap:
+
+    def __init__(self,
+                 class_keys,
+                 voxel_size=0.2,
+                 max_voxels=2000000,
+                 window=0
+                ):
+        self.voxel_size = voxel_size
+        self.max_voxels = max_voxels
+        self.window = window
+
+        # semantic label -> class index (class_keys에 없는 label은 마지막 class)
+        self.class_keys = np.array(sorted(int(key) for key in class_keys), dtype=np.uint32)
+        self.num_classes = self.class_keys.shape[0] + 1
+        self.class_lut = np.full(SEM_LABEL_RANGE, self.num_classes - 1, dtype=np.int32)
+        self.class_lut[self.class_keys] = np.arange(self.class_keys.shape[0])
+
+        # hash 테이블 (load factor 0.5 이하 유지)
+        self._allocate(INITIAL_CAPACITY)
+
+        # 추가된 프레임 및 추가 순서 (sliding window 기준)
+        self.tick = 0
+        self.frames = {}
+        ## window 사용 시 추가 순서별 프레임 기여분 {tick: (key, point 수, 좌표 합, (voxel, class) 쌍, 빈도)}
+        self._contributions = {}
+
+    # 테이블 할당
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.keys = np.full(capacity, EMPTY_KEY, dtype=np.int64)
+        self.xyz_sum = np.zeros((capacity, 3), dtype=np.float64)
+        self.count = np.zeros(capacity, dtype=np.int32)
+        self.hist = np.zeros((capacity, self.num_classes), dtype=np.uint16)
+        self.last_seen = np.zeros(capacity, dtype=np.int64)
+        self.first_seen = np.zeros(capacity, dtype=np.int64)
+        ## 사용 중인 slot 목록 (앞의 size개만 유효, load factor 0.5 이하이므로 capacity / 2 크기)
+        self._occupied = np.zeros(capacity // 2, dtype=np.int64)
+        self.size = 0
+
+    # 사용 중인 slot
+    @property
+    def occupied(self):
+        return self._occupied[:self.size]
+
+    # 남은 voxel로 테이블 재구성 (capacity 변경 가능)
+    def _rebuild(self, survivors, capacity):
+        keys = self.keys[survivors]
+        xyz_sum = self.xyz_sum[survivors]
+        count = self.count[survivors]
+        hist = self.hist[survivors]
+        last_seen = self.last_seen[survivors]
+        first_seen = self.first_seen[survivors]
+        self._allocate(capacity)
+        slots, _ = self._lookup_or_insert(keys)
+        self.xyz_sum[slots] = xyz_sum
+        self.count[slots] = count
+        self.hist[slots] = hist
+        self.last_seen[slots] = last_seen
+        self.first_seen[slots] = first_seen
+        self._occupied[:slots.shape[0]] = slots
+        self.size = slots.shape[0]
+
+    # voxel이 extra개 더 들어와도 load factor 0.5 이하가 되도록 테이블 확장
+    def _reserve(self, extra):
+        capacity = self.capacity
+        while 2 * (self.size + extra) > capacity:
+            capacity *= 2
+        if capacity != self.capacity:
+            self._rebuild(self.occupied.copy(), capacity)
+
+    # world 좌표 -> voxel key (int64)
+    def voxel_keys(self, points):
+        grid = np.floor(points / self.voxel_size).astype(np.int64) + KEY_OFFSET
+        grid &= KEY_MASK
+        return (grid[:, 0] << (2 * KEY_BITS)) | (grid[:, 1] << KEY_BITS) | grid[:, 2]
+
+    # key -> hash slot 시작 위치 (Fibonacci hashing: 곱셈 결과의 상위 bit 사용)
+    def _hash(self, keys):
+        bits = np.uint64(64 - int(np.log2(self.capacity)))
+        mixed = keys.view(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        return (mixed >> bits).astype(np.int64)
+
+    # key별 slot 찾기 (없으면 새로 할당) -> (slot, 새로 할당했는지)
+    ## 충돌 시 다음 slot 확인 (linear probing), 같은 slot을 동시에 차지하려는 key는 하나만 기록
+    def _lookup_or_insert(self, keys):
+        slots = self._hash(keys)
+        inserted = np.zeros(keys.shape[0], dtype=bool)
+        pending = np.arange(keys.shape[0])
+        while pending.shape[0] > 0:
+            current = self.keys[slots[pending]]
+            ## 빈 slot이면 key 기록 시도 (여러 key가 같은 slot에 쓰면 하나만 남음)
+            empty = current == EMPTY_KEY
+            if empty.any():
+                claim = pending[empty]
+                self.keys[slots[claim]] = keys[claim]
+                inserted[claim[self.keys[slots[claim]] == keys[claim]]] = True
+                current = self.keys[slots[pending]]
+            ## key가 일치하면 완료, 아니면 다음 slot
+            found = current == keys[pending]
+            pending = pending[~found]
+            slots[pending] = (slots[pending] + 1) & (self.capacity - 1)
+        return slots, inserted
+
+    # key별 slot 찾기 (없으면 -1, 테이블 변경 없음)
+    def _find(self, keys):
+        slots = self._hash(keys)
+        result = np.full(keys.shape[0], -1, dtype=np.int64)
+        pending = np.arange(keys.shape[0])
+        while pending.shape[0] > 0:
+            current = self.keys[slots[pending]]
+            found = current == keys[pending]
+            result[pending[found]] = slots[pending[found]]
+            pending = pending[~found & (current != EMPTY_KEY)]
+            slots[pending] = (slots[pending] + 1) & (self.capacity - 1)
+        return result
+
+    # 프레임 추가
+    ## points: world 좌표 [N, 3], labels: semantic label [N], frame: 프레임 번호
+    def add_frame(self, points, labels, frame):
+        if frame in self.frames:
+            return False
+        self.tick += 1
+        self.frames[frame] = self.tick
+
+        # 1. 프레임 안에서 voxel별로 묶기
+        keys = self.voxel_keys(points)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        num_voxels = unique_keys.shape[0]
+        classes = self.class_lut[labels & 0xFFFF]
+
+        counts = np.bincount(inverse, minlength=num_voxels)
+        xyz_sum = np.stack([np.bincount(inverse, points[:, i], minlength=num_voxels)
+                            for i in range(3)], axis=1)
+        hist = np.bincount(inverse * self.num_classes + classes,
+                           minlength=num_voxels * self.num_classes).reshape((num_voxels, self.num_classes))
+
+        # 2. voxel slot 찾기 (없으면 새로 할당) 및 누적
+        self._reserve(num_voxels)
+        slots, inserted = self._lookup_or_insert(unique_keys)
+        new = slots[inserted]
+        self._occupied[self.size:self.size + new.shape[0]] = new
+        self.size += new.shape[0]
+        self.first_seen[new] = self.tick
+        self.xyz_sum[slots] += xyz_sum
+        self.count[slots] += counts.astype(np.int32)
+        self.last_seen[slots] = self.tick
+
+        ## class 빈도 누적 (uint16 넘침 방지: 넓은 type으로 더한 뒤 HIST_LIMIT 아래가 될 때까지 절반으로)
+        total = self.hist[slots].astype(np.int64) + hist
+        saturated = np.flatnonzero(total.max(axis=1) >= HIST_LIMIT)
+        while saturated.shape[0] > 0:
+            total[saturated] >>= 1
+            saturated = saturated[total[saturated].max(axis=1) >= HIST_LIMIT]
+        self.hist[slots] = total.astype(np.uint16)
+
+        # 3. sliding window: 이 프레임의 기여분 보관, window를 벗어난 프레임의 기여분 제거
+        if self.window > 0:
+            pairs = np.flatnonzero(hist)
+            self._contributions[self.tick] = (unique_keys, counts.astype(np.int32), xyz_sum,
+                                              pairs, hist.reshape(-1)[pairs])
+            self._expire()
+
+        # 4. 크기 제한 / 빈 voxel 정리 (window 확인은 window/10 프레임마다)
+        check_window = self.window > 0 and self.tick % max(1, self.window // 10) == 0
+        if self.size > self.max_voxels or check_window:
+            self._evict()
+        return True
+
+    # window를 벗어난 프레임의 기여분 빼기
+    ## 기여분을 넣은 뒤 크기 제한으로 제거되었다가 다시 생긴 voxel (first_seen이 더 늦음)은 제외
+    ## 빈도는 saturation으로 절반이 된 경우가 있으므로 0 아래로 내려가지 않게 제한
+    def _expire(self):
+        limit = self.tick - self.window
+        for tick in [tick for tick in self._contributions if tick <= limit]:
+            keys, counts, xyz_sum, pairs, values = self._contributions.pop(tick)
+            slots = self._find(keys)
+            valid = slots >= 0
+            valid[valid] = self.first_seen[slots[valid]] <= tick
+            self.count[slots[valid]] -= counts[valid]
+            self.xyz_sum[slots[valid]] -= xyz_sum[valid]
+            voxel, cls = np.divmod(pairs, self.num_classes)
+            keep = valid[voxel]
+            rows = slots[voxel[keep]]
+            cls = cls[keep]
+            remain = self.hist[rows, cls].astype(np.int64) - values[keep]
+            self.hist[rows, cls] = np.maximum(remain, 0).astype(np.uint16)
+        self.frames = {f: t for f, t in self.frames.items() if t > limit}
+
+    # 오래된 voxel 제거 후 테이블 재구성 (제거가 필요할 때만, 남은 voxel 수에 비례)
+    def _evict(self):
+        occupied = self.occupied
+        keep = np.ones(occupied.shape[0], dtype=bool)
+
+        # 1. sliding window 밖의 voxel (기여분이 모두 빠진 voxel) 제거
+        if self.window > 0:
+            keep &= (self.count[occupied] > 0) & (self.last_seen[occupied] > self.tick - self.window)
+
+        # 2. 최대 개수를 넘으면 오래된 voxel부터 제거 (90%까지)
+        if np.count_nonzero(keep) > self.max_voxels:
+            target = int(self.max_voxels * 0.9)
+            seen = self.last_seen[occupied]
+            cutoff = np.partition(seen[keep], -target)[-target]
+            keep &= seen >= cutoff
+
+        if keep.all():
+            return
+
+        # 3. 남은 voxel로 테이블 재구성
+        self._rebuild(occupied[keep], self.capacity)
+
+    # 표시용 voxel 정보: 중심 좌표 (point 평균), 다수결 semantic label
+    ## 다음 정리 전까지 테이블에 남아 있는 빈 voxel (window를 벗어난 voxel)은 제외
+    def voxels(self):
+        occupied = self.occupied
+        if self.window > 0:
+            occupied = occupied[self.count[occupied] > 0]
+        centers = (self.xyz_sum[occupied] / self.count[occupied, None]).astype(np.float32)
+        majority = np.argmax(self.hist[occupied], axis=1)
+        ## 마지막 class (정의되지 않은 label)는 0으로 표시
+        labels = np.zeros(occupied.shape[0], dtype=np.uint32)
+        known = majority < self.class_keys.shape[0]
+        labels[known] = self.class_keys[majority[known]]
+        return centers, labels
+
+    def __len__(self):
+        return self.size
+
+
+# LiDAR 좌표 -> world 좌표
+def transform_points(points, pose):
+    return points @ pose[0:3, 0:3].T.astype(np.float32) + pose[0:3, 3].astype(np.float32)
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+# This file is covered by the LICENSE file in the root of this project.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import yaml
+from auxiliary.laserscan import SemLaserScan
+from auxiliary.render import display_colors, get_colormap, range_point_colors, range_image
+from auxiliary.frame import load_frame
+from auxiliary.postproc import KNNPostProcess
+from auxiliary.formats import read_scan, write_scan
+
+# 벤치마크 센서 구성 (synthetic scan)
+## points: point 개수, H/W/fov: 2D 투영 설정
+SENSORS = {
+    "kitti": {"points": 120000, "H": 64, "W": 1024, "fov_up": 3.0, "fov_down": -25.0},
+    "ouster128": {"points": 260000, "H": 128, "W": 2048, "fov_up": 22.5, "fov_down": -22.5},
+    "school": {"points": 32 * 1024, "H": 32, "W": 1024, "fov_up": 23.0, "fov_down": -23.0},
+    "mldas": {"points": 64 * 1024, "H": 64, "W": 1024, "fov_up": 23.0, "fov_down": -23.0},
+}
+
+
+# synthetic scan 생성 (센서 시야각 안에 고르게 분포, 거리 2 ~ 80m)
+def make_scan(num_points, fov_up, fov_down, label_keys, seed=0):
+    rng = np.random.default_rng(seed)
+    yaw = rng.uniform(-np.pi, np.pi, num_points)
+    pitch = np.radians(rng.uniform(fov_down, fov_up, num_points))
+    depth = rng.uniform(2.0, 80.0, num_points)
+    scan = np.empty((num_points, 4), dtype=np.float32)
+    scan[:, 0] = depth * np.cos(pitch) * np.cos(yaw)
+    scan[:, 1] = depth * np.cos(pitch) * np.sin(yaw)
+    scan[:, 2] = depth * np.sin(pitch)
+    scan[:, 3] = rng.uniform(0.0, 1.0, num_points)
+    sem = rng.choice(label_keys, num_points).astype(np.uint32)
+    inst = rng.integers(0, 50, num_points).astype(np.uint32)
+    return scan, sem | (inst << 16)
+
+
+# synthetic organized scan 생성 (센서 발사 순서, 행 우선 H x W개, 픽셀 중심 방향)
+## spherical 투영과 organized 투영 결과가 같아야 함
+def make_organized_scan(H, W, fov_up, fov_down, seed=0):
+    rng = np.random.default_rng(seed)
+    fov = np.radians(abs(fov_down) + abs(fov_up))
+    rows, cols = np.divmod(np.arange(H * W), W)
+    yaw = -((cols + 0.5) / W * 2.0 - 1.0) * np.pi
+    pitch = (1.0 - (rows + 0.5) / H) * fov - np.radians(abs(fov_down))
+    depth = rng.uniform(2.0, 80.0, H * W)
+    scan = np.empty((H * W, 4), dtype=np.float32)
+    scan[:, 0] = depth * np.cos(pitch) * np.cos(yaw)
+    scan[:, 1] = depth * np.cos(pitch) * np.sin(yaw)
+    scan[:, 2] = depth * np.sin(pitch)
+    scan[:, 3] = rng.uniform(0.0, 1.0, H * W)
+    return scan
+
+
+# 시작 시간 측정용 child process 코드 (visualize.py와 같은 순서로 첫 프레임까지 처리, 창 생성 제외)
+## 출력: import 시간, 첫 프레임까지 시간, matplotlib 사용 여부, 최대 RSS
+STARTUP_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+args = json.loads(sys.argv[1])
+import yaml
+from auxiliary.laserscan import SemLaserScan
+from auxiliary.frame import load_frame
+from auxiliary.postproc import KNNPostProcess
+from auxiliary.render import range_point_colors, range_image
+from auxiliary.colormaps import get_colormap
+try:
+    import auxiliary.laserscanvis
+except ImportError:
+    pass
+imported = time.perf_counter()
+cfg = yaml.safe_load(open(args["config"], 'r'))
+if "color_map" not in cfg:
+    cfg = cfg["kitti"]
+sensor = args["sensor"]
+scan = SemLaserScan(cfg["color_map"], project=True, H=sensor["H"], W=sensor["W"],
+                    fov_up=sensor["fov_up"], fov_down=sensor["fov_down"])
+frame = load_frame(scan, [args["scan"]], [args["label"]], 0)
+range_point_colors(frame.unproj_range, get_colormap("viridis"))
+range_image(frame.proj_range)
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000.0,
+    "first_frame_ms": (done - start) * 1000.0,
+    "matplotlib": "matplotlib" in sys.modules,
+    "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+}))
+"""
+
+
+# 투영 backend 결과 비교 (sort와 zbuffer가 bit 단위로 같아야 함)
+## 같은 좌표의 point를 intensity만 바꿔 앞뒤에 추가하여 거리가 같은 point가 겹치는 픽셀까지 비교
+## (거리가 같으면 index가 작은 point 선택)
+def check_projection_backends(create, points, intensity):
+    duplicate = slice(None, None, 7)
+    points = np.concatenate([points[duplicate], points, points[duplicate]])
+    intensity = np.concatenate([1.0 - intensity[duplicate], intensity, 0.5 * intensity[duplicate]])
+
+    projected = {}
+    for backend in SemLaserScan.PROJ_BACKENDS:
+        scan = create(project=False, backend=backend)
+        scan.set_points(points, intensity)
+        scan.do_range_projection()
+        projected[backend] = scan
+
+    ## 겹치는 픽셀이 있어야 비교 의미가 있음
+    pixel = projected["sort"].proj_y.astype(np.int64) * projected["sort"].proj_W + projected["sort"].proj_x
+    assert np.unique(pixel).shape[0] < pixel.shape[0], "겹치는 픽셀이 없음"
+    for field in ("proj_range", "proj_xyz", "proj_intensity", "proj_idx", "proj_mask"):
+        assert np.array_equal(getattr(projected["sort"], field), getattr(projected["zbuffer"], field)), \
+            f"투영 backend 결과 불일치: {field}"
+
+
+# 함수 반복 실행 시간 및 최대 메모리 측정
+def measure(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    ## 최대 메모리는 한 번 더 실행하여 측정 (tracemalloc은 실행 시간에 영향)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_ms": float(np.median(times) * 1000.0),
+        "min_ms": float(np.min(times) * 1000.0),
+        "peak_bytes": int(peak),
+    }
+
+
+# 시작 시간 측정 (time-to-first-frame)
+## 새 python process 실행부터 첫 프레임 처리 완료까지의 시간 (interpreter 시작, import 포함)
+def measure_startup(sensor, config, scan_file, label_file, repeat):
+    args = json.dumps({"sensor": sensor, "config": os.path.abspath(config),
+                       "scan": scan_file, "label": label_file})
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, args],
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                check=True, capture_output=True, text=True).stdout
+        times.append(time.perf_counter() - start)
+        child = json.loads(output.strip().splitlines()[-1])
+    return {
+        "median_ms": float(np.median(times) * 1000.0),
+        "min_ms": float(np.min(times) * 1000.0),
+        "peak_bytes": int(child["max_rss_bytes"]),
+        "import_ms": float(child["import_ms"]),
+        "matplotlib_imported": bool(child["matplotlib"]),
+    }
+
+
+# 프레임 스냅샷 하나가 유지하는 메모리 (byte, prefetch cache에 쌓이는 크기)
+## 여러 프레임을 읽어서 유지하고 tracemalloc으로 증가량 측정
+## colors=True: 색상 배열까지 생성한 뒤의 크기
+def measure_frame_bytes(scan, scan_file, label_file, count=5):
+    load_frame(scan, [scan_file], [label_file], 0)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    frames = [load_frame(scan, [scan_file], [label_file], 0) for _ in range(count)]
+    held = tracemalloc.get_traced_memory()[0] - base
+    for frame in frames:
+        frame.sem_label_color, frame.inst_label_color, frame.proj_sem_color, frame.proj_inst_color
+    colored = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return {"frame_bytes": int(held / count), "frame_bytes_colored": int(colored / count),
+            "frame_nbytes": int(frames[0].nbytes)}
+
+
+# 센서 하나에 대한 벤치마크
+def run_sensor(name, sensor, cfg, repeat, tmp_dir, config=None, startup_repeat=0):
+    color_dict = cfg["color_map"]
+    label_map = cfg.get("label_map", {})
+    label_keys = np.array([int(key) for key in color_dict], dtype=np.uint32)
+    scan_data, label_data = make_scan(sensor["points"], sensor["fov_up"], sensor["fov_down"], label_keys)
+    num_points = scan_data.shape[0]
+
+    # 1. 입력 파일 저장
+    scan_file = os.path.join(tmp_dir, name + ".bin")
+    label_file = os.path.join(tmp_dir, name + ".label")
+    scan_data.tofile(scan_file)
+    label_data.tofile(label_file)
+
+    def create(project, backend='zbuffer', mode='spherical'):
+        return SemLaserScan(color_dict, project=project, H=sensor["H"], W=sensor["W"],
+                            fov_up=sensor["fov_up"], fov_down=sensor["fov_down"],
+                            proj_backend=backend, proj_mode=mode)
+
+    results = {}
+    points = scan_data[:, 0:3]
+    intensity = scan_data[:, 3]
+
+    # 2. 파일 읽기 / point 설정 (투영 제외)
+    plain = create(project=False)
+    results["open_scan"] = measure(lambda: plain.open_scan(scan_file), repeat)
+    results["set_points"] = measure(lambda: plain.set_points(points, intensity), repeat)
+
+    ## 압축/양자화 형식 읽기 (파일 크기 함께 기록, cold cache에서는 크기에 비례하여 I/O 감소)
+    for ext in ('.bin', '.q16', '.f16', '.q16.zlib'):
+        format_file = os.path.join(tmp_dir, name + ext)
+        write_scan(format_file, scan_data)
+        results["read_scan[%s]" % ext] = measure(lambda: read_scan(format_file), repeat)
+        results["read_scan[%s]" % ext]["file_bytes"] = os.path.getsize(format_file)
+    results["open_scan"]["file_bytes"] = os.path.getsize(scan_file)
+
+    # 3. 2D 투영 (backend별) 및 결과 비교
+    projected = {}
+    for backend in SemLaserScan.PROJ_BACKENDS:
+        scan = create(project=False, backend=backend)
+        scan.set_points(points, intensity)
+        results["do_range_projection[%s]" % backend] = measure(scan.do_range_projection, repeat)
+        projected[backend] = scan
+    try:
+        check_projection_backends(create, points, intensity)
+        equal = True
+    except AssertionError as e:
+        print(f"[{name}] {e}")
+        equal = False
+
+    ## organized scan (H x W개): spherical 투영과 point 순서 투영 비교
+    organized = make_organized_scan(sensor["H"], sensor["W"], sensor["fov_up"], sensor["fov_down"])
+    for mode in SemLaserScan.PROJ_MODES:
+        scan = create(project=False, mode=mode)
+        scan.set_points(organized[:, 0:3], organized[:, 3])
+        results["organized_projection[%s]" % mode] = measure(scan.do_range_projection, repeat)
+        projected[mode] = scan
+    organized_equal = all(np.array_equal(getattr(projected["spherical"], field),
+                                         getattr(projected["organized"], field))
+                          for field in ("proj_range", "proj_xyz", "proj_intensity", "proj_idx"))
+
+    # 4. label 설정 (mapping 유무), label 투영, 색상 할당
+    scan = create(project=False)
+    scan.set_points(points, intensity)
+    results["set_label"] = measure(lambda: scan.set_label(label_data), repeat)
+    if label_map:
+        scan.set_mapping(True)
+        scan.set_label_map(label_map)
+        results["set_label[mapping]"] = measure(lambda: scan.set_label(label_data), repeat)
+        scan.set_mapping(False)
+
+    scan = create(project=True)
+    scan.open_scan(scan_file)
+    scan.open_label(label_file)
+    results["do_label_projection"] = measure(scan.do_label_projection, repeat)
+    results["colorize"] = measure(scan.colorize, repeat)
+    ## range image KNN label 후처리 (--knn)
+    knn = KNNPostProcess()
+    results["knn_postprocess"] = measure(lambda: knn.apply(scan, scan.sem_label), repeat)
+
+    # 5. LaserScanVis.update_scan의 CPU 처리 (set_data 업로드 제외)
+    colormap = get_colormap("viridis")
+
+    def update_scan_cpu():
+        frame = load_frame(scan, [scan_file], [label_file], 0)
+        range_point_colors(frame.unproj_range, colormap)
+        range_image(frame.proj_range)
+        display_colors(frame.sem_label_color)
+        display_colors(frame.proj_sem_color)
+
+    results["update_scan_cpu"] = measure(update_scan_cpu, repeat)
+    results["load_frame"] = measure(lambda: load_frame(scan, [scan_file], [label_file], 0), repeat)
+    results["load_frame"].update(measure_frame_bytes(scan, scan_file, label_file))
+
+    # 6. 시작 시간 (새 process에서 첫 프레임까지)
+    if config and startup_repeat > 0:
+        results["time_to_first_frame"] = measure_startup(sensor, config, scan_file, label_file, startup_repeat)
+
+    # 7. 처리량 계산
+    for result in results.values():
+        seconds = result["median_ms"] / 1000.0
+        result["frames_per_s"] = 1.0 / seconds if seconds > 0 else float("inf")
+        result["points_per_s"] = num_points / seconds if seconds > 0 else float("inf")
+
+    return {
+        "points": num_points,
+        "H": sensor["H"],
+        "W": sensor["W"],
+        "projection_backends_equal": bool(equal),
+        "organized_projection_equal": bool(organized_equal),
+        "results": results,
+    }
+
+
+# 이전 결과와 비교 (median 기준)
+def compare(current, baseline, threshold):
+    regressions = []
+    print("%-12s %-28s %10s %10s %8s" % ("sensor", "benchmark", "before", "after", "ratio"))
+    for sensor, data in current["sensors"].items():
+        before_sensor = baseline["sensors"].get(sensor)
+        if before_sensor is None:
+            continue
+        for bench, result in data["results"].items():
+            before = before_sensor["results"].get(bench)
+            if before is None:
+                continue
+            ratio = result["median_ms"] / before["median_ms"]
+            mark = ""
+            if ratio > 1.0 + threshold:
+                mark = " <- regression"
+                regressions.append((sensor, bench, ratio))
+            print("%-12s %-28s %8.2fms %8.2fms %7.2fx%s" % (sensor, bench, before["median_ms"],
+                                                              result["median_ms"], ratio, mark))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("./benchmark.py")
+    parser.add_argument(
+        '--config', '-c',
+        type=str,
+        required=False,
+        default="config/absolutely-config.yaml",
+        help='color_map/label_map 설정 파일 (absolutely-config.yaml은 kitti 항목 사용)',
+    )
+    parser.add_argument(
+        '--sensors', '-s',
+        type=str,
+        nargs='+',
+        default=list(SENSORS),
+        choices=list(SENSORS),
+        help='벤치마크할 센서 구성',
+    )
+    parser.add_argument(
+        '--repeat', '-r',
+        type=int,
+        default=10,
+        help='반복 횟수',
+    )
+    parser.add_argument(
+        '--out', '-o',
+        type=str,
+        default="",
+        help='결과 JSON 저장 경로',
+    )
+    parser.add_argument(
+        '--compare',
+        type=str,
+        default="",
+        help='비교할 이전 결과 JSON',
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        help='regression 판단 기준 (median 증가 비율)',
+    )
+    parser.add_argument(
+        '--startup-repeat', '--startup_repeat',
+        type=int,
+        dest='startup_repeat',
+        default=5,
+        help='시작 시간(time-to-first-frame) 측정 횟수 (0: 측정 안 함)',
+    )
+    FLAGS, unparsed = parser.parse_known_args()
+
+    # 설정 파일 열기
+    try:
+        CFG = yaml.safe_load(open(FLAGS.config, 'r'))
+    except Exception as e:
+        print(e)
+        print("YAML 파일 오류")
+        quit()
+    if "color_map" not in CFG:
+        CFG = CFG["kitti"]
+
+    # 벤치마크 실행
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "repeat": FLAGS.repeat,
+        "sensors": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in FLAGS.sensors:
+            data = run_sensor(name, SENSORS[name], CFG, FLAGS.repeat, tmp_dir,
+                              config=FLAGS.config, startup_repeat=FLAGS.startup_repeat)
+            report["sensors"][name] = data
+            print(f"[{name}] {data['points']} points, {data['H']}x{data['W']}, "
+                  f"projection backends equal: {data['projection_backends_equal']}, "
+                  f"organized equal: {data['organized_projection_equal']}")
+            for bench, result in data["results"].items():
+                print("  %-28s %8.2fms  %8.1f frames/s  %6.1f Mpoints/s  peak %6.1fMB" % (
+                    bench, result["median_ms"], result["frames_per_s"],
+                    result["points_per_s"] / 1e6, result["peak_bytes"] / 1e6))
+            frame_bytes = data["results"]["load_frame"]
+            print("  frame snapshot %.2fMB (색상 생성 후 %.2fMB)" % (
+                frame_bytes["frame_bytes"] / 1e6, frame_bytes["frame_bytes_colored"] / 1e6))
+
+    # 결과 저장
+    if FLAGS.out:
+        with open(FLAGS.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"결과 저장: {FLAGS.out}")
+
+    # 이전 결과와 비교
+    if FLAGS.compare:
+        with open(FLAGS.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, FLAGS.threshold)
+        if regressions:
+            print(f"regression {len(regressions)}개")
+            sys.exit(1)
+
+    # 투영 결과가 다르면 실패로 종료
+    failures = [name for name, data in report["sensors"].items()
+                if not (data["projection_backends_equal"] and data["organized_projection_equal"])]
+    if failures:
+        print(f"투영 결과 불일치: {', '.join(failures)}")
+        sys.exit(1)
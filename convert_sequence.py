@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# This file is covered by the LICENSE file in the root of this project.
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import yaml
+from auxiliary.formats import COMPRESSORS, LABEL_FORMATS, SCAN_FORMATS, UNCOMPRESSED_ONLY, \
+    read_label, read_scan, split_extension, write_label, write_scan
+from auxiliary.seqindex import SequenceIndex
+
+
+# page cache에서 파일 제거 (cold cache 읽기 시간 측정용)
+## 지원하지 않는 환경이면 False (측정값은 warm cache 기준)
+def drop_cache(filename):
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    fd = os.open(filename, os.O_RDONLY)
+    try:
+        os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+# 읽기 시간 (ms)
+def timed_read(filename, columns):
+    start = time.perf_counter()
+    scan = read_scan(filename, columns)
+    return scan, (time.perf_counter() - start) * 1000.0
+
+
+# 프레임 하나 변환 및 검증
+## 변환한 파일을 다시 읽어 원본과 비교 (열별 최대 오차, label 일치 여부)
+## 읽기 시간: 원본/변환 파일 모두 page cache를 비운 뒤 (cold) 한 번, 다시 한 번 (warm) 측정
+def convert_frame(job):
+    scan_in, label_in, scan_out, label_out, columns, scale = job
+    result = {"scan": os.path.basename(scan_in), "ok": True, "messages": []}
+
+    # 1. scan 변환
+    result["cold"] = drop_cache(scan_in)
+    scan, result["read_cold_ms"] = timed_read(scan_in, columns)
+    _, result["read_ms"] = timed_read(scan_in, columns)
+    bound = write_scan(scan_out, scan, scale=scale)
+
+    result["cold"] &= drop_cache(scan_out)
+    decoded, result["decode_cold_ms"] = timed_read(scan_out, columns)
+    _, result["decode_ms"] = timed_read(scan_out, columns)
+    result["bytes_in"] = os.path.getsize(scan_in)
+    result["bytes_out"] = os.path.getsize(scan_out)
+
+    ## 오차 확인 (float 반올림 여유 포함)
+    if decoded.shape != scan.shape:
+        result["ok"] = False
+        result["messages"].append(f"point 개수 다름 ({decoded.shape[0]} != {scan.shape[0]})")
+        return result
+    error = np.abs(decoded.astype(np.float64) - scan).max(axis=0) if scan.shape[0] else np.zeros(columns)
+    result["error"] = error.tolist()
+    if np.any(error > bound * (1 + 1e-5) + 1e-6):
+        result["ok"] = False
+        result["messages"].append(f"오차 범위 초과 (오차 {error.tolist()}, 허용 {bound.tolist()})")
+
+    # 2. label 변환
+    if label_in is not None:
+        label = read_label(label_in)
+        write_label(label_out, label)
+        decoded = read_label(label_out)
+        result["bytes_in"] += os.path.getsize(label_in)
+        result["bytes_out"] += os.path.getsize(label_out)
+        if split_extension(label_out, LABEL_FORMATS)[0] == '.label16':
+            ## semantic label만 저장하는 형식: instance 정보 손실 확인
+            expected = label & 0xFFFF
+            if np.any(label >> 16):
+                result["messages"].append("instance label 제외됨")
+        else:
+            expected = label
+        if not np.array_equal(decoded, expected):
+            result["ok"] = False
+            result["messages"].append("label 불일치")
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("./convert_sequence.py")
+    parser.add_argument(
+        '--dataset', '-d',
+        type=str,
+        required=True,
+        help='변환할 sequence 경로',
+    )
+    parser.add_argument(
+        '--config', '-c',
+        type=str,
+        required=False,
+        default="config/semantic-kitti.yaml",
+        help='데이터셋 설정 파일',
+    )
+    parser.add_argument(
+        '--predictions',
+        dest='predictions',
+        default=False,
+        required=False,
+        action='store_true',
+        help='[x, y, z, intensity, label] 형태의 데이터 사용'
+    )
+    parser.add_argument(
+        '--ignore-label', '-i',
+        dest='ignore_label',
+        default=False,
+        action='store_true',
+        help='Label 데이터 없이, LiDAR 데이터만 변환',
+    )
+    parser.add_argument(
+        '--format', '-f',
+        type=str,
+        dest='format',
+        default="q16",
+        choices=[ext[1:] for ext in SCAN_FORMATS],
+        help='scan 형식 (bin: float32, npz: 무손실 압축, f16: float16, q16: int16 고정소수점)',
+    )
+    parser.add_argument(
+        '--label-format',
+        type=str,
+        dest='label_format',
+        default="label",
+        choices=[ext[1:] for ext in LABEL_FORMATS],
+        help='label 형식 (label: uint32, label16: uint16 semantic label만)',
+    )
+    parser.add_argument(
+        '--compress',
+        type=str,
+        dest='compress',
+        default="none",
+        choices=["none"] + [ext[1:] for ext in COMPRESSORS],
+        help='블록 압축 (기본값: none, zst: zstandard, lz4: lz4 패키지 필요, '
+             'zlib은 해제가 느려 원본보다 늦게 읽힐 수 있음)',
+    )
+    parser.add_argument(
+        '--scale',
+        type=float,
+        dest='scale',
+        default=0.005,
+        help='q16 형식 xyz 단위 (m), 최대 오차는 단위의 절반',
+    )
+    parser.add_argument(
+        '--out', '-o',
+        type=str,
+        dest='out',
+        required=True,
+        help='출력 sequence 경로',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        dest='workers',
+        default=None,
+        required=False,
+        help='worker process 개수 (기본값: CPU 개수)'
+    )
+    FLAGS, unparsed = parser.parse_known_args()
+
+    # 설정 파일 열기
+    try:
+        print("설정 파일: %s" % FLAGS.config)
+        CFG = yaml.safe_load(open(FLAGS.config, 'r'))
+    except Exception as e:
+        print(e)
+        print("YAML 파일 오류")
+        quit()
+
+    # 폴더 확인
+    scan_folder = "predictions" if FLAGS.predictions else CFG["lidar"]["manufacturer"]
+    scan_paths = os.path.join(FLAGS.dataset, scan_folder)
+    label_paths = None
+    if not FLAGS.predictions and not FLAGS.ignore_label:
+        label_paths = os.path.join(FLAGS.dataset, "labels")
+    for path in (scan_paths, label_paths):
+        if path is not None and not os.path.isdir(path):
+            print(f"{path} 존재하지 않습니다! 종료 중...")
+            quit()
+
+    # 파일 목록 및 검증
+    index = SequenceIndex(scan_paths, label_paths, predictions=FLAGS.predictions).refresh()
+    if index.problems:
+        print(f"사용할 수 없는 프레임 {len(index.problems)}개 (제외하고 진행):")
+        for problem in index.problems:
+            print("\t" + problem)
+
+    # 출력 확장자 및 폴더
+    compression = "" if FLAGS.compress == "none" else "." + FLAGS.compress
+    scan_ext = "." + FLAGS.format
+    if compression and scan_ext in UNCOMPRESSED_ONLY:
+        print(f"{scan_ext} 형식은 이미 압축되어 있어 --compress를 사용하지 않습니다")
+        scan_ext_out = scan_ext
+    else:
+        scan_ext_out = scan_ext + compression
+    label_ext_out = "." + FLAGS.label_format + compression
+    scan_out_dir = os.path.join(FLAGS.out, scan_folder)
+    label_out_dir = os.path.join(FLAGS.out, "labels")
+    os.makedirs(scan_out_dir, exist_ok=True)
+    if label_paths is not None:
+        os.makedirs(label_out_dir, exist_ok=True)
+
+    ## pose/calib 파일은 그대로 복사
+    for name in ("poses.txt", "calib.txt"):
+        if os.path.isfile(os.path.join(FLAGS.dataset, name)):
+            shutil.copy(os.path.join(FLAGS.dataset, name), os.path.join(FLAGS.out, name))
+
+    # 변환 작업 목록
+    columns = 5 if FLAGS.predictions else 4
+    jobs = []
+    for frame in index.frames:
+        jobs.append((frame["scan"],
+                     frame["label"],
+                     os.path.join(scan_out_dir, frame["frame"] + scan_ext_out),
+                     os.path.join(label_out_dir, frame["frame"] + label_ext_out) if frame["label"] else None,
+                     columns,
+                     FLAGS.scale))
+
+    # 변환 및 검증 (process pool)
+    start = time.time()
+    bytes_in = 0
+    bytes_out = 0
+    read_ms = 0.0
+    decode_ms = 0.0
+    read_cold_ms = 0.0
+    decode_cold_ms = 0.0
+    cold = True
+    max_error = np.zeros(columns)
+    failed = 0
+    with ProcessPoolExecutor(max_workers=FLAGS.workers) as executor:
+        for done, result in enumerate(executor.map(convert_frame, jobs, chunksize=4)):
+            bytes_in += result["bytes_in"]
+            bytes_out += result["bytes_out"]
+            read_ms += result["read_ms"]
+            decode_ms += result["decode_ms"]
+            read_cold_ms += result["read_cold_ms"]
+            decode_cold_ms += result["decode_cold_ms"]
+            cold &= result["cold"]
+            if "error" in result:
+                max_error = np.maximum(max_error, result["error"])
+            if not result["ok"]:
+                failed += 1
+            if result["messages"] and (not result["ok"] or done == 0):
+                print(f"{result['scan']}: " + ", ".join(result["messages"]))
+            if (done + 1) % 100 == 0 or done + 1 == len(jobs):
+                print(f"변환 {done + 1}/{len(jobs)}")
+
+    # 결과 출력
+    total = max(len(jobs), 1)
+    print(f"{len(jobs)} 프레임 변환 ({time.time() - start:.1f}s): {scan_ext_out}, {label_ext_out if label_paths else '-'}")
+    print(f"크기: {bytes_in / 1e6:.1f}MB -> {bytes_out / 1e6:.1f}MB ({bytes_out / max(bytes_in, 1):.2%})")
+    print(f"프레임당 읽기 시간 (warm cache): 원본 {read_ms / total:.2f}ms, 변환 {decode_ms / total:.2f}ms")
+    if cold:
+        print(f"프레임당 읽기 시간 (cold cache): 원본 {read_cold_ms / total:.2f}ms, "
+              f"변환 {decode_cold_ms / total:.2f}ms")
+        if decode_cold_ms > read_cold_ms:
+            print("주의: cold cache에서도 변환 형식이 원본보다 느립니다 (압축 없는 형식 또는 더 빠른 압축 권장)")
+    else:
+        print("cold cache 측정 불가 (page cache를 비울 수 없는 환경)")
+    print("최대 오차 (x, y, z, intensity" + (", label" if columns == 5 else "") + "): " +
+          ", ".join("%.6f" % e for e in max_error))
+    if failed:
+        print(f"검증 실패 {failed}개 프레임!")
+        sys.exit(1)
+    print("검증 완료")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# This file is covered by the LICENSE file in the root of this project.
+
+import argparse
+import json
+import os
+import time
+import yaml
+from auxiliary.laserscan import LaserScan, build_label_lut, projection_options
+from auxiliary.evaluation import SemanticEvaluator
+from auxiliary.seqindex import SequenceIndex
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("./evaluate.py")
+    parser.add_argument(
+        '--dataset', '-d',
+        type=str,
+        nargs='+',
+        required=True,
+        help='평가할 sequence 경로 (predictions/, labels/ 폴더 필요, 여러 개 가능)',
+    )
+    parser.add_argument(
+        '--config', '-c',
+        type=str,
+        required=False,
+        default="config/semantic-kitti.yaml",
+        help='데이터셋 설정 파일',
+    )
+    parser.add_argument(
+        '--open-data', '--open_data',
+        type=str,
+        dest='open_data',
+        required=False,
+        default="",
+        help='오픈 데이터셋 지정',
+    )
+    parser.add_argument(
+        '--mapping',
+        dest='mapping',
+        default=False,
+        required=False,
+        action='store_true',
+        help='prediction/ground truth 모두 label_map으로 변환 후 평가'
+    )
+    parser.add_argument(
+        '--ignore',
+        type=int,
+        nargs='*',
+        dest='ignore',
+        default=[],
+        required=False,
+        help='평가에서 제외할 label (mapping 사용 시 변환된 label 기준)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        dest='workers',
+        default=None,
+        required=False,
+        help='worker process 개수 (기본값: CPU 개수)'
+    )
+    parser.add_argument(
+        '--out', '-o',
+        type=str,
+        dest='out',
+        default="",
+        required=False,
+        help='결과 JSON 저장 경로'
+    )
+    parser.add_argument(
+        '--knn',
+        dest='knn',
+        default=False,
+        required=False,
+        action='store_true',
+        help='label 후처리: range image 창 기반 KNN 투표 (RangeNet++ 방식, 경계 label 번짐 제거)'
+    )
+    parser.add_argument(
+        '--knn-k', '--knn_k',
+        type=int,
+        dest='knn_k',
+        default=5,
+        required=False,
+        help='KNN 후처리: 투표에 사용할 이웃 수 (기본값: 5)'
+    )
+    parser.add_argument(
+        '--knn-search', '--knn_search',
+        type=int,
+        dest='knn_search',
+        default=5,
+        required=False,
+        help='KNN 후처리: 탐색 창 크기 (홀수, 기본값: 5)'
+    )
+    parser.add_argument(
+        '--knn-sigma', '--knn_sigma',
+        type=float,
+        dest='knn_sigma',
+        default=1.0,
+        required=False,
+        help='KNN 후처리: 가우시안 커널 sigma (기본값: 1.0)'
+    )
+    parser.add_argument(
+        '--knn-cutoff', '--knn_cutoff',
+        type=float,
+        dest='knn_cutoff',
+        default=1.0,
+        required=False,
+        help='KNN 후처리: 투표에서 제외할 거리 차이 (m, 기본값: 1.0)'
+    )
+    FLAGS, unparsed = parser.parse_known_args()
+
+    # 설정 파일 열기
+    try:
+        print("설정 파일: %s" % FLAGS.config)
+        CFG = yaml.safe_load(open(FLAGS.config, 'r'))
+    except Exception as e:
+        print(e)
+        print("YAML 파일 오류")
+        quit()
+
+    # 절대 설정 파일 (항상 사용)
+    try:
+        absolutely_CFG = yaml.safe_load(open('config/absolutely-config.yaml', 'r'))
+    except Exception as e:
+        print(e)
+        print("absolutely-YAML 파일 오류")
+        quit()
+
+    # class 목록 및 label_map 설정 (visualize.py와 동일한 기준)
+    label_lut = None
+    class_names = {}
+    if FLAGS.mapping:
+        class_keys = absolutely_CFG["mapping_color_map"].keys()
+        if FLAGS.open_data:
+            label_map = absolutely_CFG[FLAGS.open_data]["label_map"]
+        else:
+            label_map = CFG["label_map"]
+        label_lut = build_label_lut(label_map)
+    else:
+        if FLAGS.open_data:
+            class_keys = absolutely_CFG[FLAGS.open_data]["color_map"].keys()
+        else:
+            class_keys = CFG["color_map"].keys()
+        class_names = CFG.get("labels", {})
+
+    # label 후처리 (range image KNN 투표)
+    postprocess = None
+    if FLAGS.knn:
+        from auxiliary.postproc import KNNPostProcess
+        try:
+            postprocess = KNNPostProcess(knn=FLAGS.knn_k, search=FLAGS.knn_search,
+                                         sigma=FLAGS.knn_sigma, cutoff=FLAGS.knn_cutoff)
+        except ValueError as e:
+            print(e)
+            quit()
+        print(f"label 후처리: {postprocess}")
+
+    ## 후처리용 2D 투영 scan (설정 파일의 lidar 항목, worker마다 버퍼 재사용)
+    scan = None
+    if postprocess is not None:
+        lidar = CFG["lidar"]
+        scan = LaserScan(
+            project=True,
+            H=lidar["H"],
+            W=lidar["W"],
+            fov_up=lidar["fov_up"],
+            fov_down=lidar["fov_down"],
+            reuse_buffers=True,
+            **projection_options(lidar)
+        )
+
+    # sequence별 prediction/label 파일 짝 (sequence index 사용)
+    ## frame id 기준으로 짝을 맞추고 point/label 개수를 파일 크기로 검증
+    pairs = []
+    for sequence in FLAGS.dataset:
+        prediction_paths = os.path.join(sequence, "predictions")
+        label_paths = os.path.join(sequence, "labels")
+        for path in (prediction_paths, label_paths):
+            if not os.path.isdir(path):
+                print(f"{path} 존재하지 않습니다! 종료 중...")
+                quit()
+
+        index = SequenceIndex(prediction_paths, label_paths, predictions=True).refresh()
+        if index.problems:
+            print(f"{sequence}: 사용할 수 없는 프레임 {len(index.problems)}개 (제외하고 진행):")
+            for problem in index.problems:
+                print("\t" + problem)
+        pairs += list(zip(index.scan_names, index.label_names))
+        print(f"{sequence}: {len(index)} 프레임")
+
+    if not pairs:
+        print("평가할 프레임이 없습니다! 종료 중...")
+        quit()
+
+    # 평가
+    start = time.time()
+    evaluator = SemanticEvaluator(class_keys,
+                                  label_lut=label_lut,
+                                  ignore=FLAGS.ignore,
+                                  workers=FLAGS.workers,
+                                  scan=scan,
+                                  postprocess=postprocess)
+    evaluator.run(pairs)
+    report = evaluator.report(class_names)
+
+    # 결과 출력
+    print("%-8s %-20s %10s %12s" % ("label", "name", "IoU", "points"))
+    for key, result in report["classes"].items():
+        iou = "-" if result["iou"] is None else "%.4f" % result["iou"]
+        print("%-8s %-20s %10s %12d" % (key, result["name"], iou, result["points"]))
+    print(f"mIoU: {report['miou']:.4f}")
+    print(f"accuracy: {report['accuracy']:.4f}")
+    print(f"{len(pairs)} 프레임 ({time.time() - start:.1f}s)")
+
+    # 결과 저장
+    if FLAGS.out:
+        with open(FLAGS.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"결과 저장: {FLAGS.out}")
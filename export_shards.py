@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# This file is covered by the LICENSE file in the root of this project.
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import yaml
+from auxiliary.laserscan import SemLaserScan, projection_options
+from auxiliary.seqindex import SequenceIndex
+from auxiliary.shards import CHANNELS, plan_shards, write_manifest, write_shard
+
+
+# worker process 상태 (scan 객체는 process마다 하나)
+_worker = {}
+
+
+def _init_worker(scan, out_dir, channels):
+    _worker["scan"] = scan
+    _worker["out_dir"] = out_dir
+    _worker["channels"] = channels
+
+
+def _export_shard(job):
+    index, frames = job
+    return write_shard(_worker["scan"], _worker["out_dir"], index, frames, _worker["channels"])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("./export_shards.py")
+    parser.add_argument(
+        '--dataset', '-d',
+        type=str,
+        nargs='+',
+        required=True,
+        help='변환할 sequence 경로 (여러 개 가능)',
+    )
+    parser.add_argument(
+        '--config', '-c',
+        type=str,
+        required=False,
+        default="config/semantic-kitti.yaml",
+        help='데이터셋 설정 파일 (lidar 항목의 H/W/FOV 사용)',
+    )
+    parser.add_argument(
+        '--open-data', '--open_data',
+        type=str,
+        dest='open_data',
+        required=False,
+        default="",
+        help='오픈 데이터셋 지정 (mapping 사용 시 label_map)',
+    )
+    parser.add_argument(
+        '--predictions',
+        dest='predictions',
+        default=False,
+        required=False,
+        action='store_true',
+        help='[x, y, z, intensity, label] 형태의 데이터 사용'
+    )
+    parser.add_argument(
+        '--ignore-label', '-i',
+        dest='ignore_label',
+        default=False,
+        action='store_true',
+        help='Label 데이터 없이, LiDAR 데이터만 변환',
+    )
+    parser.add_argument(
+        '--mapping',
+        dest='mapping',
+        default=False,
+        required=False,
+        action='store_true',
+        help='label 채널을 YAML 파일의 label_map으로 변환'
+    )
+    parser.add_argument(
+        '--channels',
+        type=str,
+        nargs='+',
+        dest='channels',
+        default=list(CHANNELS),
+        choices=list(CHANNELS),
+        help='저장할 채널',
+    )
+    parser.add_argument(
+        '--shard-size', '--shard_size',
+        type=int,
+        dest='shard_size',
+        default=256,
+        help='shard 하나의 프레임 수',
+    )
+    parser.add_argument(
+        '--out', '-o',
+        type=str,
+        dest='out',
+        required=True,
+        help='출력 폴더',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        dest='workers',
+        default=None,
+        required=False,
+        help='worker process 개수 (기본값: CPU 개수)'
+    )
+    parser.add_argument(
+        '--knn',
+        dest='knn',
+        default=False,
+        required=False,
+        action='store_true',
+        help='label 후처리: range image 창 기반 KNN 투표 (RangeNet++ 방식, 경계 label 번짐 제거)'
+    )
+    parser.add_argument(
+        '--knn-k', '--knn_k',
+        type=int,
+        dest='knn_k',
+        default=5,
+        required=False,
+        help='KNN 후처리: 투표에 사용할 이웃 수 (기본값: 5)'
+    )
+    parser.add_argument(
+        '--knn-search', '--knn_search',
+        type=int,
+        dest='knn_search',
+        default=5,
+        required=False,
+        help='KNN 후처리: 탐색 창 크기 (홀수, 기본값: 5)'
+    )
+    parser.add_argument(
+        '--knn-sigma', '--knn_sigma',
+        type=float,
+        dest='knn_sigma',
+        default=1.0,
+        required=False,
+        help='KNN 후처리: 가우시안 커널 sigma (기본값: 1.0)'
+    )
+    parser.add_argument(
+        '--knn-cutoff', '--knn_cutoff',
+        type=float,
+        dest='knn_cutoff',
+        default=1.0,
+        required=False,
+        help='KNN 후처리: 투표에서 제외할 거리 차이 (m, 기본값: 1.0)'
+    )
+    FLAGS, unparsed = parser.parse_known_args()
+
+    # 설정 파일 열기
+    try:
+        print("설정 파일: %s" % FLAGS.config)
+        CFG = yaml.safe_load(open(FLAGS.config, 'r'))
+    except Exception as e:
+        print(e)
+        print("YAML 파일 오류")
+        quit()
+
+    # label 채널 확인
+    semantics = FLAGS.predictions or not FLAGS.ignore_label
+    channels = [channel for channel in FLAGS.channels if semantics or channel != "label"]
+
+    # sequence별 파일 목록 (sequence index 사용)
+    frames = []
+    frame_info = []
+    for sequence in FLAGS.dataset:
+        if FLAGS.predictions:
+            scan_paths = os.path.join(sequence, "predictions")
+            label_paths = None
+        else:
+            scan_paths = os.path.join(sequence, CFG["lidar"]["manufacturer"])
+            label_paths = None if FLAGS.ignore_label else os.path.join(sequence, "labels")
+        for path in (scan_paths, label_paths):
+            if path is not None and not os.path.isdir(path):
+                print(f"{path} 존재하지 않습니다! 종료 중...")
+                quit()
+
+        index = SequenceIndex(scan_paths, label_paths, predictions=FLAGS.predictions).refresh()
+        if index.problems:
+            print(f"{sequence}: 사용할 수 없는 프레임 {len(index.problems)}개 (제외하고 진행)")
+        name = os.path.basename(os.path.normpath(sequence))
+        for frame in index.frames:
+            frames.append((frame["scan"], frame["label"]))
+            frame_info.append({"sequence": name, "frame": frame["frame"]})
+        print(f"{sequence}: {len(index)} 프레임")
+
+    if not frames:
+        print("변환할 프레임이 없습니다! 종료 중...")
+        quit()
+
+    # scan 객체 생성 (설정 파일의 lidar 항목)
+    lidar = CFG["lidar"]
+    scan = SemLaserScan(
+        sem_color_dict=CFG.get("color_map", {}),
+        project=True,
+        H=lidar["H"],
+        W=lidar["W"],
+        fov_up=lidar["fov_up"],
+        fov_down=lidar["fov_down"],
+        **projection_options(lidar)
+    )
+    scan.set_combined(FLAGS.predictions)
+    scan.set_mapping(FLAGS.mapping)
+    if FLAGS.mapping:
+        if FLAGS.open_data:
+            absolutely_CFG = yaml.safe_load(open('config/absolutely-config.yaml', 'r'))
+            scan.set_label_map(absolutely_CFG[FLAGS.open_data]["label_map"])
+        else:
+            scan.set_label_map(CFG["label_map"])
+
+    # label 후처리 (range image KNN 투표)
+    postprocess = None
+    if FLAGS.knn:
+        from auxiliary.postproc import KNNPostProcess
+        try:
+            postprocess = KNNPostProcess(knn=FLAGS.knn_k, search=FLAGS.knn_search,
+                                         sigma=FLAGS.knn_sigma, cutoff=FLAGS.knn_cutoff)
+        except ValueError as e:
+            print(e)
+            quit()
+        print(f"label 후처리: {postprocess}")
+    scan.set_postprocess(postprocess)
+
+    # shard 단위로 process pool에 분배 (worker가 memmap에 바로 기록)
+    os.makedirs(FLAGS.out, exist_ok=True)
+    shards = plan_shards(len(frames), FLAGS.shard_size)
+    jobs = [(k, frames[start:start + count]) for k, start, count in shards]
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=FLAGS.workers,
+                             initializer=_init_worker,
+                             initargs=(scan, FLAGS.out, channels)) as executor:
+        for done, k in enumerate(executor.map(_export_shard, jobs)):
+            print(f"shard {done + 1}/{len(jobs)}")
+
+    # manifest 저장
+    write_manifest(FLAGS.out, scan, channels, shards, frame_info,
+                   extra={"predictions": FLAGS.predictions, "mapping": FLAGS.mapping})
+    print(f"{len(frames)} 프레임, shard {len(shards)}개 저장 ({time.time() - start_time:.1f}s): {FLAGS.out}")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# This file is covered by the LICENSE file in the root of this project.
+
+import argparse
+import os
+import time
+import yaml
+from auxiliary.archive import ARCHIVE_EXT, pack_sequence
+from auxiliary.seqindex import SequenceIndex
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("./pack_sequence.py")
+    parser.add_argument(
+        '--dataset', '-d',
+        type=str,
+        required=True,
+        help='변환할 sequence 경로',
+    )
+    parser.add_argument(
+        '--config', '-c',
+        type=str,
+        required=False,
+        default="config/semantic-kitti.yaml",
+        help='데이터셋 설정 파일',
+    )
+    parser.add_argument(
+        '--predictions',
+        dest='predictions',
+        default=False,
+        required=False,
+        action='store_true',
+        help='[x, y, z, intensity, label] 형태의 데이터 사용'
+    )
+    parser.add_argument(
+        '--ignore-label', '-i',
+        dest='ignore_label',
+        default=False,
+        action='store_true',
+        help='Label 데이터 없이, LiDAR 데이터만 저장',
+    )
+    parser.add_argument(
+        '--out', '-o',
+        type=str,
+        dest='out',
+        default="",
+        required=False,
+        help='아카이브 경로 (기본값: sequence 폴더/{LiDAR 폴더}.pack)',
+    )
+    FLAGS, unparsed = parser.parse_known_args()
+
+    # 설정 파일 열기
+    try:
+        print("설정 파일: %s" % FLAGS.config)
+        CFG = yaml.safe_load(open(FLAGS.config, 'r'))
+    except Exception as e:
+        print(e)
+        print("YAML 파일 오류")
+        quit()
+
+    # 폴더 확인
+    if FLAGS.predictions:
+        scan_paths = os.path.join(FLAGS.dataset, "predictions")
+        label_paths = None
+    else:
+        scan_paths = os.path.join(FLAGS.dataset, CFG["lidar"]["manufacturer"])
+        label_paths = None if FLAGS.ignore_label else os.path.join(FLAGS.dataset, "labels")
+    for path in (scan_paths, label_paths):
+        if path is not None and not os.path.isdir(path):
+            print(f"{path} 존재하지 않습니다! 종료 중...")
+            quit()
+
+    # 파일 목록 및 검증
+    index = SequenceIndex(scan_paths, label_paths, predictions=FLAGS.predictions).refresh()
+    if index.problems:
+        print(f"사용할 수 없는 프레임 {len(index.problems)}개 (제외하고 진행):")
+        for problem in index.problems:
+            print("\t" + problem)
+
+    # 아카이브 생성
+    out = FLAGS.out or os.path.normpath(scan_paths) + ARCHIVE_EXT
+    start = time.time()
+    pack_sequence(index.scan_names,
+                  index.label_names,
+                  out,
+                  predictions=FLAGS.predictions,
+                  frame_ids=[frame["frame"] for frame in index.frames])
+    print(f"{out}: {len(index)} 프레임 저장 ({time.time() - start:.1f}s)")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# This file is covered by the LICENSE file in the root of this project.
+
+import argparse
+import os
+import time
+import yaml
+from auxiliary.laserscan import build_label_lut
+from auxiliary.labelstats import LabelStats
+from auxiliary.seqindex import SequenceIndex
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("./stats.py")
+    parser.add_argument(
+        '--dataset', '-d',
+        type=str,
+        nargs='+',
+        required=True,
+        help='통계를 계산할 sequence 경로 (여러 개 가능)',
+    )
+    parser.add_argument(
+        '--config', '-c',
+        type=str,
+        required=False,
+        default="config/semantic-kitti.yaml",
+        help='데이터셋 설정 파일',
+    )
+    parser.add_argument(
+        '--open-data', '--open_data',
+        type=str,
+        dest='open_data',
+        required=False,
+        default="",
+        help='오픈 데이터셋 지정',
+    )
+    parser.add_argument(
+        '--predictions',
+        dest='predictions',
+        default=False,
+        required=False,
+        action='store_true',
+        help='[x, y, z, intensity, label] 형태의 데이터 사용'
+    )
+    parser.add_argument(
+        '--mapping',
+        dest='mapping',
+        default=False,
+        required=False,
+        action='store_true',
+        help='YAML 파일의 label_map으로 변환한 label 기준 통계'
+    )
+    parser.add_argument(
+        '--out', '-o',
+        type=str,
+        dest='out',
+        required=True,
+        help='결과 폴더 (frames.csv, classes.csv, stats.json)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        dest='workers',
+        default=None,
+        required=False,
+        help='worker process 개수 (기본값: CPU 개수)'
+    )
+    parser.add_argument(
+        '--no-frames', '--no_frames',
+        dest='no_frames',
+        default=False,
+        required=False,
+        action='store_true',
+        help='프레임별 CSV (frames.csv) 저장하지 않음'
+    )
+    FLAGS, unparsed = parser.parse_known_args()
+
+    # 설정 파일 열기
+    try:
+        print("설정 파일: %s" % FLAGS.config)
+        CFG = yaml.safe_load(open(FLAGS.config, 'r'))
+    except Exception as e:
+        print(e)
+        print("YAML 파일 오류")
+        quit()
+
+    # 절대 설정 파일 (항상 사용)
+    try:
+        absolutely_CFG = yaml.safe_load(open('config/absolutely-config.yaml', 'r'))
+    except Exception as e:
+        print(e)
+        print("absolutely-YAML 파일 오류")
+        quit()
+
+    # class 목록 및 label_map 설정 (visualize.py와 동일한 기준)
+    label_lut = None
+    class_names = {}
+    if FLAGS.mapping:
+        class_keys = absolutely_CFG["mapping_color_map"].keys()
+        if FLAGS.open_data:
+            label_map = absolutely_CFG[FLAGS.open_data]["label_map"]
+        else:
+            label_map = CFG["label_map"]
+        label_lut = build_label_lut(label_map)
+    else:
+        if FLAGS.open_data:
+            class_keys = absolutely_CFG[FLAGS.open_data]["color_map"].keys()
+        else:
+            class_keys = CFG["color_map"].keys()
+        class_names = CFG.get("labels", {})
+
+    # sequence별 파일 목록 (sequence index 사용)
+    frames = []
+    for sequence in FLAGS.dataset:
+        if FLAGS.predictions:
+            scan_paths = os.path.join(sequence, "predictions")
+            label_paths = None
+        else:
+            scan_paths = os.path.join(sequence, CFG["lidar"]["manufacturer"])
+            label_paths = os.path.join(sequence, "labels")
+        for path in (scan_paths, label_paths):
+            if path is not None and not os.path.isdir(path):
+                print(f"{path} 존재하지 않습니다! 종료 중...")
+                quit()
+
+        index = SequenceIndex(scan_paths, label_paths, predictions=FLAGS.predictions).refresh()
+        if index.problems:
+            print(f"{sequence}: 사용할 수 없는 프레임 {len(index.problems)}개 (제외하고 진행)")
+        name = os.path.basename(os.path.normpath(sequence))
+        key = "scan" if FLAGS.predictions else "label"
+        frames += [(name, frame["frame"], frame[key]) for frame in index.frames]
+        print(f"{sequence}: {len(index)} 프레임")
+
+    # 통계 계산 및 저장
+    os.makedirs(FLAGS.out, exist_ok=True)
+    start = time.time()
+    stats = LabelStats(class_keys,
+                       class_names=class_names,
+                       predictions=FLAGS.predictions,
+                       label_lut=label_lut,
+                       workers=FLAGS.workers)
+    stats.run(frames, None if FLAGS.no_frames else os.path.join(FLAGS.out, "frames.csv"))
+    stats.write_classes(os.path.join(FLAGS.out, "classes.csv"))
+    stats.write_json(os.path.join(FLAGS.out, "stats.json"))
+    print(f"{stats.frames} 프레임, {stats.points} points ({time.time() - start:.1f}s)")
+    print(f"결과 저장: {FLAGS.out}")
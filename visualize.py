@@ -4,15 +4,19 @@
 import argparse
 import os
 import yaml
-from auxiliary.laserscan import LaserScan, SemLaserScan
-from auxiliary.laserscanvis import LaserScanVis
+from auxiliary.laserscan import LaserScan, SemLaserScan, projection_options
+from auxiliary.prefetch import ScanPrefetcher
+from auxiliary.seqindex import SequenceIndex
+from auxiliary.archive import PackedSequence
+from auxiliary.profiler import create_timer
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser("./visualize.py")
     parser.add_argument(
         '--dataset', '-d',
         type=str,
-        required=True,
+        required=False,
+        default="",
         help='LiDAR 데이터 시각화',
     )
     parser.add_argument(
@@ -53,6 +57,305 @@ if __name__ == '__main__':
         action='store_true',
         help='특정 클래스만 표현 (YAML 파일의 label_map 사용)'
     )
+    parser.add_argument(
+        '--prefetch',
+        type=int,
+        dest='prefetch',
+        default=0,
+        required=False,
+        help='미리 읽어둘 scan 개수 (0: 사용 안 함)'
+    )
+    parser.add_argument(
+        '--prefetch-workers', '--prefetch_workers',
+        type=int,
+        dest='prefetch_workers',
+        default=2,
+        required=False,
+        help='prefetch worker thread 개수'
+    )
+    parser.add_argument(
+        '--prefetch-memory', '--prefetch_memory',
+        type=int,
+        dest='prefetch_memory',
+        default=1024,
+        required=False,
+        help='prefetch 캐시 메모리 제한 (MB)'
+    )
+    parser.add_argument(
+        '--reuse-buffers', '--reuse_buffers',
+        dest='reuse_buffers',
+        default=False,
+        required=False,
+        action='store_true',
+        help='2D 투영 이미지 버퍼를 매 scan 재할당하지 않고 재사용'
+    )
+    parser.add_argument(
+        '--headless',
+        dest='headless',
+        default=False,
+        required=False,
+        action='store_true',
+        help='창 없이 전체 sequence를 이미지로 저장 (--out 필요)'
+    )
+    parser.add_argument(
+        '--out', '-o',
+        type=str,
+        dest='out',
+        default="",
+        required=False,
+        help='headless 모드 출력 폴더'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        dest='workers',
+        default=None,
+        required=False,
+        help='headless 모드 worker process 개수 (기본값: CPU 개수)'
+    )
+    parser.add_argument(
+        '--gif',
+        dest='gif',
+        default=False,
+        required=False,
+        action='store_true',
+        help='headless 모드에서 이미지 종류별 GIF도 저장'
+    )
+    parser.add_argument(
+        '--reindex',
+        dest='reindex',
+        default=False,
+        required=False,
+        action='store_true',
+        help='sequence index를 처음부터 다시 생성 (모든 파일 stat)'
+    )
+    parser.add_argument(
+        '--packed',
+        type=str,
+        dest='packed',
+        default="",
+        required=False,
+        help='pack_sequence.py로 만든 아카이브 경로 (-d 대신 사용)'
+    )
+    parser.add_argument(
+        '--profile',
+        type=str,
+        dest='profile',
+        nargs='?',
+        const="",
+        default=None,
+        required=False,
+        help='단계별 처리 시간 측정 (창 제목에 표시, 경로 지정 시 JSON lines 저장). '
+             '환경 변수 LIDAR_VIS_PROFILE로도 설정 가능'
+    )
+    parser.add_argument(
+        '--lod-budget', '--lod_budget',
+        type=int,
+        dest='lod_budget',
+        default=0,
+        required=False,
+        help='카메라 조작 중 3D view에 표시할 최대 point 개수 (0: 사용 안 함)'
+    )
+    parser.add_argument(
+        '--lod-delay', '--lod_delay',
+        type=float,
+        dest='lod_delay',
+        default=0.3,
+        required=False,
+        help='카메라가 멈춘 뒤 전체 pointcloud를 표시할 때까지의 시간 (초)'
+    )
+    parser.add_argument(
+        '--accumulate',
+        dest='accumulate',
+        default=False,
+        required=False,
+        action='store_true',
+        help='pose 기반 누적 map view 표시 (sequence 폴더의 poses.txt/calib.txt 사용)'
+    )
+    parser.add_argument(
+        '--poses',
+        type=str,
+        dest='poses',
+        default="",
+        required=False,
+        help='poses.txt 경로 (기본값: sequence 폴더/poses.txt)'
+    )
+    parser.add_argument(
+        '--voxel-size', '--voxel_size',
+        type=float,
+        dest='voxel_size',
+        default=0.2,
+        required=False,
+        help='누적 map voxel 크기 (m)'
+    )
+    parser.add_argument(
+        '--map-window', '--map_window',
+        type=int,
+        dest='map_window',
+        default=0,
+        required=False,
+        help='누적 map에 유지할 최근 프레임 수 (0: 전체 누적)'
+    )
+    parser.add_argument(
+        '--map-max-voxels', '--map_max_voxels',
+        type=int,
+        dest='map_max_voxels',
+        default=2000000,
+        required=False,
+        help='누적 map 최대 voxel 개수 (넘으면 오래된 voxel부터 제거)'
+    )
+    parser.add_argument(
+        '--live',
+        dest='live',
+        default=False,
+        required=False,
+        action='store_true',
+        help='live 모드: -d sequence 폴더에 새로 생기는 scan/label 파일을 감시하여 최신 프레임 표시'
+    )
+    parser.add_argument(
+        '--live-socket', '--live_socket',
+        type=str,
+        dest='live_socket',
+        default="",
+        required=False,
+        help='live 모드: HOST:PORT에서 socket으로 프레임 수신 (float32 [x, y, z, intensity(, label)])'
+    )
+    parser.add_argument(
+        '--live-queue', '--live_queue',
+        type=int,
+        dest='live_queue',
+        default=2,
+        required=False,
+        help='live 모드에서 표시 대기 프레임 최대 개수 (넘으면 오래된 프레임 버림)'
+    )
+    parser.add_argument(
+        '--live-interval', '--live_interval',
+        type=float,
+        dest='live_interval',
+        default=0.05,
+        required=False,
+        help='live 모드 폴더 감시 주기 (초)'
+    )
+    parser.add_argument(
+        '--fps',
+        type=float,
+        dest='fps',
+        default=10.0,
+        required=False,
+        help='재생 모드 목표 FPS (기본값: 센서 주기 10Hz, 표시가 늦으면 프레임을 건너뜀)'
+    )
+    parser.add_argument(
+        '--play',
+        dest='play',
+        default=False,
+        required=False,
+        action='store_true',
+        help='시작하자마자 재생'
+    )
+    parser.add_argument(
+        '--compare',
+        type=str,
+        nargs='+',
+        dest='compare',
+        default=None,
+        required=False,
+        help='비교 모드: prediction 폴더 여러 개 (.label 또는 [x, y, z, intensity, label] 파일)를 '
+             '-d sequence의 geometry 위에 함께 표시 (labels 폴더가 있으면 ground truth도 표시)'
+    )
+    parser.add_argument(
+        '--compare-names', '--compare_names',
+        type=str,
+        nargs='+',
+        dest='compare_names',
+        default=None,
+        required=False,
+        help='비교 모드 run 이름 (기본값: 폴더 이름)'
+    )
+    parser.add_argument(
+        '--min-range', '--min_range',
+        type=float,
+        dest='min_range',
+        default=None,
+        required=False,
+        help='필터: 최소 거리 (m)'
+    )
+    parser.add_argument(
+        '--max-range', '--max_range',
+        type=float,
+        dest='max_range',
+        default=None,
+        required=False,
+        help='필터: 최대 거리 (m), 실행 중 [ / ]로 변경'
+    )
+    parser.add_argument(
+        '--box',
+        type=float,
+        nargs=4,
+        dest='box',
+        default=None,
+        required=False,
+        metavar=('X_MIN', 'X_MAX', 'Y_MIN', 'Y_MAX'),
+        help='필터: 센서 기준 영역 (m)'
+    )
+    parser.add_argument(
+        '--z-range', '--z_range',
+        type=float,
+        nargs=2,
+        dest='z_range',
+        default=None,
+        required=False,
+        metavar=('Z_MIN', 'Z_MAX'),
+        help='필터: 높이 범위 (m), 실행 중 { / }로 최대 높이 변경'
+    )
+    parser.add_argument(
+        '--hide-classes', '--hide_classes',
+        type=str,
+        nargs='+',
+        dest='hide_classes',
+        default=[],
+        required=False,
+        help='필터: 숨길 클래스 (label 번호 또는 config labels 이름, --mapping 사용 시 mapping label 번호)'
+    )
+    parser.add_argument(
+        '--knn',
+        dest='knn',
+        default=False,
+        required=False,
+        action='store_true',
+        help='label 후처리: range image 창 기반 KNN 투표 (RangeNet++ 방식, 경계 label 번짐 제거)'
+    )
+    parser.add_argument(
+        '--knn-k', '--knn_k',
+        type=int,
+        dest='knn_k',
+        default=5,
+        required=False,
+        help='KNN 후처리: 투표에 사용할 이웃 수 (기본값: 5)'
+    )
+    parser.add_argument(
+        '--knn-search', '--knn_search',
+        type=int,
+        dest='knn_search',
+        default=5,
+        required=False,
+        help='KNN 후처리: 탐색 창 크기 (홀수, 기본값: 5)'
+    )
+    parser.add_argument(
+        '--knn-sigma', '--knn_sigma',
+        type=float,
+        dest='knn_sigma',
+        default=1.0,
+        required=False,
+        help='KNN 후처리: 가우시안 커널 sigma (기본값: 1.0)'
+    )
+    parser.add_argument(
+        '--knn-cutoff', '--knn_cutoff',
+        type=float,
+        dest='knn_cutoff',
+        default=1.0,
+        required=False,
+        help='KNN 후처리: 투표에서 제외할 거리 차이 (m, 기본값: 1.0)'
+    )
     FLAGS, unparsed = parser.parse_known_args()
 
     # 옵션 출력
@@ -62,8 +365,33 @@ if __name__ == '__main__':
     print("Config", FLAGS.config)
     print("Open Data:", FLAGS.open_data)
     print("Mapping:", FLAGS.mapping)
+    print("Prefetch:", FLAGS.prefetch)
+    print("Headless:", FLAGS.headless)
     print("*" * 80)
 
+    live = FLAGS.live or bool(FLAGS.live_socket)
+    if not FLAGS.dataset and not FLAGS.packed and not FLAGS.live_socket and not FLAGS.compare:
+        print("-d 데이터셋 경로 또는 --packed 아카이브 경로가 필요합니다! 종료 중...")
+        quit()
+
+    if live and (FLAGS.headless or FLAGS.packed or FLAGS.accumulate or FLAGS.prefetch > 0):
+        print("live 모드는 --headless, --packed, --accumulate, --prefetch와 함께 사용할 수 없습니다! 종료 중...")
+        quit()
+
+    if FLAGS.compare and (live or FLAGS.headless or FLAGS.packed or FLAGS.accumulate or
+                          FLAGS.prefetch > 0 or FLAGS.predictions or FLAGS.knn):
+        print("비교 모드는 live/--headless/--packed/--accumulate/--prefetch/--predictions/--knn과 "
+              "함께 사용할 수 없습니다! 종료 중...")
+        quit()
+
+    if FLAGS.compare_names and len(FLAGS.compare_names) != len(FLAGS.compare or []):
+        print("--compare-names 개수가 --compare 폴더 개수와 다릅니다! 종료 중...")
+        quit()
+
+    if FLAGS.headless and not FLAGS.out:
+        print("headless 모드는 --out 출력 폴더가 필요합니다! 종료 중...")
+        quit()
+
     # 설정 파일 열기
     try:
         print("설정 파일: %s" % FLAGS.config)
@@ -81,38 +409,69 @@ if __name__ == '__main__':
         print("absolutely-YAML 파일 오류")
         quit()
 
-    # LiDAR 폴더 확인
-    if FLAGS.predictions:
-        scan_paths = os.path.join(FLAGS.dataset, "predictions")
-    else:
-        scan_paths = os.path.join(FLAGS.dataset, CFG["lidar"]["manufacturer"])
-    if os.path.isdir(scan_paths):
-        print(f"{scan_paths} 사용 중...")
-    else:
-        print(f"{scan_paths} 존재하지 않습니다! 종료 중...")
-        quit()
-
-    # pointcloud 파일 목록 가져오기
-    scan_names = [os.path.join(dp, f) for dp, dn, fn in os.walk(os.path.expanduser(scan_paths)) for f in fn]
-    scan_names.sort()
-
-    # label 폴더 확인
-    if FLAGS.predictions:
-        # predictions 모드
-        print("predictions mode: [x, y, z, intensity, label] 형식 사용")
+    # 압축 아카이브 사용 시 (pack_sequence.py로 생성)
+    if FLAGS.packed:
+        archive = PackedSequence(FLAGS.packed)
+        print(f"{FLAGS.packed} 사용 중... ({len(archive)} 프레임)")
+        FLAGS.predictions = archive.predictions
+        if not archive.has_labels and not FLAGS.ignore_label:
+            print("label이 없는 아카이브입니다! --ignore-label 사용 필요, 종료 중...")
+            quit()
+        scan_names = archive
+        label_names = archive
+    elif FLAGS.live_socket or FLAGS.compare:
+        # socket live 모드: 파일 목록 없음
+        ## 비교 모드: 아래에서 run별 목록 생성
+        scan_names = []
         label_names = []
     else:
-        # labels 폴더 사용
-        label_paths = os.path.join(FLAGS.dataset, "labels")
-        if os.path.isdir(label_paths):
-            print(f"{label_paths} 사용 중...")
+        # LiDAR 폴더 확인
+        if FLAGS.predictions:
+            scan_paths = os.path.join(FLAGS.dataset, "predictions")
         else:
-            print(f"{label_paths} 존재하지 않습니다! 종료 중...")
+            scan_paths = os.path.join(FLAGS.dataset, CFG["lidar"]["manufacturer"])
+        if os.path.isdir(scan_paths):
+            print(f"{scan_paths} 사용 중...")
+        else:
+            print(f"{scan_paths} 존재하지 않습니다! 종료 중...")
             quit()
-        
-        # label 파일 목록 가져오기
-        label_names = [os.path.join(dp, f) for dp, dn, fn in os.walk(os.path.expanduser(label_paths)) for f in fn]
-        label_names.sort()
+
+        # label 폴더 확인
+        if FLAGS.predictions:
+            # predictions 모드
+            print("predictions mode: [x, y, z, intensity, label] 형식 사용")
+            label_paths = None
+        else:
+            # labels 폴더 사용
+            label_paths = os.path.join(FLAGS.dataset, "labels")
+            if os.path.isdir(label_paths):
+                print(f"{label_paths} 사용 중...")
+            else:
+                print(f"{label_paths} 존재하지 않습니다! 종료 중...")
+                quit()
+
+        # 폴더 감시 live 모드: 파일 목록 없음
+        if FLAGS.live:
+            scan_names = []
+            label_names = []
+        else:
+            # pointcloud/label 파일 목록 가져오기 (sequence index 사용)
+            ## frame id 기준으로 짝을 맞추고 파일 크기로 point/label 개수를 미리 검증
+            try:
+                index = SequenceIndex(scan_paths, label_paths, predictions=FLAGS.predictions)
+                index.refresh(full=FLAGS.reindex)
+            except RuntimeError as e:
+                print(e)
+                quit()
+            if index.problems:
+                print(f"사용할 수 없는 프레임 {len(index.problems)}개 (제외하고 진행):")
+                for problem in index.problems:
+                    print("\t" + problem)
+            if len(index) == 0:
+                print("사용할 수 있는 프레임이 없습니다! 종료 중...")
+                quit()
+            scan_names = index.scan_names
+            label_names = index.label_names
 
     # scan 객체 생성
     ## color_dict 설정
@@ -133,33 +492,211 @@ if __name__ == '__main__':
     # LiDAR 정보 설정
     lidar = CFG["lidar"]
 
+    # 비교 모드: geometry는 한 번만 읽고 run마다 label만 읽어 표시
+    if FLAGS.compare:
+        from auxiliary.compare import RunComparison, match_runs
+        from auxiliary.laserscan import build_color_lut, build_label_lut
+        for path in FLAGS.compare:
+            if not os.path.isdir(path):
+                print(f"{path} 존재하지 않습니다! 종료 중...")
+                quit()
+
+        ## geometry: sequence의 scan 폴더 (없으면 첫 번째 prediction scan run)
+        geometry_dir = os.path.join(FLAGS.dataset, lidar["manufacturer"]) if FLAGS.dataset else None
+        if geometry_dir is not None and not os.path.isdir(geometry_dir):
+            geometry_dir = None
+        gt_dir = os.path.join(FLAGS.dataset, "labels") if FLAGS.dataset else None
+        if FLAGS.ignore_label or gt_dir is None or not os.path.isdir(gt_dir):
+            gt_dir = None
+        try:
+            geometry_names, geometry_predictions, gt_names, runs, problems = match_runs(
+                geometry_dir, FLAGS.compare, gt_dir, FLAGS.compare_names)
+        except RuntimeError as e:
+            print(e)
+            quit()
+        if problems:
+            print(f"사용할 수 없는 프레임 {len(problems)}개 (제외하고 진행):")
+            for problem in problems:
+                print("\t" + problem)
+        if not geometry_names:
+            print("모든 run에 공통으로 있는 프레임이 없습니다! 종료 중...")
+            quit()
+        print(f"비교 모드: {len(runs)}개 run, {len(geometry_names)} 프레임" +
+              (", ground truth 사용" if gt_names is not None else ""))
+
+        geometry = LaserScan(
+            project=True,
+            H=lidar["H"],
+            W=lidar["W"],
+            fov_up=lidar["fov_up"],
+            fov_down=lidar["fov_down"],
+            **projection_options(lidar)
+        )
+        geometry.set_combined(geometry_predictions)
+        comparison = RunComparison(
+            scan=geometry,
+            geometry_names=geometry_names,
+            runs=runs,
+            color_lut=build_color_lut(color_dict),
+            label_lut=build_label_lut(label_map) if FLAGS.mapping else None,
+            gt_names=gt_names
+        )
+
+        from auxiliary.comparevis import CompareVis
+        vis = CompareVis(comparison)
+        print("To navigate:")
+        print("\tb: back (previous scan)")
+        print("\tn: next (next scan)")
+        print("\tq: quit (exit program)")
+        vis.run()
+        quit()
+
     scan = SemLaserScan(
         sem_color_dict=color_dict,
         project=True, 
         H=lidar["H"], 
         W=lidar["W"], 
         fov_up=lidar["fov_up"], 
-        fov_down=lidar["fov_down"]
+        fov_down=lidar["fov_down"],
+        reuse_buffers=FLAGS.reuse_buffers,
+        **projection_options(lidar)
     )
     scan.set_combined(FLAGS.predictions)
     scan.set_mapping(FLAGS.mapping)
+    scan.set_timer(create_timer(FLAGS.profile))
     if FLAGS.mapping:
         scan.set_label_map(label_map)
 
+    # label 후처리 (range image KNN 투표)
+    postprocess = None
+    if FLAGS.knn:
+        from auxiliary.postproc import KNNPostProcess
+        try:
+            postprocess = KNNPostProcess(knn=FLAGS.knn_k, search=FLAGS.knn_search,
+                                         sigma=FLAGS.knn_sigma, cutoff=FLAGS.knn_cutoff)
+        except ValueError as e:
+            print(e)
+            quit()
+        print(f"label 후처리: {postprocess}")
+    scan.set_postprocess(postprocess)
+
+    # headless 모드: 이미지 저장 후 종료
+    if FLAGS.headless:
+        from auxiliary.render import HeadlessRenderer
+        renderer = HeadlessRenderer(
+            scan=scan,
+            scan_names=scan_names,
+            label_names=label_names,
+            out_dir=FLAGS.out,
+            semantics=not FLAGS.ignore_label,
+            workers=FLAGS.workers,
+            gif=FLAGS.gif
+        )
+        renderer.run()
+        quit()
+
+    # prefetch 엔진 생성
+    prefetch = None
+    if FLAGS.prefetch > 0:
+        prefetch = ScanPrefetcher(
+            scan=scan,
+            scan_names=scan_names,
+            label_names=label_names,
+            semantics=not FLAGS.ignore_label,
+            window=FLAGS.prefetch,
+            workers=FLAGS.prefetch_workers,
+            max_bytes=FLAGS.prefetch_memory * 1024 * 1024
+        )
+
+    # 누적 map 생성
+    voxel_map = None
+    poses = None
+    if FLAGS.accumulate:
+        from auxiliary.voxelmap import VoxelMap, load_lidar_poses
+        poses_path = FLAGS.poses or os.path.join(FLAGS.dataset, "poses.txt")
+        if not os.path.isfile(poses_path):
+            print(f"{poses_path} 존재하지 않습니다! 종료 중...")
+            quit()
+        poses = load_lidar_poses(FLAGS.dataset, poses_path)
+        print(f"{poses_path} 사용 중... ({poses.shape[0]} pose)")
+        voxel_map = VoxelMap(
+            class_keys=color_dict.keys(),
+            voxel_size=FLAGS.voxel_size,
+            max_voxels=FLAGS.map_max_voxels,
+            window=FLAGS.map_window
+        )
+
+    # live 입력 생성
+    stream = None
+    if live:
+        from auxiliary.live import DirectorySource, LiveStream, SocketSource
+        if FLAGS.live_socket:
+            host, port = FLAGS.live_socket.rsplit(":", 1)
+            source = SocketSource(host, int(port), predictions=FLAGS.predictions)
+            print(f"live 모드: {FLAGS.live_socket} 대기 중...")
+        else:
+            source = DirectorySource(scan_paths,
+                                     None if FLAGS.ignore_label else label_paths,
+                                     predictions=FLAGS.predictions,
+                                     interval=FLAGS.live_interval)
+            print(f"live 모드: {scan_paths} 감시 중...")
+        stream = LiveStream(scan, source, semantics=not FLAGS.ignore_label, queue_size=FLAGS.live_queue)
+
+    # 클래스 이름 (config labels 항목, mapping/오픈 데이터셋 label은 이름 없음)
+    class_names = None
+    if not FLAGS.mapping and not FLAGS.open_data and CFG.get("labels"):
+        class_names = {int(key): name for key, name in CFG["labels"].items()}
+
+    # 범위/영역/높이/클래스 필터 생성
+    from auxiliary.filters import PointFilter, parse_classes
+    try:
+        hidden = parse_classes(FLAGS.hide_classes, class_names)
+    except ValueError as e:
+        print(e)
+        quit()
+    z_min, z_max = FLAGS.z_range if FLAGS.z_range else (None, None)
+    point_filter = PointFilter(
+        min_range=FLAGS.min_range,
+        max_range=FLAGS.max_range,
+        box=FLAGS.box,
+        z_min=z_min,
+        z_max=z_max,
+        hidden=hidden
+    )
+
     # visualizer 객체 생성
+    from auxiliary.laserscanvis import LaserScanVis
     vis = LaserScanVis(
         scan=scan,
         scan_names=scan_names,
         label_names=label_names,
         label = not FLAGS.ignore_label,
         predictions=FLAGS.predictions,
-        mapping=FLAGS.mapping
+        mapping=FLAGS.mapping,
+        prefetch=prefetch,
+        lod_budget=FLAGS.lod_budget,
+        lod_delay=FLAGS.lod_delay,
+        voxel_map=voxel_map,
+        poses=poses,
+        live=stream,
+        playback_fps=FLAGS.fps,
+        play=FLAGS.play,
+        point_filter=point_filter,
+        class_names=class_names
     )
     
     # 조작어 출력
     print("To navigate:")
     print("\tb: back (previous scan)")
     print("\tn: next (next scan)")
+    if not live:
+        print("\tspace: play / pause (target %.1f fps)" % FLAGS.fps)
+        print("\t0-9 + enter: seek (jump to scan index)")
+        print("\t+/-: faster / slower playback")
+    print("\t[/]: max range -/+ 5m")
+    print("\t{/}: max height -/+ 0.5m")
+    print("\tf: filter on / off")
+    print("\tleft click: pick point (3D view or image)")
     print("\tq: quit (exit program)")
 
     # 실행